@@ -9,6 +9,7 @@ import type {
   UserProfile,
   AnalyticsEvent
 } from './atlas-directive-types-complete';
+import { findNode, unpackStringTable } from './narrative-string-table';
 
 interface AtlasDirectiveProps {
   onOutcomeDetermined?: (payload: {
@@ -59,7 +60,7 @@ export const AtlasDirective: React.FC<AtlasDirectiveProps> = ({
         if (!response.ok) {
           throw new Error(`Failed to load narrative tree: ${response.status}`);
         }
-        const data = await response.json();
+        const data = unpackStringTable(await response.json());
         setNarrativeTree(data);
         
         // Initialize tokens from tree configuration
@@ -79,9 +80,7 @@ export const AtlasDirective: React.FC<AtlasDirectiveProps> = ({
   }, []);
 
   // Get current stage
-  const currentStage = narrativeTree?.nodes?.find(
-    node => node.id === gameState.currentStage
-  );
+  const currentStage = findNode(narrativeTree, gameState.currentStage);
 
   // Check if choice requirements are met
   const checkRequirements = useCallback((requires?: string[]): boolean => {
@@ -235,7 +234,7 @@ export const AtlasDirective: React.FC<AtlasDirectiveProps> = ({
       setGameState(newGameState);
 
       // Check for cinematic triggers
-      const nextStage = narrativeTree?.nodes?.find(node => node.id === choice.next_id);
+      const nextStage = findNode(narrativeTree, choice.next_id);
       if (nextStage?.cinematic && onOutcomeDetermined) {
         const cinematicPayload = {
           animation_key: nextStage.cinematic.animation_key,
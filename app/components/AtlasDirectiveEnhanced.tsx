@@ -9,6 +9,7 @@ import type {
   UserProfile,
   AnalyticsEvent
 } from './atlas-directive-types-complete';
+import { findNode, unpackStringTable } from './narrative-string-table';
 
 interface AtlasDirectiveProps {
   onOutcomeDetermined?: (payload: {
@@ -91,7 +92,7 @@ export const AtlasDirective: React.FC<AtlasDirectiveProps> = ({
           throw new Error(`Failed to load narrative chunk: ${response.status} ${response.statusText}`);
         }
 
-        const data: NarrativeTree = await response.json();
+        const data: NarrativeTree = unpackStringTable(await response.json());
 
         // Validate chunk structure
         if (!data.nodes || !Array.isArray(data.nodes)) {
@@ -125,9 +126,7 @@ export const AtlasDirective: React.FC<AtlasDirectiveProps> = ({
   }, [narrativeChunk]);
 
   // Get current stage from loaded narrative tree
-  const currentStage = narrativeTree?.nodes?.find(
-    node => node.id === gameState.currentStage
-  );
+  const currentStage = findNode(narrativeTree, gameState.currentStage);
 
   // Check if choice requirements are met
   const checkRequirements = useCallback((requires?: string[]): boolean => {
@@ -288,7 +287,7 @@ export const AtlasDirective: React.FC<AtlasDirectiveProps> = ({
         setGameState(newGameState);
 
         // Check for cinematic triggers
-        const nextStage = narrativeTree?.nodes?.find(node => node.id === choice.next_id);
+        const nextStage = findNode(narrativeTree, choice.next_id);
         if (nextStage?.cinematic && onOutcomeDetermined) {
           const cinematicPayload = {
             animation_key: nextStage.cinematic.animation_key,
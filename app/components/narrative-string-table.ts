@@ -0,0 +1,135 @@
+// Expander for string-table packed narrative trees (atlas_narrative export --string-table)
+//
+// Mirrors atlas_narrative/stringtable.py. A packed tree is the plain tree plus a
+// top-level "string_table": { version: 1, strings: [...], cinematics: [...] }.
+// Packed node string fields (id, title, body_md, choice id/label/next_id and
+// grants/requires flags) hold the string itself, an index into strings, or
+// [template, ...numbers], where strings[template] is a list of literal pieces
+// with the numbers written between them. "cinematic" holds the cue itself or an
+// index into cinematics.
+import type { Choice, NarrativeTree, Stage } from './atlas-directive-types-complete';
+
+export const STRING_TABLE_KEY = 'string_table';
+export const STRING_TABLE_VERSION = 1;
+
+export type StringRef = string | number | number[];
+
+export interface PackedStringTable {
+  version: number;
+  strings: Array<string | string[]>;
+  cinematics?: Array<NonNullable<Stage['cinematic']>>;
+}
+
+const NODE_STRINGS = ['id', 'title', 'body_md'] as const;
+const CHOICE_STRINGS = ['id', 'label', 'next_id'] as const;
+const FLAG_LISTS = ['grants', 'requires'] as const;
+
+// Resolves packed references, expanding each template only when a node needs it
+export class StringTable {
+  private strings: Array<string | string[]>;
+  private cinematics: Array<NonNullable<Stage['cinematic']>>;
+
+  constructor(table: PackedStringTable) {
+    if (table?.version !== STRING_TABLE_VERSION) {
+      throw new Error(`Unsupported string table version ${JSON.stringify(table?.version)}`);
+    }
+    this.strings = table.strings;
+    this.cinematics = table.cinematics ?? [];
+  }
+
+  // The string a packed field value refers to
+  string(ref: StringRef): string {
+    if (typeof ref === 'string') return ref;
+    if (typeof ref === 'number') return this.strings[ref] as string;
+    const pieces = this.strings[ref[0]] as string[];
+    const args = ref.slice(1);
+    if (pieces.length !== args.length + 1) {
+      throw new Error(`Template ${ref[0]} takes ${pieces.length - 1} numbers, got ${args.length}`);
+    }
+    let out = pieces[0];
+    args.forEach((arg, i) => {
+      out += String(arg) + pieces[i + 1];
+    });
+    return out;
+  }
+
+  private fields<T extends Record<string, any>>(item: T, stringKeys: readonly string[]): T {
+    const expanded: Record<string, any> = { ...item };
+    for (const key of stringKeys) {
+      if (key in expanded) expanded[key] = this.string(expanded[key]);
+    }
+    for (const key of FLAG_LISTS) {
+      if (expanded[key] != null) expanded[key] = expanded[key].map((flag: StringRef) => this.string(flag));
+    }
+    return expanded as T;
+  }
+
+  // Plain node for one packed node
+  node(packed: any): Stage {
+    const node = this.fields<any>(packed, NODE_STRINGS);
+    if ('choices' in packed) {
+      node.choices = packed.choices.map((choice: any) => this.fields<Choice>(choice, CHOICE_STRINGS));
+    }
+    if (typeof packed.cinematic === 'number') {
+      node.cinematic = { ...this.cinematics[packed.cinematic] };
+    }
+    return node as Stage;
+  }
+}
+
+export const isPacked = (tree: any): boolean => tree != null && STRING_TABLE_KEY in tree;
+
+// Node id of index i per lazy view, read without expanding the rest of the node
+const lazyIds = new WeakMap<object, (i: number) => string>();
+const idIndexes = new WeakMap<object, Map<string, number>>();
+
+// Array view over packed nodes that expands each node the first time it is read
+export function lazyNodes(table: StringTable, packed: any[]): Stage[] {
+  const expanded: Stage[] = new Array(packed.length);
+  const indexOf = (prop: string | symbol): number => {
+    if (typeof prop !== 'string') return -1;
+    const index = Number(prop);
+    return Number.isInteger(index) && index >= 0 && index < packed.length && String(index) === prop ? index : -1;
+  };
+  const view = new Proxy(packed, {
+    get(target, prop, receiver) {
+      const index = indexOf(prop);
+      if (index < 0) return Reflect.get(target, prop, receiver);
+      return expanded[index] ?? (expanded[index] = table.node(target[index]));
+    },
+    set(target, prop, value, receiver) {
+      const index = indexOf(prop);
+      if (index < 0) return Reflect.set(target, prop, value, receiver);
+      expanded[index] = value;
+      return true;
+    }
+  }) as unknown as Stage[];
+  lazyIds.set(view, i => table.string(packed[i].id));
+  return view;
+}
+
+// Node by id (first match, like nodes.find); a lazy view only expands the node it returns
+export function findNode(tree: NarrativeTree | null | undefined, id: string): Stage | undefined {
+  const nodes = tree?.nodes;
+  if (!nodes) return undefined;
+  let index = idIndexes.get(nodes);
+  if (!index) {
+    const idOf = lazyIds.get(nodes) ?? ((i: number) => nodes[i].id);
+    index = new Map();
+    for (let i = 0; i < nodes.length; i++) {
+      const nodeId = idOf(i);
+      if (!index.has(nodeId)) index.set(nodeId, i);
+    }
+    idIndexes.set(nodes, index);
+  }
+  const i = index.get(id);
+  return i === undefined ? undefined : nodes[i];
+}
+
+// The plain tree a packed tree was made from, with nodes expanded lazily on access
+// (plain trees are returned unchanged)
+export function unpackStringTable(tree: any): NarrativeTree {
+  if (!isPacked(tree)) return tree as NarrativeTree;
+  const { [STRING_TABLE_KEY]: table, ...rest } = tree;
+  return { ...rest, nodes: lazyNodes(new StringTable(table), tree.nodes) } as NarrativeTree;
+}
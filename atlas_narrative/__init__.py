@@ -0,0 +1,89 @@
+# ATLAS Directive narrative tree generator and tooling
+#
+# Submodules are imported on first attribute access, so `import atlas_narrative`
+# builds nothing and pulls in no optional dependencies (NumPy for the simulator
+# and the vectorized engine).
+from importlib import import_module
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "atlas_narrative_header": "generator",
+    "atlas_sections": "generator",
+    "iter_atlas_narrative_nodes": "generator",
+    "generate_complete_atlas_narrative": "generator",
+    "serialize_nodes": "generator",
+    "write_atlas_narrative_stream": "generator",
+    "regenerate_atlas_narrative": "generator",
+    "write_atlas_narrative_chunks": "generator",
+    "SECTION_BUILDERS": "generator",
+    "BRIDGING_SECTIONS": "generator",
+    "dumps_tree": "encoders",
+    "iter_encoded_tree": "encoders",
+    "write_encoded_tree": "encoders",
+    "load_encoded_tree": "encoders",
+    "register_encoder": "encoders",
+    "pack_string_table": "stringtable",
+    "unpack_string_table": "stringtable",
+    "StringTable": "stringtable",
+    "diff_trees": "delta",
+    "apply_patch": "delta",
+    "Node": "model",
+    "Choice": "model",
+    "Cinematic": "model",
+    "load_nodes": "model",
+    "NarrativeGraph": "graph",
+    "classify_node_id": "graph",
+    "CATEGORY_LABELS": "graph",
+    "analyze_narrative": "analysis",
+    "format_analysis_summary": "analysis",
+    "FlagRegistry": "flags",
+    "explore_states": "explorer",
+    "solve_routes": "routes",
+    "cached_routes": "routes",
+    "tree_hash": "cache",
+    "node_hash": "merkle",
+    "merkle_root": "merkle",
+    "stamp_content": "merkle",
+    "stored_tree_hash": "merkle",
+    "verify_content": "merkle",
+    "structure_metrics": "metrics",
+    "stamp_structure": "metrics",
+    "synthesize_tree": "synth",
+    "iter_synthetic_nodes": "synth",
+    "write_synthetic_tree": "synth",
+    "NarrativeEngine": "engine",
+    "SessionStore": "engine",
+    "VectorEngine": "vector",
+    "SessionArrays": "vector",
+    "NarrativeService": "server",
+    "HTTPClient": "server",
+    "run_load_test": "loadtest",
+    "simulate_playthroughs": "simulator",
+    "CompiledNarrative": "simulator",
+    "dumps_narrative_binary": "binary",
+    "write_narrative_binary": "binary",
+    "NarrativeBinaryReader": "binary",
+    "SectionCache": "cache",
+    "write_narrative_chunks": "chunks",
+    "partition_narrative": "chunks",
+    "run_variants": "batch",
+    "run_benchmarks": "bench",
+    "span": "trace",
+    "tracing": "trace",
+    "synthetic_tree": "bench",
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    """Resolve a public name by importing its submodule on first use"""
+
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,384 @@
+# Command line entry point: python -m atlas_narrative <command> ...
+import argparse
+import json
+import sys
+
+def _load_tree(path):
+    """Read a tree JSON file (optionally .gz/.zst or string-table packed), or generate the default tree when no path is given"""
+
+    if path is None:
+        from .generator import generate_complete_atlas_narrative
+        return generate_complete_atlas_narrative()
+    from .encoders import load_encoded_tree
+    return load_encoded_tree(path)
+
+def cmd_report(args):
+    """Generate the tree and print its summary banners, distribution and graph analysis"""
+
+    from .analysis import analyze_narrative, format_analysis_summary
+    from .encoders import dumps_tree
+    from .generator import generate_complete_atlas_narrative
+    from .graph import NarrativeGraph
+    from .metrics import format_metrics_summary, structure_metrics
+    from .trace import span
+
+    complete_narrative = generate_complete_atlas_narrative(args.chrono_start, args.bridging)
+    with span("serialize"):
+        complete_json = dumps_tree(complete_narrative).decode("utf-8")
+
+    print("✅ COMPLETE NARRATIVE TREE GENERATED!")
+    print(f"📊 Total Nodes: {complete_narrative['meta']['total_nodes']}")
+    print(f"🎯 Endings: {complete_narrative['meta']['endings']}")
+    print(f"🌟 Golden Path: {complete_narrative['meta']['golden_path_nodes']} checkpoints")
+    print(f"🎓 Skill Checks: {complete_narrative['meta']['skill_checks']}")
+    print(f"🔀 Branching Points: {complete_narrative['meta']['branching_points']}")
+    print(f"📄 JSON Size: {len(complete_json):,} characters")
+
+    # Calculate distribution
+    narrative_graph = NarrativeGraph(complete_narrative)
+    node_types = narrative_graph.category_counts()
+
+    print("\n📋 Node Distribution:")
+    for node_type, count in node_types.items():
+        print(f"  {node_type}: {count}")
+
+    # Structural checks on the generated graph
+    analysis_report = analyze_narrative(narrative_graph)
+    print("\n🔍 Graph Analysis:")
+    for line in format_analysis_summary(analysis_report):
+        print(line)
+
+    print("\n📐 Structure:")
+    for line in format_metrics_summary(structure_metrics(narrative_graph)):
+        print(line)
+
+    print("\n🎮 This is now a complete, playable narrative with rich branching!")
+    print("Ready for immediate implementation by your dev team.")
+
+def cmd_generate(args):
+    """Write the tree to a file, rebuilding only sections whose inputs changed"""
+
+    from .generator import regenerate_atlas_narrative
+
+    regen = regenerate_atlas_narrative(args.out, args.cache_dir, args.indent, args.chrono_start, args.bridging)
+    rebuilt = [name for name, state in regen["sections"].items() if state == "rebuilt"]
+    print(f"💾 {args.out}: {'written' if regen['written'] else 'unchanged'}, rebuilt sections: {', '.join(rebuilt) or 'none'}")
+
+def cmd_export(args):
+    """Encode the tree in dev or compact mode, optionally gzip/zstd-compressed by suffix"""
+
+    from .encoders import write_encoded_tree
+
+    compression = "auto" if args.compress is None else (None if args.compress == "none" else args.compress)
+    result = write_encoded_tree(_load_tree(args.tree), args.out, args.mode, args.encoder, compression, args.level,
+                                args.verify, args.string_table)
+    layout = result["mode"] + (" + string table" if result["string_table"] else "")
+    packed = f" ({result['compression']}: {result['file_bytes']:,} bytes)" if result["compression"] else ""
+    print(f"💾 {args.out}: {result['nodes']} nodes, {result['bytes']:,} bytes {layout} via {result['encoder']}{packed}")
+
+def cmd_diff(args):
+    """Compute the patch from one tree version to the next, matched by node id"""
+
+    from .delta import diff_trees, patch_summary
+
+    patch = diff_trees(_load_tree(args.old), _load_tree(args.new))
+    text = json.dumps(patch, ensure_ascii=False, separators=(",", ":"))
+    if not args.out:
+        print(text)
+        return
+    with open(args.out, "w", encoding="utf-8") as fh:
+        fh.write(text)
+    summary = patch_summary(patch)
+    print(f"🧩 {args.out}: {len(text.encode('utf-8')):,} bytes, nodes +{summary['nodes_added']} "
+          f"-{summary['nodes_removed']} ~{summary['nodes_modified']}, choices +{summary['choices_added']} "
+          f"-{summary['choices_removed']} ~{summary['choices_modified']}")
+
+def cmd_patch(args):
+    """Apply a patch from the diff command to a tree and write the next version"""
+
+    from .delta import apply_patch
+    from .encoders import write_encoded_tree
+
+    with open(args.patch, encoding="utf-8") as fh:
+        patch = json.load(fh)
+    tree = apply_patch(_load_tree(args.tree), patch, check=not args.no_check)
+    result = write_encoded_tree(tree, args.out)
+    print(f"💾 {args.out}: {result['nodes']} nodes")
+
+def cmd_chunks(args):
+    """Write narrative_tree_chunk*.json files plus the cross-chunk manifest"""
+
+    from .chunks import DEFAULT_CHUNK_DIR, write_narrative_chunks
+
+    result = write_narrative_chunks(_load_tree(args.tree), args.out_dir or DEFAULT_CHUNK_DIR, args.strategy, args.max_chunk_nodes, clean=args.clean)
+    for chunk in result["chunks"]:
+        print(f"  {chunk['file']}: {chunk['nodes']} nodes, prefetch {len(chunk['prefetch'])}")
+    print(f"✂️  {len(result['chunks'])} chunks, {len(result['cross_edges'])} cross-chunk edges")
+
+def cmd_simulate(args):
+    """Monte Carlo playthroughs and ending rarity report (requires NumPy)"""
+
+    from .simulator import simulate_playthroughs
+
+    print(json.dumps(simulate_playthroughs(_load_tree(args.tree), runs=args.runs, seed=args.seed), indent=2))
+
+def cmd_explore(args):
+    """Exhaustive ending reachability under token limits"""
+
+    from .explorer import explore_states
+
+    print(json.dumps(explore_states(_load_tree(args.tree), prune_dominated=args.prune), indent=2))
+
+def cmd_routes(args):
+    """Cheapest or shortest routes to every ending and golden path checkpoint"""
+
+    from .routes import cached_routes
+
+    report = cached_routes(_load_tree(args.tree), args.target or None, args.k, args.budget, args.order, args.cache_dir,
+                           args.trust_stored)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+def cmd_play(args):
+    """Play a scripted sequence of choice ids through the engine and print each step"""
+
+    from .engine import NarrativeEngine
+
+    engine = NarrativeEngine(_load_tree(args.tree))
+    session = engine.new_session("cli")
+    for choice_id in args.choice or []:
+        result = engine.step(session, choice_id)
+        print(json.dumps(dict(result, choice=choice_id), ensure_ascii=False))
+        if not result["ok"]:
+            break
+    print(json.dumps(dict(engine.snapshot(session), status=engine.status(session), choices=engine.choices(session)),
+                     indent=2, ensure_ascii=False))
+
+def cmd_serve(args):
+    """Serve nodes, prefetch bundles, chunks and play sessions over HTTP and WebSocket"""
+
+    from .server import serve
+
+    serve(_load_tree(args.tree), args.host, args.port, args.encoder)
+
+def cmd_loadtest(args):
+    """Replay synthetic players against the engine and report throughput, latency and memory as JSON"""
+
+    from .loadtest import POLICIES, run_load_test
+
+    if args.nodes:
+        from .bench import synthetic_tree
+        tree = synthetic_tree(args.nodes)
+    else:
+        tree = _load_tree(args.tree)
+    report = run_load_test(tree, args.policy or POLICIES, args.players, args.max_steps, args.seed, args.mode,
+                           args.host, args.port, args.connections)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+def cmd_synth(args):
+    """Stream a seeded synthetic tree of any size, built from the hand-written section patterns"""
+
+    from .synth import write_synthetic_tree
+
+    counts = write_synthetic_tree(args.out, args.nodes, args.seed, args.branching, args.cycle_density, args.flag_density, args.indent)
+    print(f"🧪 {args.out}: {counts['total_nodes']:,} nodes, {counts['endings']:,} endings, "
+          f"{counts['skill_checks']:,} skill checks, {counts['branching_points']:,} branching points")
+
+def cmd_binary(args):
+    """Encode a tree to the binary format, or read nodes back out of one"""
+
+    from .binary import NarrativeBinaryReader, write_narrative_binary
+
+    if args.read:
+        with NarrativeBinaryReader(args.read) as reader:
+            found = reader.node(args.node_id) if args.node_id else reader.root()
+            print(json.dumps(found, indent=2, ensure_ascii=False))
+        return
+    if not args.out:
+        raise SystemExit("binary: OUT is required unless --read is given")
+    tree = _load_tree(args.tree)
+    size = write_narrative_binary(tree, args.out)
+    print(f"📦 {len(tree['nodes'])} nodes -> {size:,} bytes")
+
+def cmd_batch(args):
+    """Generate, validate and serialize tree variants in parallel"""
+
+    from .batch import run_variants
+
+    with open(args.variants, encoding="utf-8") as fh:
+        variant_configs = json.load(fh)
+    summary = run_variants(variant_configs, args.out_dir, args.workers)
+    for artifact in summary["variants"]:
+        print(f"  {artifact['name']}: {artifact['total_nodes']} nodes in {sum(artifact['timings'].values()) * 1000:.1f} ms")
+    print(f"⚡ {len(summary['variants'])} variants in {summary['timing']['wall_seconds']:.2f}s on {summary['timing']['workers']} workers")
+
+def cmd_bench(args):
+    """Benchmark generation, analysis, encoders, writes and simulation on synthetic trees"""
+
+    from .bench import DEFAULT_SIZES, compare_benchmarks, run_benchmarks
+
+    sizes = [int(size) for size in args.sizes.split(",")] if args.sizes else DEFAULT_SIZES
+    report = run_benchmarks(sizes, args.repeat, args.runs, args.seed)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            report["regressions"] = compare_benchmarks(report, json.load(fh), args.tolerance)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return 1 if report.get("regressions") else 0
+
+def build_parser():
+    """Argument parser for every subcommand; running with no command prints the report"""
+
+    parser = argparse.ArgumentParser(prog="python -m atlas_narrative", description="ATLAS Directive narrative tree tools")
+    parser.add_argument("--trace", metavar="FILE", help="write a Chrome trace of sections and pipeline stages to FILE")
+    parser.set_defaults(handler=cmd_report, chrono_start=3, bridging="transition")
+    commands = parser.add_subparsers(title="commands")
+
+    def variant_options(sub):
+        sub.add_argument("--chrono-start", type=int, default=3)
+        sub.add_argument("--bridging", choices=("transition", "bridge"), default="transition")
+
+    report = commands.add_parser("report", help=cmd_report.__doc__)
+    variant_options(report)
+    report.set_defaults(handler=cmd_report)
+
+    generate = commands.add_parser("generate", help=cmd_generate.__doc__)
+    generate.add_argument("out")
+    generate.add_argument("--cache-dir", default=".narrative_cache")
+    generate.add_argument("--indent", type=int, default=2)
+    variant_options(generate)
+    generate.set_defaults(handler=cmd_generate)
+
+    export = commands.add_parser("export", help=cmd_export.__doc__)
+    export.add_argument("out", help="output file; a .gz or .zst suffix picks the compression")
+    export.add_argument("--tree", help="tree JSON to re-encode (default: generate the tree)")
+    export.add_argument("--mode", choices=("dev", "compact"), default="dev")
+    export.add_argument("--encoder", choices=("auto", "orjson", "stdlib"), default="auto")
+    export.add_argument("--compress", choices=("none", "gzip", "zstd"), help="override the suffix-based compression")
+    export.add_argument("--level", type=int, help="compression level (default: gzip 6, zstd 3)")
+    export.add_argument("--string-table", action="store_true", help="share repeated strings and cinematics through an index table (the front end loaders expand it)")
+    export.add_argument("--verify", action="store_true", help="read the file back and check it parses to the same tree")
+    export.set_defaults(handler=cmd_export)
+
+    diff = commands.add_parser("diff", help=cmd_diff.__doc__)
+    diff.add_argument("old")
+    diff.add_argument("new")
+    diff.add_argument("--out", help="write the patch here instead of stdout")
+    diff.set_defaults(handler=cmd_diff)
+
+    patch = commands.add_parser("patch", help=cmd_patch.__doc__)
+    patch.add_argument("tree")
+    patch.add_argument("patch")
+    patch.add_argument("out")
+    patch.add_argument("--no-check", action="store_true", help="skip the base/target tree hash checks")
+    patch.set_defaults(handler=cmd_patch)
+
+    chunks = commands.add_parser("chunks", help=cmd_chunks.__doc__)
+    chunks.add_argument("out_dir", nargs="?", help="output directory (default: data/generated)")
+    chunks.add_argument("--tree", help="tree JSON to split (default: generate the tree)")
+    chunks.add_argument("--clean", action="store_true", help="remove chunk files left by the previous run into out_dir")
+    chunks.add_argument("--strategy", choices=("path", "mincut"), default="path")
+    chunks.add_argument("--max-chunk-nodes", type=int)
+    chunks.set_defaults(handler=cmd_chunks)
+
+    simulate = commands.add_parser("simulate", help=cmd_simulate.__doc__)
+    simulate.add_argument("tree", nargs="?")
+    simulate.add_argument("--runs", type=int, default=1_000_000)
+    simulate.add_argument("--seed", type=int)
+    simulate.set_defaults(handler=cmd_simulate)
+
+    explore = commands.add_parser("explore", help=cmd_explore.__doc__)
+    explore.add_argument("tree", nargs="?")
+    explore.add_argument("--prune", action="store_true")
+    explore.set_defaults(handler=cmd_explore)
+
+    routes = commands.add_parser("routes", help=cmd_routes.__doc__)
+    routes.add_argument("tree", nargs="?")
+    routes.add_argument("--target", action="append", help="node id to route to (repeatable; default: endings and golden path)")
+    routes.add_argument("-k", type=int, default=1, help="routes per target")
+    routes.add_argument("--budget", type=int, help="max total cost (default: starting chrono tokens)")
+    routes.add_argument("--order", choices=("cost", "steps"), default="cost")
+    routes.add_argument("--cache-dir", help="persist solved routes here, keyed by tree hash")
+    routes.add_argument("--trust-stored", action="store_true", help="key the cache by meta.content.tree_hash instead of rehashing the nodes")
+    routes.set_defaults(handler=cmd_routes)
+
+    play = commands.add_parser("play", help=cmd_play.__doc__)
+    play.add_argument("tree", nargs="?")
+    play.add_argument("--choice", action="append", help="choice id to take (repeatable, in order)")
+    play.set_defaults(handler=cmd_play)
+
+    server = commands.add_parser("serve", help=cmd_serve.__doc__)
+    server.add_argument("tree", nargs="?")
+    server.add_argument("--host", default="127.0.0.1")
+    server.add_argument("--port", type=int, default=8080)
+    server.add_argument("--encoder", default="auto", help="stdlib, orjson or auto")
+    server.set_defaults(handler=cmd_serve)
+
+    loadtest = commands.add_parser("loadtest", help=cmd_loadtest.__doc__)
+    loadtest.add_argument("tree", nargs="?")
+    loadtest.add_argument("--nodes", type=int, help="use a synthetic tree of this many nodes instead (see synth)")
+    loadtest.add_argument("--policy", action="append", choices=("random", "greedy", "fail"), help="repeatable (default: all)")
+    loadtest.add_argument("--players", type=int, default=1_000)
+    loadtest.add_argument("--max-steps", type=int, default=200)
+    loadtest.add_argument("--seed", type=int, default=0)
+    loadtest.add_argument("--mode", choices=("inprocess", "socket"), default="inprocess")
+    loadtest.add_argument("--host", help="socket mode: server to load (default: start one in-process)")
+    loadtest.add_argument("--port", type=int, default=8080)
+    loadtest.add_argument("--connections", type=int, default=8)
+    loadtest.add_argument("--out", help="write the JSON report here instead of stdout")
+    loadtest.set_defaults(handler=cmd_loadtest)
+
+    synth = commands.add_parser("synth", help=cmd_synth.__doc__)
+    synth.add_argument("out")
+    synth.add_argument("--nodes", type=int, default=10_000)
+    synth.add_argument("--seed", type=int, default=0)
+    synth.add_argument("--branching", type=float, default=2.0, help="mean choices per finding or confirmation")
+    synth.add_argument("--cycle-density", type=float, default=0.05, help="share of beats that link back (revisit loops)")
+    synth.add_argument("--flag-density", type=float, default=0.3, help="share of extra choices granting or requiring flags")
+    synth.add_argument("--indent", type=int, default=2)
+    synth.set_defaults(handler=cmd_synth)
+
+    binary = commands.add_parser("binary", help=cmd_binary.__doc__)
+    binary.add_argument("out", nargs="?")
+    binary.add_argument("--tree", help="tree JSON to encode (default: generate the tree)")
+    binary.add_argument("--read", metavar="FILE", help="read a .atln file instead of writing one")
+    binary.add_argument("--node-id")
+    binary.set_defaults(handler=cmd_binary)
+
+    batch = commands.add_parser("batch", help=cmd_batch.__doc__)
+    batch.add_argument("variants", help="JSON list of variant configs")
+    batch.add_argument("out_dir")
+    batch.add_argument("--workers", type=int)
+    batch.set_defaults(handler=cmd_batch)
+
+    bench = commands.add_parser("bench", help=cmd_bench.__doc__)
+    bench.add_argument("--sizes", help="comma-separated node counts (default: 120,1000,10000,100000)")
+    bench.add_argument("--repeat", type=int, default=3)
+    bench.add_argument("--runs", type=int, default=10_000, help="simulated playthroughs per size")
+    bench.add_argument("--seed", type=int, default=0)
+    bench.add_argument("--out", help="write the JSON report here instead of stdout")
+    bench.add_argument("--compare", metavar="BASELINE", help="exit 1 if any stage is slower than this report")
+    bench.add_argument("--tolerance", type=float, default=0.2)
+    bench.set_defaults(handler=cmd_bench)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.trace:
+        from .trace import tracing
+
+        with tracing(args.trace):
+            return args.handler(args) or 0
+    return args.handler(args) or 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+# Linear-time structural checks over a generated narrative tree
+from collections import deque
+
+from .graph import NarrativeGraph
+from .trace import span
+
+def reachable_from(graph, start):
+    """Boolean list of node indices reachable from index start (iterative BFS)"""
+
+    seen = [False] * len(graph)
+    if start is None:
+        return seen
+    seen[start] = True
+    queue = deque([start])
+    offsets, targets = graph.edge_offsets, graph.edge_targets
+    while queue:
+        i = queue.popleft()
+        for e in range(offsets[i], offsets[i + 1]):
+            t = targets[e]
+            if t >= 0 and not seen[t]:
+                seen[t] = True
+                queue.append(t)
+    return seen
+
+def co_reachable(graph, targets):
+    """Boolean list of node indices that can reach any of the target indices"""
+
+    seen = [False] * len(graph)
+    queue = deque()
+    for t in targets:
+        if not seen[t]:
+            seen[t] = True
+            queue.append(t)
+    offsets, sources = graph.pred_offsets, graph.pred_sources
+    while queue:
+        i = queue.popleft()
+        for p in range(offsets[i], offsets[i + 1]):
+            s = sources[p]
+            if not seen[s]:
+                seen[s] = True
+                queue.append(s)
+    return seen
+
+def strongly_connected_components(graph):
+    """Tarjan's SCC algorithm without recursion; returns a component id per node index"""
+
+    n = len(graph)
+    offsets, targets = graph.edge_offsets, graph.edge_targets
+    index_of = [-1] * n
+    lowlink = [0] * n
+    on_stack = [False] * n
+    component = [-1] * n
+    stack = []
+    counter = 0
+    components = 0
+
+    for root in range(n):
+        if index_of[root] >= 0:
+            continue
+        # Each frame is (node, next edge position to examine)
+        work = [(root, offsets[root])]
+        index_of[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        while work:
+            i, e = work[-1]
+            end = offsets[i + 1]
+            while e < end:
+                t = targets[e]
+                e += 1
+                if t < 0:
+                    continue
+                if index_of[t] < 0:
+                    work[-1] = (i, e)
+                    index_of[t] = lowlink[t] = counter
+                    counter += 1
+                    stack.append(t)
+                    on_stack[t] = True
+                    work.append((t, offsets[t]))
+                    break
+                if on_stack[t] and index_of[t] < lowlink[i]:
+                    lowlink[i] = index_of[t]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlink[i] < lowlink[parent]:
+                        lowlink[parent] = lowlink[i]
+                if lowlink[i] == index_of[i]:
+                    while True:
+                        j = stack.pop()
+                        on_stack[j] = False
+                        component[j] = components
+                        if j == i:
+                            break
+                    components += 1
+    return component
+
+def analyze_narrative(tree_or_graph):
+    """Report dangling references, unreachable nodes, dead ends and cycles in one linear pass.
+
+    Endings are nodes in the "ending" bucket; any other node without a resolvable
+    choice is a dead end. Closed cycles are retry loops or other strongly connected
+    groups that no choice ever exits.
+    """
+
+    with span("validate") as validate:
+        graph = tree_or_graph if isinstance(tree_or_graph, NarrativeGraph) else NarrativeGraph(tree_or_graph)
+        report = _analyze_graph(graph)
+        validate.set(nodes=len(graph))
+    return report
+
+def _analyze_graph(graph):
+    ids = graph.ids
+    root = graph.index.get(graph.root_id)
+    endings = graph.buckets["ending"]
+
+    reachable = reachable_from(graph, root)
+    can_finish = co_reachable(graph, endings)
+    ending_set = set(endings)
+
+    dead_ends = [ids[i] for i in range(len(graph)) if i not in ending_set and not graph.successor_indices(i)]
+
+    component = strongly_connected_components(graph)
+    members = {}
+    for i, c in enumerate(component):
+        members.setdefault(c, []).append(i)
+    exits = set()
+    for i in range(len(graph)):
+        for t in graph.successor_indices(i):
+            if component[t] != component[i]:
+                exits.add(component[i])
+                break
+    cycles = []
+    closed_cycles = []
+    for c, group in members.items():
+        if len(group) == 1 and group[0] not in graph.successor_indices(group[0]):
+            continue
+        cycle_ids = [ids[i] for i in group]
+        cycles.append(cycle_ids)
+        if c not in exits and not ending_set.intersection(group):
+            closed_cycles.append(cycle_ids)
+
+    return {
+        "root_id": graph.root_id,
+        "root_missing": root is None,
+        "total_nodes": len(graph),
+        "duplicate_ids": list(graph.duplicates),
+        "dangling": [{"node": ids[i], "choice": choice_id, "next_id": next_id}
+                     for i, choice_id, next_id in graph.dangling],
+        "unreachable": [ids[i] for i in range(len(graph)) if not reachable[i]],
+        "dead_ends": dead_ends,
+        "unreachable_endings": [ids[i] for i in endings if not reachable[i]],
+        "cannot_finish": [ids[i] for i in range(len(graph)) if reachable[i] and not can_finish[i]],
+        "cycles": cycles,
+        "closed_cycles": closed_cycles
+    }
+
+def format_analysis_summary(report):
+    """One line per finding category, for console output"""
+
+    return [
+        f"  Dangling next_ids: {len(report['dangling'])}",
+        f"  Unreachable from {report['root_id']}: {len(report['unreachable'])}",
+        f"  Dead ends: {len(report['dead_ends'])}",
+        f"  Unreachable endings: {len(report['unreachable_endings'])}",
+        f"  Reachable but cannot finish: {len(report['cannot_finish'])}",
+        f"  Cycles: {len(report['cycles'])} ({len(report['closed_cycles'])} closed)"
+    ]
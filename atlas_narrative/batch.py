@@ -0,0 +1,133 @@
+# Parallel generation, validation and serialization of narrative tree variants
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Keys a variant config may set, with their defaults
+VARIANT_DEFAULTS = {
+    "name": None,
+    "chrono_start": 3,
+    "bridging": "transition",
+    "endings": None,
+    "formats": ["json"],
+    "indent": 2
+}
+
+# Artifact formats build_variant() can write
+FORMATS = ("json", "binary")
+
+def _warm_worker():
+    """Pool initializer: pay the generator import once per worker, not once per variant"""
+    from . import generator  # noqa: F401
+
+def _check_formats(config):
+    unknown = [fmt for fmt in config["formats"] if fmt not in FORMATS]
+    if unknown or isinstance(config["formats"], str):
+        raise ValueError(f"formats must be a list drawn from {', '.join(FORMATS)}, got {config['formats']!r}")
+
+def variant_name(config):
+    """Default artifact name: bridging and chrono start, plus every other axis moved off its default"""
+
+    from .cache import content_hash
+
+    parts = [config["bridging"], f"chrono{config['chrono_start']}"]
+    if config["endings"] is not None:
+        endings = sorted(config["endings"])
+        parts.append(f"endings{len(endings)}-{content_hash(*endings)[:8]}")
+    if config["indent"] != VARIANT_DEFAULTS["indent"]:
+        parts.append(f"indent{config['indent']}")
+    if sorted(config["formats"]) != VARIANT_DEFAULTS["formats"]:
+        parts.append("-".join(sorted(config["formats"])))
+    return "_".join(parts)
+
+def expand_variants(configs):
+    """Configs filled with defaults and names.
+
+    Raises ValueError when two variants share a name or a format is not in FORMATS.
+    """
+
+    expanded = []
+    seen = set()
+    for config in configs:
+        config = dict(VARIANT_DEFAULTS, **config)
+        _check_formats(config)
+        config["name"] = config["name"] or variant_name(config)
+        if config["name"] in seen:
+            raise ValueError(f"variant name {config['name']!r} is used twice; its artifacts would overwrite each other")
+        seen.add(config["name"])
+        expanded.append(config)
+    return expanded
+
+def build_variant(config, out_dir):
+    """Generate, analyze and serialize one variant; returns its artifact record with stage timings"""
+
+    from . import generator
+    from .analysis import analyze_narrative
+    from .binary import write_narrative_binary
+
+    config = dict(VARIANT_DEFAULTS, **config)
+    _check_formats(config)
+    name = config["name"] or variant_name(config)
+    timings = {}
+
+    started = time.perf_counter()
+    tree = generator.generate_complete_atlas_narrative(config["chrono_start"], config["bridging"], config["endings"])
+    timings["generate"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    report = analyze_narrative(tree)
+    timings["validate"] = time.perf_counter() - started
+
+    files = {}
+    started = time.perf_counter()
+    if "json" in config["formats"]:
+        path = os.path.join(out_dir, f"{name}.json")
+        with open(path, "w", encoding="utf-8") as fh:
+            generator.write_atlas_narrative_stream(fh, nodes=tree["nodes"], header=tree, indent=config["indent"])
+        files["json"] = {"path": path, "bytes": os.path.getsize(path)}
+    if "binary" in config["formats"]:
+        path = os.path.join(out_dir, f"{name}.atln")
+        files["binary"] = {"path": path, "bytes": write_narrative_binary(tree, path)}
+    timings["serialize"] = time.perf_counter() - started
+
+    return {
+        "name": name,
+        "config": config,
+        "pid": os.getpid(),
+        "total_nodes": tree["meta"]["total_nodes"],
+        "files": files,
+        "analysis": {key: len(value) for key, value in report.items() if isinstance(value, list)},
+        "timings": timings
+    }
+
+def run_variants(configs, out_dir, max_workers=None):
+    """Fan variant builds out over a process pool; returns per-variant artifacts and a timing summary.
+
+    Names are resolved and checked for duplicates, and formats checked against
+    FORMATS, before anything is written.
+    """
+
+    configs = expand_variants(configs)
+    os.makedirs(out_dir, exist_ok=True)
+    max_workers = max_workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_warm_worker) as pool:
+        futures = [pool.submit(build_variant, config, out_dir) for config in configs]
+        artifacts = [future.result() for future in futures]
+    wall = time.perf_counter() - started
+
+    busy = sum(sum(artifact["timings"].values()) for artifact in artifacts)
+    stages = {}
+    for artifact in artifacts:
+        for stage, seconds in artifact["timings"].items():
+            stages[stage] = stages.get(stage, 0.0) + seconds
+    return {
+        "variants": artifacts,
+        "timing": {
+            "wall_seconds": wall,
+            "busy_seconds": busy,
+            "stage_seconds": stages,
+            "workers": max_workers,
+            "parallel_speedup": busy / wall if wall else None
+        }
+    }
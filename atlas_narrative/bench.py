@@ -0,0 +1,146 @@
+# Reproducible benchmarks for generation, analysis, serialization, writes and simulation
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+try:
+    import orjson
+except ImportError:  # optional: the orjson stage is skipped without it
+    orjson = None
+
+# Node counts benchmarked by default; 1M is opt-in because it needs several GB
+DEFAULT_SIZES = [120, 1_000, 10_000, 100_000]
+
+def synthetic_tree(total_nodes, seed=0):
+    """Seeded synthetic tree of exactly total_nodes nodes (see synth.py), fully stamped"""
+
+    from .synth import synthesize_tree
+
+    return synthesize_tree(total_nodes, seed)
+
+def _timed(fn, repeat):
+    """(last result, {"best_s", "mean_s"}) over repeat calls of fn"""
+
+    times = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - started)
+    return result, {"best_s": min(times), "mean_s": sum(times) / len(times)}
+
+def _write_stream(tree, path):
+    from .generator import write_atlas_narrative_stream
+
+    with open(path, "w", encoding="utf-8") as fh:
+        write_atlas_narrative_stream(fh, nodes=tree["nodes"], header=tree)
+    return os.path.getsize(path)
+
+def benchmark_size(total_nodes, repeat=3, runs=10_000, seed=0, tmp_dir=None):
+    """Time every pipeline stage on one synthetic tree size, returning {"nodes", "stages"}"""
+
+    from .analysis import analyze_narrative
+    from .encoders import dumps_tree, write_encoded_tree
+    from .generator import serialize_nodes
+    from .graph import NarrativeGraph
+    from .model import load_nodes
+    from .stringtable import pack_string_table
+
+    stages = {}
+    tree, stages["generate"] = _timed(lambda: synthetic_tree(total_nodes), repeat)
+    graph, stages["graph_index"] = _timed(lambda: NarrativeGraph(tree), repeat)
+    _, stages["analyze"] = _timed(lambda: analyze_narrative(graph), repeat)
+
+    text, stages["json_dumps_indent"] = _timed(lambda: json.dumps(tree, indent=2, ensure_ascii=False), repeat)
+    stages["json_dumps_indent"]["bytes"] = len(text.encode("utf-8"))
+    text, stages["json_dumps_compact"] = _timed(lambda: json.dumps(tree, ensure_ascii=False, separators=(",", ":")), repeat)
+    stages["json_dumps_compact"]["bytes"] = len(text.encode("utf-8"))
+    if orjson is not None:
+        data, stages["orjson_indent"] = _timed(lambda: orjson.dumps(tree, option=orjson.OPT_INDENT_2), repeat)
+        stages["orjson_indent"]["bytes"] = len(data)
+        data, stages["orjson_compact"] = _timed(lambda: orjson.dumps(tree), repeat)
+        stages["orjson_compact"]["bytes"] = len(data)
+    packed, stages["string_table_pack"] = _timed(lambda: pack_string_table(tree), repeat)
+    stages["string_table_pack"]["bytes"] = len(dumps_tree(packed, "compact"))
+    packed = None
+    (text, _), stages["serialize_nodes"] = _timed(lambda: serialize_nodes(tree["nodes"]), repeat)
+    stages["serialize_nodes"]["bytes"] = len(text.encode("utf-8"))
+    models, stages["model_load"] = _timed(lambda: load_nodes(tree["nodes"]), repeat)
+    (text, _), stages["model_emit"] = _timed(lambda: serialize_nodes(models), repeat)
+    stages["model_emit"]["bytes"] = len(text.encode("utf-8"))
+    text = models = None
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as scratch:
+        path = os.path.join(scratch, "tree.json")
+        size, stages["write_stream"] = _timed(lambda: _write_stream(tree, path), repeat)
+        stages["write_stream"]["bytes"] = size
+        gz_path = os.path.join(scratch, "tree.json.gz")
+        result, stages["export_compact_gzip"] = _timed(lambda: write_encoded_tree(tree, gz_path, "compact"), repeat)
+        stages["export_compact_gzip"].update(encoder=result["encoder"], bytes=result["file_bytes"])
+
+    try:
+        from .simulator import simulate_playthroughs
+    except ImportError as exc:  # NumPy is optional
+        stages["simulate"] = {"skipped": str(exc)}
+    else:
+        report, stages["simulate"] = _timed(lambda: simulate_playthroughs(tree, runs=runs, seed=seed), repeat)
+        stages["simulate"].update(runs=runs, completed=report["completed"])
+
+    return {"nodes": len(tree["nodes"]), "stages": stages}
+
+def environment():
+    """Interpreter, platform and optional-dependency versions for benchmark reports"""
+
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "orjson": None if orjson is None else orjson.__version__,
+        "numpy": numpy_version
+    }
+
+def run_benchmarks(sizes=None, repeat=3, runs=10_000, seed=0, tmp_dir=None):
+    """Benchmark every size and return a JSON-ready report with environment details"""
+
+    results = []
+    for total_nodes in sizes or DEFAULT_SIZES:
+        results.append(benchmark_size(total_nodes, repeat, runs, seed, tmp_dir))
+
+    return {
+        "environment": environment(),
+        "config": {"repeat": repeat, "runs": runs, "seed": seed},
+        "results": results
+    }
+
+def compare_benchmarks(current, baseline, tolerance=0.2):
+    """Stages whose best time grew by more than tolerance over the baseline report"""
+
+    previous = {
+        (result["nodes"], stage): timing["best_s"]
+        for result in baseline["results"]
+        for stage, timing in result["stages"].items()
+        if "best_s" in timing
+    }
+    regressions = []
+    for result in current["results"]:
+        for stage, timing in result["stages"].items():
+            before = previous.get((result["nodes"], stage))
+            if before and "best_s" in timing and timing["best_s"] > before * (1 + tolerance):
+                regressions.append({
+                    "nodes": result["nodes"],
+                    "stage": stage,
+                    "baseline_s": before,
+                    "current_s": timing["best_s"],
+                    "ratio": timing["best_s"] / before
+                })
+    return regressions
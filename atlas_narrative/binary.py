@@ -0,0 +1,310 @@
+# Compact binary narrative format with a memory-mapped, per-node lazy reader
+#
+# Layout (little-endian):
+#   header       HEADER struct (see below)
+#   envelope     encoded tree without "nodes" (a NODES tag marks where the array sat)
+#   strings      UTF-8 string pool, followed by u32 offsets (string_count + 1)
+#   node table   per node: u32 record offset, u32 id string index
+#   id order     u32 node indices sorted by id bytes, for binary search
+#   records      one encoded node dict per node
+#
+# Values are tagged: a one-byte tag followed by varints for ints, string pool
+# indices, container lengths and node references. A choice's next_id that
+# resolves to a node is stored as a REF to its node index.
+import mmap
+import struct
+from collections import Counter
+
+MAGIC = b"ATLN"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIIIIII")
+NO_ROOT = 0xFFFFFFFF
+
+TAG_NULL, TAG_FALSE, TAG_TRUE, TAG_INT, TAG_FLOAT, TAG_STR, TAG_LIST, TAG_DICT, TAG_REF, TAG_NODES = range(10)
+FLOAT = struct.Struct("<d")
+
+def _write_varint(out, value):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(buf, pos):
+    result = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+def _count_strings(value, counts):
+    if isinstance(value, str):
+        counts[value] += 1
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            counts[key] += 1
+            _count_strings(item, counts)
+    elif isinstance(value, list):
+        for item in value:
+            _count_strings(item, counts)
+
+class _Encoder:
+    def __init__(self, strings, node_index):
+        self.strings = strings
+        self.node_index = node_index
+
+    def encode(self, out, value, key=None):
+        if value is None:
+            out.append(TAG_NULL)
+        elif value is True:
+            out.append(TAG_TRUE)
+        elif value is False:
+            out.append(TAG_FALSE)
+        elif isinstance(value, int):
+            out.append(TAG_INT)
+            _write_varint(out, value << 1 if value >= 0 else ((-value) << 1) - 1)
+        elif isinstance(value, float):
+            out.append(TAG_FLOAT)
+            out += FLOAT.pack(value)
+        elif isinstance(value, str):
+            ref = self.node_index.get(value) if key == "next_id" else None
+            if ref is not None:
+                out.append(TAG_REF)
+                _write_varint(out, ref)
+            else:
+                out.append(TAG_STR)
+                _write_varint(out, self.strings[value])
+        elif isinstance(value, list):
+            out.append(TAG_LIST)
+            _write_varint(out, len(value))
+            for item in value:
+                self.encode(out, item)
+        elif isinstance(value, dict):
+            out.append(TAG_DICT)
+            _write_varint(out, len(value))
+            for k, item in value.items():
+                _write_varint(out, self.strings[k])
+                self.encode(out, item, k)
+        else:
+            raise TypeError(f"cannot encode {type(value).__name__} in a narrative tree")
+
+def dumps_narrative_binary(tree):
+    """Encode a tree dict to the binary format"""
+
+    nodes = tree["nodes"]
+    counts = Counter(tree.keys())
+    _count_strings({k: v for k, v in tree.items() if k != "nodes"}, counts)
+    for node in nodes:
+        _count_strings(node, counts)
+    # Most frequent strings get the smallest varint indices
+    pool = [s for s, _ in counts.most_common()]
+    strings = {s: i for i, s in enumerate(pool)}
+    node_index = {}
+    for i, node in enumerate(nodes):
+        node_index.setdefault(node["id"], i)
+    encoder = _Encoder(strings, node_index)
+
+    envelope = bytearray()
+    envelope.append(TAG_DICT)
+    _write_varint(envelope, len(tree))
+    for key, value in tree.items():
+        _write_varint(envelope, strings[key])
+        if key == "nodes":
+            envelope.append(TAG_NODES)
+        else:
+            encoder.encode(envelope, value, key)
+
+    blob = bytearray()
+    string_offsets = [0]
+    for s in pool:
+        blob += s.encode("utf-8")
+        string_offsets.append(len(blob))
+
+    records = []
+    for node in nodes:
+        record = bytearray()
+        encoder.encode(record, node)
+        records.append(record)
+
+    envelope_offset = HEADER.size
+    strings_offset = envelope_offset + len(envelope)
+    string_table_offset = strings_offset + len(blob)
+    node_table_offset = string_table_offset + 4 * len(string_offsets)
+    id_order_offset = node_table_offset + 8 * len(nodes)
+    record_offset = id_order_offset + 4 * len(nodes)
+
+    out = bytearray(HEADER.pack(
+        MAGIC, VERSION, 0, len(nodes), len(pool), node_index.get(tree.get("root_id"), NO_ROOT),
+        envelope_offset, strings_offset, string_table_offset, node_table_offset, id_order_offset
+    ))
+    out += envelope
+    out += blob
+    out += struct.pack(f"<{len(string_offsets)}I", *string_offsets)
+    for node, record in zip(nodes, records):
+        out += struct.pack("<II", record_offset, strings[node["id"]])
+        record_offset += len(record)
+    id_order = sorted(range(len(nodes)), key=lambda i: nodes[i]["id"].encode("utf-8"))
+    out += struct.pack(f"<{len(nodes)}I", *id_order)
+    for record in records:
+        out += record
+    return bytes(out)
+
+def write_narrative_binary(tree, path):
+    """Write a tree to path in the binary format, returning the byte size"""
+
+    data = dumps_narrative_binary(tree)
+    with open(path, "wb") as fh:
+        fh.write(data)
+    return len(data)
+
+class NarrativeBinaryReader:
+    """Memory-mapped reader that decodes only the strings and nodes it is asked for.
+
+    Opening costs one header parse regardless of tree size. node() returns a
+    dict in the JSON schema, with next_id references expanded back to ids.
+    """
+
+    def __init__(self, source):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self._file = None
+            self._buf = memoryview(source)
+        else:
+            self._file = open(source, "rb")
+            self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self.node_count, self.string_count, self._root, self._envelope_offset,
+         self._strings_offset, self._string_table_offset, self._node_table_offset,
+         self._id_order_offset) = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise ValueError("not an ATLAS narrative binary file")
+        if version != VERSION:
+            raise ValueError(f"unsupported narrative binary version {version}")
+        self._strings = {}
+
+    def close(self):
+        if self._file is not None:
+            self._buf.close()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.node_count
+
+    def _string_bytes(self, index):
+        start, end = struct.unpack_from("<II", self._buf, self._string_table_offset + 4 * index)
+        return self._buf[self._strings_offset + start:self._strings_offset + end]
+
+    def string(self, index):
+        value = self._strings.get(index)
+        if value is None:
+            value = self._strings[index] = bytes(self._string_bytes(index)).decode("utf-8")
+        return value
+
+    def _entry(self, index):
+        return struct.unpack_from("<II", self._buf, self._node_table_offset + 8 * index)
+
+    def node_id(self, index):
+        return self.string(self._entry(index)[1])
+
+    @property
+    def root_index(self):
+        return None if self._root == NO_ROOT else self._root
+
+    def index_of(self, node_id):
+        """Node index for an id by binary search over the id order table, or None"""
+
+        key = node_id.encode("utf-8")
+        lo, hi = 0, self.node_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            index = struct.unpack_from("<I", self._buf, self._id_order_offset + 4 * mid)[0]
+            candidate = bytes(self._string_bytes(self._entry(index)[1]))
+            if candidate < key:
+                lo = mid + 1
+            elif candidate > key:
+                hi = mid
+            else:
+                return index
+        return None
+
+    def _decode(self, pos):
+        buf = self._buf
+        tag = buf[pos]
+        pos += 1
+        if tag == TAG_STR:
+            index, pos = _read_varint(buf, pos)
+            return self.string(index), pos
+        if tag == TAG_DICT:
+            count, pos = _read_varint(buf, pos)
+            result = {}
+            for _ in range(count):
+                key, pos = _read_varint(buf, pos)
+                result[self.string(key)], pos = self._decode(pos)
+            return result, pos
+        if tag == TAG_LIST:
+            count, pos = _read_varint(buf, pos)
+            result = []
+            for _ in range(count):
+                item, pos = self._decode(pos)
+                result.append(item)
+            return result, pos
+        if tag == TAG_REF:
+            index, pos = _read_varint(buf, pos)
+            return self.node_id(index), pos
+        if tag == TAG_INT:
+            raw, pos = _read_varint(buf, pos)
+            return (raw >> 1) if not raw & 1 else -((raw + 1) >> 1), pos
+        if tag == TAG_FLOAT:
+            return FLOAT.unpack_from(buf, pos)[0], pos + FLOAT.size
+        if tag == TAG_NULL:
+            return None, pos
+        if tag == TAG_TRUE:
+            return True, pos
+        if tag == TAG_FALSE:
+            return False, pos
+        raise ValueError(f"bad tag {tag} at offset {pos - 1}")
+
+    def node(self, key):
+        """Decode one node by index or id; returns None for an unknown id"""
+
+        index = key if isinstance(key, int) else self.index_of(key)
+        if index is None:
+            return None
+        return self._decode(self._entry(index)[0])[0]
+
+    def root(self):
+        return None if self.root_index is None else self.node(self.root_index)
+
+    def envelope(self):
+        """Tree dict without its nodes (meta, root_id, tokens, ...)"""
+
+        envelope, _ = self._decode_envelope(nodes=None)
+        return envelope
+
+    def _decode_envelope(self, nodes):
+        buf = self._buf
+        pos = self._envelope_offset + 1
+        count, pos = _read_varint(buf, pos)
+        result = {}
+        for _ in range(count):
+            key, pos = _read_varint(buf, pos)
+            if buf[pos] == TAG_NODES:
+                pos += 1
+                if nodes is not None:
+                    result[self.string(key)] = nodes
+                continue
+            result[self.string(key)], pos = self._decode(pos)
+        return result, pos
+
+    def to_tree(self):
+        """Full decode back to the JSON tree schema"""
+
+        nodes = [self.node(i) for i in range(self.node_count)]
+        return self._decode_envelope(nodes)[0]
@@ -0,0 +1,86 @@
+# Content-hashed cache of serialized narrative sections
+import hashlib
+import inspect
+import json
+import os
+
+from .merkle import merkle_root, node_hashes, playable_hash
+
+# Bump when the fragment format changes so old cache entries are ignored
+CACHE_VERSION = 3
+
+def content_hash(*parts):
+    """SHA-256 hex digest over string parts, length-prefixed so boundaries count"""
+
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part.encode("utf-8")
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+def section_key(name, builder, *inputs):
+    """Cache key for a section: its name, the builder's source and any extra inputs"""
+    return content_hash(str(CACHE_VERSION), name, inspect.getsource(builder), *(repr(value) for value in inputs))
+
+def tree_hash(tree):
+    """Content hash of what a tree plays like (root, tokens, nodes), ignoring meta.
+
+    Always recomputed from the nodes; merkle.stored_tree_hash() reads the same
+    value from meta.content in O(1) when the generator stamped it.
+    """
+    return playable_hash(tree, merkle_root(node_hashes(tree.get("nodes") or ())))
+
+class SectionCache:
+    """Per-section JSON files holding their latest (key, text, count, node hashes, skeleton) plus a run manifest.
+
+    Sections are filed by name and variant (the inputs that differ between tree
+    variants, such as indent), so variants sharing a cache_dir keep their own
+    entries; the manifest records the last write per output path.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def _path(self, name, variant=""):
+        return os.path.join(self.cache_dir, "sections", f"{name}.{variant}.json" if variant else f"{name}.json")
+
+    def get(self, name, key, variant=""):
+        """(text, count, node hashes, skeleton nodes) cached for a section under key, or None"""
+
+        try:
+            with open(self._path(name, variant), encoding="utf-8") as fh:
+                entry = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key:
+            return None
+        return entry["text"], entry["count"], entry["hashes"], entry["skeleton"]
+
+    def put(self, name, key, text, count, hashes, skeleton, variant=""):
+        path = self._path(name, variant)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"key": key, "count": count, "text": text, "hashes": hashes, "skeleton": skeleton}, fh, ensure_ascii=False)
+
+    def load_manifest(self):
+        try:
+            with open(os.path.join(self.cache_dir, "manifest.json"), encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def save_manifest(self, manifest):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(os.path.join(self.cache_dir, "manifest.json"), "w", encoding="utf-8") as fh:
+            json.dump(manifest, fh, indent=2)
+
+    def load_output(self, out_path):
+        """Manifest record of the last write to out_path, or {}"""
+
+        return self.load_manifest().get("outputs", {}).get(os.path.abspath(out_path), {})
+
+    def save_output(self, out_path, record):
+        manifest = self.load_manifest()
+        manifest.setdefault("outputs", {})[os.path.abspath(out_path)] = record
+        self.save_manifest(manifest)
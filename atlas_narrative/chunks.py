@@ -0,0 +1,300 @@
+# Graph-aware partitioning of a narrative tree into narrative_tree_chunk*.json files
+#
+# data/ holds hand-authored chunk files that the app loads by name, so output
+# defaults to data/generated/. The writer never replaces a file it did not
+# write itself: it only overwrites or cleans files listed in a manifest it left
+# in the same directory.
+import json
+import os
+from collections import deque
+
+from .graph import NarrativeGraph
+from .merkle import content_meta, merkle_root, node_hashes
+
+CHUNK_PREFIX = "narrative_tree_chunk"
+MANIFEST_FILE = "narrative_tree_manifest.json"
+DEFAULT_CHUNK_DIR = os.path.join("data", "generated")
+
+# Marks manifests this module wrote, so only their chunk files are ever replaced
+MANIFEST_GENERATOR = "atlas_narrative.chunks"
+
+def _neighbors(graph, i):
+    """Successors and predecessors of node index i (edges count both ways for a cut)"""
+    return graph.successor_indices(i) + graph.predecessor_indices(i)
+
+def path_seeds(graph):
+    """{target index: path name} for every choice granting a path_* flag (first flag and first choice win)"""
+
+    seeds = {}
+    for i, node in enumerate(graph.nodes):
+        for choice in node.get("choices") or []:
+            target = graph.index.get(choice.get("next_id"))
+            if target is None:
+                continue
+            for flag in choice.get("grants") or []:
+                if flag.startswith("path_"):
+                    seeds.setdefault(target, flag[len("path_"):])
+                    break
+    return seeds
+
+def partition_by_path(graph):
+    """Chunk label per node index from path membership.
+
+    Nodes reachable from root without taking a path_* choice form "entry".
+    Each path_* choice target seeds a chunk named after the path; nodes reached
+    from exactly one path seed join it, nodes reached from several form
+    "convergence", and anything left over joins its best-connected neighbour.
+    """
+
+    n = len(graph)
+    labels = [None] * n
+    root = graph.index.get(graph.root_id)
+
+    seeds = path_seeds(graph)
+
+    if root is not None:
+        labels[root] = "entry"
+        queue = deque([root])
+        while queue:
+            i = queue.popleft()
+            for t in graph.successor_indices(i):
+                if labels[t] is None and t not in seeds:
+                    labels[t] = "entry"
+                    queue.append(t)
+
+    # Which path seeds reach each remaining node
+    reached_by = [None] * n
+    for seed, path in seeds.items():
+        if labels[seed] is not None:
+            continue
+        queue = deque([seed])
+        seen = {seed}
+        while queue:
+            i = queue.popleft()
+            if reached_by[i] is None:
+                reached_by[i] = path
+            elif reached_by[i] != path:
+                reached_by[i] = "convergence"
+            for t in graph.successor_indices(i):
+                if t not in seen and labels[t] is None:
+                    seen.add(t)
+                    queue.append(t)
+    for i in range(n):
+        if labels[i] is None and reached_by[i] is not None:
+            labels[i] = reached_by[i]
+
+    # Unreachable leftovers follow their neighbours, repeated until stable
+    pending = [i for i in range(n) if labels[i] is None]
+    while pending:
+        still = []
+        for i in pending:
+            counts = {}
+            for j in _neighbors(graph, i):
+                if labels[j] is not None:
+                    counts[labels[j]] = counts.get(labels[j], 0) + 1
+            if counts:
+                labels[i] = max(counts, key=counts.get)
+            else:
+                still.append(i)
+        if len(still) == len(pending):
+            for i in still:
+                labels[i] = "unreachable"
+            break
+        pending = still
+    return labels
+
+def refine_min_cut(graph, labels, max_chunk_nodes=None, passes=8):
+    """Greedy boundary refinement: move nodes to the chunk most of their edges point into.
+
+    A move is taken only when it strictly reduces the number of cross-chunk
+    edges and keeps the destination within max_chunk_nodes. Each pass is linear
+    in the number of edges.
+    """
+
+    labels = list(labels)
+    sizes = {}
+    for label in labels:
+        sizes[label] = sizes.get(label, 0) + 1
+    for _ in range(passes):
+        moved = 0
+        for i in range(len(graph)):
+            counts = {}
+            for j in _neighbors(graph, i):
+                if j != i:
+                    counts[labels[j]] = counts.get(labels[j], 0) + 1
+            if not counts:
+                continue
+            current = counts.get(labels[i], 0)
+            best = max(counts, key=counts.get)
+            if counts[best] <= current or sizes[labels[i]] == 1:
+                continue
+            if max_chunk_nodes is not None and sizes[best] >= max_chunk_nodes:
+                continue
+            sizes[labels[i]] -= 1
+            sizes[best] += 1
+            labels[i] = best
+            moved += 1
+        if not moved:
+            break
+    return labels
+
+def split_oversized(graph, labels, max_chunk_nodes):
+    """Split any chunk above max_chunk_nodes into BFS-ordered parts label_1, label_2, ..."""
+
+    members = {}
+    for i, label in enumerate(labels):
+        members.setdefault(label, []).append(i)
+    labels = list(labels)
+    for label, group in members.items():
+        if len(group) <= max_chunk_nodes:
+            continue
+        inside = set(group)
+        order = []
+        seen = set()
+        for start in group:
+            if start in seen:
+                continue
+            seen.add(start)
+            queue = deque([start])
+            while queue:
+                i = queue.popleft()
+                order.append(i)
+                for t in graph.successor_indices(i):
+                    if t in inside and t not in seen:
+                        seen.add(t)
+                        queue.append(t)
+        for k, i in enumerate(order):
+            labels[i] = f"{label}_{k // max_chunk_nodes + 1}"
+    return labels
+
+def partition_narrative(graph, strategy="path", max_chunk_nodes=None):
+    """Chunk label per node index for strategy "path" or "mincut" (path seeding plus refinement)"""
+
+    if strategy not in ("path", "mincut"):
+        raise ValueError(f"unknown chunk strategy {strategy!r}")
+    labels = partition_by_path(graph)
+    # Split before refining, so the refinement sees the final chunks and its moves stay within the limit
+    if max_chunk_nodes is not None:
+        labels = split_oversized(graph, labels, max_chunk_nodes)
+    if strategy == "mincut":
+        labels = refine_min_cut(graph, labels, max_chunk_nodes)
+    return labels
+
+def owned_chunk_files(out_dir):
+    """Chunk file names listed by a manifest this module wrote in out_dir, or None when there is none"""
+
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE), encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("generator") != MANIFEST_GENERATOR:
+        return None
+    return {chunk["file"] for chunk in manifest.get("chunks", []) if os.path.basename(chunk["file"]) == chunk["file"]}
+
+def chunk_meta(graph, tree_meta, members):
+    """A chunk's meta: the tree's, with the headline counts taken over the chunk's own nodes.
+
+    meta.structure describes the whole graph, so chunks leave it out; the
+    manifest carries the tree-wide totals.
+    """
+
+    from .metrics import CATEGORY_COUNTS
+
+    meta = {key: value for key, value in tree_meta.items() if key != "structure"}
+    meta["total_nodes"] = len(members)
+    for category, key in CATEGORY_COUNTS.items():
+        meta[key] = 0
+    meta["branching_points"] = 0
+    category_of = {}
+    for category, indices in graph.buckets.items():
+        for i in indices:
+            category_of[i] = category
+    for i in members:
+        key = CATEGORY_COUNTS.get(category_of[i])
+        if key is not None:
+            meta[key] += 1
+        meta["branching_points"] += len(set(graph.successor_indices(i))) > 1
+    return meta
+
+def write_narrative_chunks(tree, out_dir=DEFAULT_CHUNK_DIR, strategy="path", max_chunk_nodes=None, clean=False, indent=2):
+    """Write one chunk file per partition plus a manifest of cross-chunk edges.
+
+    Chunks are numbered in order of their first node, so the chunk holding
+    root_id is always chunk1. Raises FileExistsError before writing anything
+    when a chunk file or manifest already in out_dir was not written by a
+    previous run. With clean=True, chunk files from the previous run that the
+    new partition does not reuse are removed so stale chunks do not linger.
+    """
+
+    graph = tree if isinstance(tree, NarrativeGraph) else NarrativeGraph(tree)
+    tree = graph.tree
+    labels = partition_narrative(graph, strategy, max_chunk_nodes)
+
+    order = []
+    members = {}
+    root = graph.index.get(graph.root_id)
+    for i in ([root] if root is not None else []) + list(range(len(graph))):
+        if labels[i] not in members:
+            order.append(labels[i])
+            members[labels[i]] = []
+    for i, label in enumerate(labels):
+        members[label].append(i)
+    files = {label: f"{CHUNK_PREFIX}{k + 1}_{label}.json" for k, label in enumerate(order)}
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST_FILE)
+    owned = owned_chunk_files(out_dir)
+    if owned is None:
+        owned = set()
+        foreign = [MANIFEST_FILE] if os.path.exists(manifest_path) else []
+    else:
+        foreign = []
+    foreign += [name for name in files.values() if name not in owned and os.path.exists(os.path.join(out_dir, name))]
+    if foreign:
+        raise FileExistsError(f"{out_dir} already has files this tool did not write: {', '.join(sorted(foreign))}")
+    if clean:
+        for name in owned - set(files.values()):
+            try:
+                os.remove(os.path.join(out_dir, name))
+            except FileNotFoundError:
+                pass
+
+    # Each chunk's meta.content describes that chunk alone, so caches can key chunk files by it
+    hashes = node_hashes(graph.nodes)
+    chunk_content = {}
+    envelope = {key: value for key, value in tree.items() if key != "nodes"}
+    for label in order:
+        chunk = dict(envelope, meta=chunk_meta(graph, tree.get("meta", {}), members[label]), nodes=[graph.nodes[i] for i in members[label]])
+        chunk_content[label] = chunk["meta"]["content"] = content_meta(chunk, hashes=[hashes[i] for i in members[label]])
+        with open(os.path.join(out_dir, files[label]), "w", encoding="utf-8") as fh:
+            json.dump(chunk, fh, indent=indent, ensure_ascii=False)
+
+    cross_edges = []
+    prefetch = {label: [] for label in order}
+    for i, node in enumerate(graph.nodes):
+        for choice in node.get("choices") or []:
+            target = graph.index.get(choice.get("next_id"))
+            if target is None or labels[target] == labels[i]:
+                continue
+            cross_edges.append({"from": graph.ids[i], "choice": choice.get("id"), "to": graph.ids[target], "chunk": files[labels[target]]})
+            if files[labels[target]] not in prefetch[labels[i]]:
+                prefetch[labels[i]].append(files[labels[target]])
+
+    manifest = {
+        "generator": MANIFEST_GENERATOR,
+        "root_id": graph.root_id,
+        "root_chunk": files[labels[root]] if root is not None else None,
+        "strategy": strategy,
+        "total_nodes": len(graph),
+        "merkle_root": merkle_root(hashes),
+        "chunks": [
+            {"file": files[label], "label": label, "nodes": len(members[label]), "hash": chunk_content[label]["merkle_root"], "prefetch": prefetch[label]}
+            for label in order
+        ],
+        "cross_edges": cross_edges,
+        "dangling": len(graph.dangling)
+    }
+    with open(manifest_path, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=indent, ensure_ascii=False)
+    return manifest
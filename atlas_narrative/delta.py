@@ -0,0 +1,197 @@
+# Id-indexed deltas between tree versions, so clients fetch only what changed
+#
+# A patch is {"format", "base", "target", "changes"}: base and target are the
+# tree_hash() of the two versions and changes is a record patch over the tree.
+#   record patch: {"set": {key: value}, "unset": [key], "patch": {key: record patch},
+#                  "lists": {key: list patch}, "keys": [key order, when it changed]}
+#   list patch:   {"removed": [id], "added": [[position, item]], "modified": {id: record patch},
+#                  "order": [id order, when surviving items moved]}
+# Lists of items with unique string ids (nodes, and the choices inside them) get
+# list patches; every other changed value is replaced whole. Empty parts are omitted.
+from .cache import tree_hash
+from .merkle import stored_tree_hash
+
+DELTA_FORMAT = "atlas-delta/1"
+
+# Keys whose lists are matched by item id, mapped to the same table for their items
+TREE_ID_LISTS = {"nodes": {"choices": {}}}
+
+def _index_by_id(items):
+    """{id: item} for a list of dicts with unique string ids, else None"""
+
+    index = {}
+    for item in items:
+        item_id = item.get("id") if isinstance(item, dict) else None
+        if not isinstance(item_id, str) or item_id in index:
+            return None
+        index[item_id] = item
+    return index
+
+def _diff_record(old, new, id_lists):
+    set_, patched, lists = {}, {}, {}
+    for key, value in new.items():
+        if key not in old:
+            set_[key] = value
+            continue
+        before = old[key]
+        if before == value:
+            continue
+        if key in id_lists and isinstance(before, list) and isinstance(value, list):
+            list_patch = _diff_list(before, value, id_lists[key])
+            if list_patch is not None:
+                lists[key] = list_patch
+                continue
+        if isinstance(before, dict) and isinstance(value, dict):
+            patched[key] = _diff_record(before, value, {})
+        else:
+            set_[key] = value
+    unset = [key for key in old if key not in new]
+
+    patch = {}
+    if set_:
+        patch["set"] = set_
+    if unset:
+        patch["unset"] = unset
+    if patched:
+        patch["patch"] = patched
+    if lists:
+        patch["lists"] = lists
+    # Applying keeps surviving keys in place and appends new ones; record the order when that differs
+    applied_order = [key for key in old if key in new] + [key for key in new if key not in old]
+    if applied_order != list(new):
+        patch["keys"] = list(new)
+    return patch
+
+def _diff_list(old_items, new_items, child_lists):
+    """List patch matching items by id, or None when either side lacks unique string ids"""
+
+    old_index = _index_by_id(old_items)
+    new_index = _index_by_id(new_items)
+    if old_index is None or new_index is None:
+        return None
+
+    added, modified = [], {}
+    for position, item in enumerate(new_items):
+        before = old_index.get(item["id"])
+        if before is None:
+            added.append([position, item])
+        elif before != item:
+            modified[item["id"]] = _diff_record(before, item, child_lists)
+
+    patch = {}
+    removed = [item_id for item_id in old_index if item_id not in new_index]
+    if removed:
+        patch["removed"] = removed
+    if added:
+        patch["added"] = added
+    if modified:
+        patch["modified"] = modified
+    # Positional inserts rebuild the list only while survivors keep their relative order
+    if [i for i in old_index if i in new_index] != [item["id"] for item in new_items if item["id"] in old_index]:
+        patch["order"] = list(new_index)
+    return patch
+
+def _apply_record(record, patch, id_lists):
+    result = dict(record)
+    try:
+        for key in patch.get("unset", ()):
+            del result[key]
+        result.update(patch.get("set", {}))
+        for key, sub in patch.get("patch", {}).items():
+            result[key] = _apply_record(result[key], sub, {})
+        for key, sub in patch.get("lists", {}).items():
+            result[key] = _apply_list(result[key], sub, id_lists.get(key, {}))
+        if "keys" in patch:
+            result = {key: result[key] for key in patch["keys"]}
+    except (KeyError, TypeError, AttributeError, StopIteration) as exc:
+        raise ValueError(f"patch does not apply: {exc!r}") from None
+    return result
+
+def _apply_list(items, patch, child_lists):
+    removed = set(patch.get("removed", ()))
+    modified = patch.get("modified", {})
+    survivors = []
+    seen_removed = seen_modified = 0
+    for item in items:
+        item_id = item["id"]
+        if item_id in removed:
+            seen_removed += 1
+            continue
+        sub = modified.get(item_id)
+        if sub is not None:
+            seen_modified += 1
+            item = _apply_record(item, sub, child_lists)
+        survivors.append(item)
+    if seen_removed != len(removed) or seen_modified != len(modified):
+        raise ValueError("patch does not apply: it removes or modifies ids missing from the list")
+
+    added = patch.get("added", [])
+    if "order" in patch:
+        by_id = {item["id"]: item for item in survivors}
+        by_id.update((item["id"], item) for _, item in added)
+        return [by_id[item_id] for item_id in patch["order"]]
+
+    result = []
+    survivor = iter(survivors)
+    a = 0
+    for position in range(len(survivors) + len(added)):
+        if a < len(added) and added[a][0] == position:
+            result.append(added[a][1])
+            a += 1
+        else:
+            result.append(next(survivor))
+    return result
+
+def diff_trees(old, new, trust_stored=False):
+    """Patch turning tree old into tree new, in time linear in the size of both trees.
+
+    With trust_stored=True the hashes come from meta.content when the trees carry
+    them, and equal hashes skip the node comparison entirely, leaving only the
+    envelope (meta, root_id, tokens) to diff. Only trust trees the generator
+    stamped: hand-edited nodes leave meta.content stale.
+    """
+
+    hashed = stored_tree_hash if trust_stored else tree_hash
+    base = hashed(old)
+    target = hashed(new)
+    if base == target and "nodes" in old and "nodes" in new:
+        changes = _diff_record(dict(old, nodes=None), dict(new, nodes=None), {})
+    else:
+        changes = _diff_record(old, new, TREE_ID_LISTS)
+    return {"format": DELTA_FORMAT, "base": base, "target": target, "changes": changes}
+
+def apply_patch(tree, patch, check=True):
+    """New tree with patch applied; unchanged nodes are shared with tree, which is not modified.
+
+    With check=True the tree must hash to the patch's base and the result to its
+    target, else ValueError is raised.
+    """
+
+    if patch.get("format") != DELTA_FORMAT:
+        raise ValueError(f"unsupported patch format {patch.get('format')!r}")
+    if check and tree_hash(tree) != patch["base"]:
+        raise ValueError("patch base does not match this tree version")
+    result = _apply_record(tree, patch["changes"], TREE_ID_LISTS)
+    if check and tree_hash(result) != patch["target"]:
+        raise ValueError("patched tree does not match the patch target")
+    return result
+
+def patch_summary(patch):
+    """Counts of added, removed and modified nodes and choices in a patch"""
+
+    nodes = patch["changes"].get("lists", {}).get("nodes", {})
+    summary = {
+        "nodes_added": len(nodes.get("added", ())),
+        "nodes_removed": len(nodes.get("removed", ())),
+        "nodes_modified": len(nodes.get("modified", ())),
+        "choices_added": 0,
+        "choices_removed": 0,
+        "choices_modified": 0,
+        "header_keys": sorted(key for part in ("set", "unset", "patch") for key in patch["changes"].get(part, ()))
+    }
+    for node_patch in nodes.get("modified", {}).values():
+        choices = node_patch.get("lists", {}).get("choices", {})
+        summary["choices_added"] += len(choices.get("added", ()))
+        summary["choices_removed"] += len(choices.get("removed", ()))
+        summary["choices_modified"] += len(choices.get("modified", ()))
+    return summary
@@ -0,0 +1,172 @@
+# Pluggable JSON encoders, dev/compact output modes and single-pass gzip/zstd export
+import gzip
+import json
+import os
+
+from .stringtable import pack_string_table, unpack_string_table
+from .trace import span
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder is used without it
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed for zstd output
+    zstandard = None
+
+# dev is the readable json.dumps(indent=2) layout, compact drops all optional whitespace
+MODES = ("dev", "compact")
+
+# Compression inferred from the output file suffix when none is given
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+
+# Nodes handed to the encoder per call while streaming the "nodes" array
+NODES_PER_CHUNK = 512
+
+def _stdlib_dumps(value, mode):
+    if mode == "dev":
+        return json.dumps(value, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _orjson_dumps(value, mode):
+    try:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 if mode == "dev" else 0)
+    except orjson.JSONEncodeError:  # ints beyond 64 bits, non-str keys, ...
+        return _stdlib_dumps(value, mode)
+
+# Encoder name -> dumps(value, mode) returning UTF-8 bytes laid out like the stdlib would
+ENCODERS = {"stdlib": _stdlib_dumps}
+if orjson is not None:
+    ENCODERS["orjson"] = _orjson_dumps
+
+def register_encoder(name, dumps):
+    """Add an encoder; dumps(value, mode) must return bytes identical to the stdlib layout for mode"""
+
+    ENCODERS[name] = dumps
+
+def get_encoder(name=None):
+    """(name, dumps) for an encoder; None or "auto" picks orjson when installed, else the stdlib"""
+
+    if name in (None, "auto"):
+        name = "orjson" if "orjson" in ENCODERS else "stdlib"
+    if name not in ENCODERS:
+        raise ValueError(f"encoder {name!r} is not available (have: {', '.join(ENCODERS)})")
+    return name, ENCODERS[name]
+
+def _check_mode(mode):
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {', '.join(MODES)}, got {mode!r}")
+
+def iter_encoded_tree(tree, mode="dev", encoder=None):
+    """Yield the encoded tree as byte chunks, encoding "nodes" NODES_PER_CHUNK at a time.
+
+    The concatenation is byte-for-byte what the encoder produces for the whole tree,
+    so in dev mode it matches json.dumps(tree, indent=2, ensure_ascii=False).
+    """
+
+    _check_mode(mode)
+    dumps = get_encoder(encoder)[1]
+    newline, pad, sep = (b"\n", b"  ", b": ") if mode == "dev" else (b"", b"", b":")
+    nested = newline + pad
+
+    yield b"{"
+    for at, (key, value) in enumerate(tree.items()):
+        yield (b"," if at else b"") + nested + dumps(key, mode) + sep
+        if key != "nodes":
+            yield dumps(value, mode).replace(b"\n", nested)
+            continue
+
+        nodes = list(value)
+        if not nodes:
+            yield b"[]"
+            continue
+        yield b"["
+        for start in range(0, len(nodes), NODES_PER_CHUNK):
+            # Strip the chunk's own brackets and re-indent its items one level deeper
+            text = dumps(nodes[start:start + NODES_PER_CHUNK], mode)
+            text = text[1:-2 if newline else -1].replace(b"\n", nested)
+            yield (b"," if start else b"") + text
+        yield nested + b"]"
+    yield newline + b"}" if tree else b"}"
+
+def dumps_tree(tree, mode="dev", encoder=None):
+    """Encode the whole tree to bytes with the chosen encoder and mode"""
+
+    _check_mode(mode)
+    return get_encoder(encoder)[1](tree, mode)
+
+def check_equivalence(tree, data):
+    """True when encoded bytes (plain or string-table packed) parse back to the same value as the stdlib encoding of tree"""
+
+    return unpack_string_table(json.loads(data)) == json.loads(_stdlib_dumps(tree, "compact"))
+
+def compression_for(path):
+    """Compression implied by a file suffix (.gz, .zst), or None"""
+
+    return COMPRESSION_SUFFIXES.get(os.path.splitext(path)[1])
+
+def _open_compressed(path, compression, level, write):
+    if compression == "gzip":
+        if write:
+            # mtime=0 keeps identical trees byte-identical on disk
+            return gzip.GzipFile(path, "wb", level, mtime=0)
+        return gzip.open(path, "rb")
+    if compression == "zstd":
+        if zstandard is None:
+            raise ImportError("zstd output requires the 'zstandard' package (pip install zstandard)")
+        if write:
+            return zstandard.ZstdCompressor(level=level).stream_writer(open(path, "wb"), closefd=True)
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    if compression is None:
+        return open(path, "wb" if write else "rb")
+    raise ValueError(f"compression must be 'gzip', 'zstd' or None, got {compression!r}")
+
+def write_encoded_tree(tree, path, mode="dev", encoder=None, compression="auto", level=None, verify=False, string_table=False):
+    """Encode and (optionally) compress the tree into path in one streaming pass.
+
+    compression="auto" follows the file suffix; string_table=True writes the
+    packed form from stringtable.pack_string_table(). With verify=True the file
+    is read back and must expand to the same value as the tree, else ValueError is raised.
+    Returns {"path", "mode", "encoder", "compression", "string_table", "nodes", "bytes", "file_bytes"}.
+    """
+
+    compression = compression_for(path) if compression == "auto" else compression
+    name = get_encoder(encoder)[0]
+    size = 0
+    with span("export") as export:
+        document = pack_string_table(tree) if string_table else tree
+        with _open_compressed(path, compression, level or DEFAULT_LEVELS.get(compression), True) as fh:
+            for chunk in iter_encoded_tree(document, mode, name):
+                fh.write(chunk)
+                size += len(chunk)
+        export.set(bytes=size, mode=mode, encoder=name, compression=compression, string_table=string_table)
+
+    if verify and not check_equivalence(tree, read_encoded_bytes(path, compression)):
+        raise ValueError(f"{path} does not parse back to the exported tree")
+
+    return {
+        "path": path,
+        "mode": mode,
+        "encoder": name,
+        "compression": compression,
+        "string_table": string_table,
+        "nodes": len(tree.get("nodes", ())),
+        "bytes": size,
+        "file_bytes": os.path.getsize(path)
+    }
+
+def read_encoded_bytes(path, compression="auto"):
+    """Raw JSON bytes of a plain, .gz or .zst export"""
+
+    compression = compression_for(path) if compression == "auto" else compression
+    with _open_compressed(path, compression, None, False) as fh:
+        return fh.read()
+
+def load_encoded_tree(path, compression="auto", expand=True):
+    """Parse a plain, .gz or .zst tree export, expanding string-table packed trees unless expand is False"""
+
+    tree = json.loads(read_encoded_bytes(path, compression))
+    return unpack_string_table(tree) if expand else tree
@@ -0,0 +1,312 @@
+# Server-side play engine: sessions step through choices, spending and earning chrono tokens
+#
+# Semantics follow the front end: a choice is available when its requires and its
+# target node's requires are held and its cost fits the remaining chrono tokens; taking it spends the cost,
+# grants the choice's flags plus the target node's own grants and moves on. On
+# top of that the engine pays out tokens.chrono.earn_rules:
+#   complete_skill_check    leaving a skill check node for anything but a fatal node
+#   perfect_skill_sequence  PERFECT_SEQUENCE_LENGTH skill checks in a row without a fatal answer
+#   discover_new_path       first arrival at a path entry node
+#   reach_milestone         first arrival at a golden path checkpoint
+from collections import OrderedDict
+from itertools import count
+
+from .flags import FlagRegistry
+from .cache import tree_hash
+from .graph import NarrativeGraph, classify_node_id
+from .merkle import stored_tree_hash
+
+# Consecutive correct skill checks that earn perfect_skill_sequence
+PERFECT_SEQUENCE_LENGTH = 3
+
+# Earn rule paid on first arrival at a node, per node category
+ARRIVAL_RULES = {"path_entry": "discover_new_path", "golden_path": "reach_milestone"}
+
+class Session:
+    """One player's position, chrono tokens, flag bitset and earn-rule progress"""
+
+    __slots__ = ("id", "node", "tokens", "flags", "steps", "streak", "seen")
+
+    def __init__(self, id, node, tokens, flags, steps=0, streak=0, seen=0):
+        self.id = id
+        self.node = node
+        self.tokens = tokens
+        self.flags = flags
+        self.steps = steps
+        self.streak = streak
+        self.seen = seen
+
+class NarrativeEngine:
+    """Compiled tree that steps sessions; build once per tree version and share across sessions.
+
+    Raises ValueError when root_id is not a node or a node repeats a choice id.
+    tree_hash, stamped into snapshots, is recomputed from the nodes unless
+    trust_stored reads it from meta.content (see routes.cached_routes()).
+    """
+
+    def __init__(self, tree, trust_stored=False):
+        graph = NarrativeGraph(tree)
+        if graph.root_id not in graph.index:
+            raise ValueError(f"root_id {graph.root_id!r} is not a node")
+        self.graph = graph
+        self.ids = graph.ids
+        self.root = graph.index[graph.root_id]
+        self.tree_hash = (stored_tree_hash if trust_stored else tree_hash)(tree)
+        self.registry = registry = FlagRegistry.from_tree(tree)
+
+        chrono = tree.get("tokens", {}).get("chrono", {})
+        self.start_tokens = int(chrono.get("start", 0))
+        self.earn = {rule["action"]: int(rule["amount"]) for rule in chrono.get("earn_rules") or []}
+
+        categories = [classify_node_id(node_id) for node_id in graph.ids]
+        self.node_grants = [registry.mask(node.get("grants")) for node in graph.nodes]
+        node_requires = [registry.mask(node.get("requires")) for node in graph.nodes]
+        self.skill = [category == "skill" for category in categories]
+        self.fatal = [category == "fatal" for category in categories]
+        self.terminal = [not node.get("choices") for node in graph.nodes]
+
+        # First-visit earn rules: (seen bit, action) per node, None elsewhere
+        self.arrival = [None] * len(graph)
+        slots = 0
+        for i, category in enumerate(categories):
+            if category in ARRIVAL_RULES:
+                self.arrival[i] = (1 << slots, ARRIVAL_RULES[category])
+                slots += 1
+
+        # Per node {choice id: (target index or -1, cost, require mask, grant mask)}; the require
+        # mask includes the target node's requires. Steps name choices by id, so a node with two
+        # choices sharing an id is rejected
+        self.edges = []
+        for node in graph.nodes:
+            edges = {}
+            for choice in node.get("choices") or []:
+                choice_id = choice.get("id")
+                if choice_id in edges:
+                    raise ValueError(f"node {node['id']!r} has more than one choice with id {choice_id!r}")
+                target = graph.index.get(choice.get("next_id"), -1)
+                edges[choice_id] = (
+                    target,
+                    choice.get("cost", 0),
+                    registry.mask(choice.get("requires")) | (node_requires[target] if target >= 0 else 0),
+                    registry.mask(choice.get("grants"))
+                )
+            self.edges.append(edges)
+
+    def new_session(self, session_id=None):
+        """Session at the root with the starting tokens and the root's grants"""
+
+        arrival = self.arrival[self.root]
+        return Session(session_id, self.root, self.start_tokens, self.node_grants[self.root],
+                       seen=0 if arrival is None else arrival[0])
+
+    def status(self, session):
+        """ended at a terminal node, stuck when no choice is available, else playing"""
+
+        if self.terminal[session.node]:
+            return "ended"
+        for target, cost, require, _ in self.edges[session.node].values():
+            if target >= 0 and session.flags & require == require and cost <= session.tokens:
+                return "playing"
+        return "stuck"
+
+    def choices(self, session):
+        """The current node's choices with an available flag for this session"""
+
+        edges = self.edges[session.node]
+        listed = []
+        for choice in self.graph.nodes[session.node].get("choices") or []:
+            target, cost, require, _ = edges[choice.get("id")]
+            listed.append({
+                "id": choice.get("id"),
+                "label": choice.get("label"),
+                "cost": cost,
+                "available": session.flags & require == require and cost <= session.tokens and target >= 0
+            })
+        return listed
+
+    def step(self, session, choice_id):
+        """Take one choice; see step_many() for the result format"""
+
+        return self.step_many(((session, choice_id),))[0]
+
+    def step_many(self, moves):
+        """Apply (session, choice id) moves in order, returning one result dict per move.
+
+        Accepted moves return {"ok": True, "node", "tokens", "earned", "ended"},
+        where earned lists the earn-rule actions paid out. Rejected moves leave the
+        session untouched and return {"ok": False, "error", "node", "tokens"} with
+        error one of unknown_choice, requires_unmet, insufficient_tokens or
+        dangling_choice. For thousands of sessions per batch, vector.VectorEngine
+        applies the same rules to sessions held as NumPy arrays.
+        """
+
+        ids, edges_of, node_grants = self.ids, self.edges, self.node_grants
+        skill, fatal, terminal, arrival = self.skill, self.fatal, self.terminal, self.arrival
+        earn = self.earn
+        check_reward = earn.get("complete_skill_check", 0)
+        sequence_reward = earn.get("perfect_skill_sequence", 0)
+        results = []
+        for session, choice_id in moves:
+            node = session.node
+            edge = edges_of[node].get(choice_id)
+            error = None
+            if edge is None:
+                error = "unknown_choice"
+            else:
+                target, cost, require, grant = edge
+                if session.flags & require != require:
+                    error = "requires_unmet"
+                elif cost > session.tokens:
+                    error = "insufficient_tokens"
+                elif target < 0:
+                    error = "dangling_choice"
+            if error is not None:
+                results.append({"ok": False, "error": error, "node": ids[node], "tokens": session.tokens})
+                continue
+
+            tokens = session.tokens - cost
+            earned = []
+            if skill[node]:
+                if fatal[target]:
+                    session.streak = 0
+                else:
+                    earned.append("complete_skill_check")
+                    tokens += check_reward
+                    session.streak += 1
+                    if session.streak == PERFECT_SEQUENCE_LENGTH:
+                        earned.append("perfect_skill_sequence")
+                        tokens += sequence_reward
+                        session.streak = 0
+            first_visit = arrival[target]
+            if first_visit is not None and not session.seen & first_visit[0]:
+                session.seen |= first_visit[0]
+                earned.append(first_visit[1])
+                tokens += earn.get(first_visit[1], 0)
+
+            session.node = target
+            session.tokens = tokens
+            session.flags |= grant | node_grants[target]
+            session.steps += 1
+            results.append({"ok": True, "node": ids[target], "tokens": tokens, "earned": earned, "ended": terminal[target]})
+        return results
+
+    def snapshot(self, session):
+        """JSON-ready session state, restorable on any engine whose tree has the same node and flag ids"""
+
+        return {
+            "id": session.id,
+            "node": self.ids[session.node],
+            "tokens": session.tokens,
+            "flags": self.registry.flags(session.flags),
+            "steps": session.steps,
+            "streak": session.streak,
+            "discovered": [self.ids[i] for i, first in enumerate(self.arrival) if first is not None and session.seen & first[0]],
+            "tree_hash": self.tree_hash
+        }
+
+    def restore(self, snapshot):
+        """Session from snapshot(); ValueError when its node or flags are not in this tree"""
+
+        try:
+            node = self.graph.index[snapshot["node"]]
+            flags = self.registry.mask(snapshot["flags"])
+            seen = 0
+            for node_id in snapshot.get("discovered", ()):
+                seen |= self.arrival[self.graph.index[node_id]][0]
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"snapshot does not fit this tree: {exc!r}") from None
+        return Session(snapshot.get("id"), node, int(snapshot["tokens"]), flags,
+                       int(snapshot.get("steps", 0)), int(snapshot.get("streak", 0)), seen)
+
+class SessionStore:
+    """In-memory sessions by id, evicting the least recently used beyond capacity.
+
+    on_evict(snapshot) is called with each evicted session's snapshot so it can
+    be persisted and later passed back to restore().
+    """
+
+    def __init__(self, engine, capacity=100_000, on_evict=None):
+        self.engine = engine
+        self.capacity = capacity
+        self.on_evict = on_evict
+        self.sessions = OrderedDict()
+        self.evicted = 0
+        self._next_id = count(1)
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def __contains__(self, session_id):
+        return session_id in self.sessions
+
+    def _add(self, session):
+        if session.id in self.sessions:
+            raise ValueError(f"session id {session.id!r} is already in use")
+        self.sessions[session.id] = session
+        while len(self.sessions) > self.capacity:
+            _, evicted = self.sessions.popitem(last=False)
+            self.evicted += 1
+            if self.on_evict is not None:
+                self.on_evict(self.engine.snapshot(evicted))
+        return session
+
+    def create(self, session_id=None):
+        """New session at the root; ValueError when session_id is taken.
+
+        Ids default to "s1", "s2", ..., skipping any a caller already chose.
+        """
+
+        if session_id is None:
+            session_id = f"s{next(self._next_id)}"
+            while session_id in self.sessions:
+                session_id = f"s{next(self._next_id)}"
+        return self._add(self.engine.new_session(session_id))
+
+    def get(self, session_id):
+        """Session by id, marked most recently used, or None"""
+
+        session = self.sessions.get(session_id)
+        if session is not None:
+            self.sessions.move_to_end(session_id)
+        return session
+
+    def remove(self, session_id):
+        return self.sessions.pop(session_id, None)
+
+    def step(self, session_id, choice_id):
+        return self.step_many(((session_id, choice_id),))[0]
+
+    def step_many(self, moves):
+        """engine.step_many() over (session id, choice id) moves; unknown ids get error unknown_session"""
+
+        sessions = self.sessions
+        moves = moves if isinstance(moves, (list, tuple)) else list(moves)
+        results = [None] * len(moves)
+        resolved, slots = [], []
+        for k, (session_id, choice_id) in enumerate(moves):
+            session = sessions.get(session_id)
+            if session is None:
+                results[k] = {"ok": False, "error": "unknown_session", "node": None, "tokens": None}
+                continue
+            sessions.move_to_end(session_id)
+            resolved.append((session, choice_id))
+            slots.append(k)
+        for k, result in zip(slots, self.engine.step_many(resolved)):
+            results[k] = result
+        return results
+
+    def snapshot(self):
+        """Every session's snapshot, least recently used first"""
+
+        return {"tree_hash": self.engine.tree_hash, "sessions": [self.engine.snapshot(s) for s in self.sessions.values()]}
+
+    def restore(self, snapshot):
+        """Add the sessions of a snapshot() (or of on_evict snapshots in a list), returning how many.
+
+        Raises ValueError when a restored id is already live.
+        """
+
+        sessions = snapshot["sessions"] if isinstance(snapshot, dict) else snapshot
+        for data in sessions:
+            self._add(self.engine.restore(data))
+        return len(sessions)
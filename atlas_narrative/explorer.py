@@ -0,0 +1,123 @@
+# Exhaustive (node, flags, chrono tokens) state-space explorer
+from collections import deque
+
+from .flags import FlagRegistry
+from .graph import NarrativeGraph
+
+def compile_transitions(graph, registry):
+    """Per node list of (target index, cost, require mask, grant mask, choice id) for resolvable choices.
+
+    Masks keep only the registry's required bits; the require mask also holds
+    the target node's requires and the grant mask its grants, so entering a node
+    costs and gives exactly what the game checks.
+    """
+
+    keep = registry.required_mask
+    node_grants = [registry.mask(node.get("grants")) & keep for node in graph.nodes]
+    node_requires = [registry.mask(node.get("requires")) & keep for node in graph.nodes]
+    transitions = []
+    for node in graph.nodes:
+        edges = []
+        for choice in node.get("choices") or []:
+            target = graph.index.get(choice.get("next_id"))
+            if target is None:
+                continue
+            edges.append((
+                target,
+                choice.get("cost", 0),
+                (registry.mask(choice.get("requires")) & keep) | node_requires[target],
+                (registry.mask(choice.get("grants")) & keep) | node_grants[target],
+                choice.get("id")
+            ))
+        transitions.append(edges)
+    return transitions, node_grants
+
+def _dominated(frontier, flags, tokens):
+    """True when a kept state at the same node has a superset of flags and at least as many tokens"""
+
+    for kept_flags, kept_tokens in frontier:
+        if kept_tokens >= tokens and kept_flags & flags == flags:
+            return True
+    return False
+
+def explore_states(tree, prune_dominated=False, max_states=None):
+    """Enumerate reachable (node, flags, tokens) states and summarise every ending.
+
+    Flags only grow and tokens only shrink, so the visited-state set alone is
+    enough to terminate retry loops. With prune_dominated, a state is skipped
+    when one already seen at the same node has a superset of its flags and no
+    fewer tokens; reachability and min_cost stay exact but max_cost is not
+    reported because costlier routes get pruned.
+    """
+
+    graph = NarrativeGraph(tree)
+    registry = FlagRegistry.from_tree(tree)
+    transitions, node_grants = compile_transitions(graph, registry)
+    ending_set = set(graph.buckets["ending"])
+    start_tokens = int(tree.get("tokens", {}).get("chrono", {}).get("start", 0))
+
+    root = graph.index[graph.root_id]
+    start = (root, node_grants[root], start_tokens)
+    seen = {start}
+    frontiers = [[] for _ in graph.nodes]
+    frontiers[root].append((start[1], start[2]))
+    queue = deque([start])
+
+    # Per terminal node index: [states reaching it, min cost, max cost]
+    reached = {}
+    stuck = set()
+    truncated = False
+
+    while queue:
+        node, flags, tokens = queue.popleft()
+        edges = transitions[node]
+        if not graph.nodes[node].get("choices"):
+            cost = start_tokens - tokens
+            stats = reached.get(node)
+            if stats is None:
+                reached[node] = [1, cost, cost]
+            else:
+                stats[0] += 1
+                stats[1] = min(stats[1], cost)
+                stats[2] = max(stats[2], cost)
+            continue
+
+        moved = False
+        for target, cost, require, grant, _ in edges:
+            if cost > tokens or flags & require != require:
+                continue
+            moved = True
+            state = (target, flags | grant, tokens - cost)
+            if state in seen:
+                continue
+            if prune_dominated:
+                if _dominated(frontiers[target], state[1], state[2]):
+                    continue
+                frontiers[target].append((state[1], state[2]))
+            seen.add(state)
+            queue.append(state)
+        if not moved:
+            stuck.add(node)
+        if max_states is not None and len(seen) >= max_states:
+            truncated = True
+            break
+
+    endings = {}
+    for i in graph.buckets["ending"] + [i for i in reached if i not in ending_set]:
+        stats = reached.get(i)
+        endings[graph.ids[i]] = {
+            "reachable": stats is not None,
+            "states": stats[0] if stats else 0,
+            "min_cost": stats[1] if stats else None,
+            "max_cost": stats[2] if stats and not prune_dominated else None
+        }
+
+    return {
+        "states": len(seen),
+        "truncated": truncated,
+        "pruned": prune_dominated,
+        "tracked_flags": registry.names[:registry.required_count],
+        "start_tokens": start_tokens,
+        "stuck_nodes": [graph.ids[i] for i in sorted(stuck)],
+        "endings": endings
+    }
@@ -0,0 +1,114 @@
+# Interned flag registry and integer bitset player state
+import hashlib
+
+def satisfies(state, require_mask):
+    """True when every bit of require_mask is set in state"""
+    return state & require_mask == require_mask
+
+class FlagRegistry:
+    """Maps every flag used in a tree to a bit position.
+
+    Flags that appear in some requires list take the lowest bits, so code that
+    only cares about availability checks can mask state down to
+    (1 << required_count) - 1. A player's flag set is a plain int.
+    """
+
+    def __init__(self, names=(), required_count=0):
+        self.names = []
+        self.bits = {}
+        for name in names:
+            self.intern(name)
+        self.required_count = required_count
+
+    @classmethod
+    def from_tree(cls, tree):
+        """Registry of every grant and requires flag in the tree, in first-seen order"""
+
+        required = {}
+        granted = {}
+        for node in tree["nodes"]:
+            for flag in node.get("requires") or []:
+                required.setdefault(flag, None)
+            for flag in node.get("grants") or []:
+                granted.setdefault(flag, None)
+            for choice in node.get("choices") or []:
+                for flag in choice.get("requires") or []:
+                    required.setdefault(flag, None)
+                for flag in choice.get("grants") or []:
+                    granted.setdefault(flag, None)
+        names = list(required) + [flag for flag in granted if flag not in required]
+        return cls(names, required_count=len(required))
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data["flags"], required_count=data["required_count"])
+
+    def to_json(self):
+        return {"flags": list(self.names), "required_count": self.required_count, "fingerprint": self.fingerprint}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, flag):
+        return flag in self.bits
+
+    def intern(self, flag):
+        """Bit position for a flag, assigning the next free one if it is new"""
+
+        bit = self.bits.get(flag)
+        if bit is None:
+            bit = self.bits[flag] = len(self.names)
+            self.names.append(flag)
+        return bit
+
+    @property
+    def required_mask(self):
+        return (1 << self.required_count) - 1
+
+    @property
+    def nbytes(self):
+        return (len(self.names) + 7) // 8
+
+    @property
+    def fingerprint(self):
+        """Short hash of the bit layout, to reject saved states from another registry"""
+        return hashlib.sha256("\n".join(self.names).encode("utf-8")).hexdigest()[:16]
+
+    def mask(self, flags):
+        """Bitset of a list of flags; unknown flags raise KeyError"""
+
+        state = 0
+        for flag in flags or ():
+            state |= 1 << self.bits[flag]
+        return state
+
+    def flags(self, state):
+        """Flag names set in a bitset, in bit order"""
+
+        names = []
+        while state:
+            low = state & -state
+            names.append(self.names[low.bit_length() - 1])
+            state ^= low
+        return names
+
+    def choice_masks(self, choice):
+        """(require_mask, grant_mask) for a choice dict"""
+        return self.mask(choice.get("requires")), self.mask(choice.get("grants"))
+
+    def available(self, state, choice):
+        return satisfies(state, self.mask(choice.get("requires")))
+
+    def to_bytes(self, state):
+        """Fixed-width little-endian encoding of a state for saving"""
+        return state.to_bytes(self.nbytes, "little")
+
+    def from_bytes(self, data):
+        state = int.from_bytes(data, "little")
+        if state >> len(self.names):
+            raise ValueError("saved flag state has bits outside this registry")
+        return state
+
+    def words(self, state, count):
+        """Split a bitset into count little-endian 64-bit words"""
+        return [(state >> (64 * w)) & 0xFFFFFFFFFFFFFFFF for w in range(count)]
@@ -0,0 +1,947 @@
+# Generate the COMPLETE narrative tree with 100+ nodes as originally specified
+#
+# Only the section builders' templates are imported up front; hashing, metrics,
+# caching, chunking and tracing are imported by the functions that use them, so
+# `import atlas_narrative.generator` stays cheap for callers that only build nodes.
+import json
+import os
+from datetime import datetime
+
+from .templates import bridge_chain, cinematic, ending_nodes, golden_checkpoints, skill_check_triads
+
+# Width reserved for meta.total_nodes (and other late meta counts) so the streaming writer can patch them in place
+TOTAL_NODES_WIDTH = 20
+
+def atlas_narrative_header(chrono_start=3):
+    """Build the tree envelope (meta, root_id, tokens) without any nodes.
+    
+    The node counts in meta are zero until metrics.stamp_structure() fills them in.
+    """
+    
+    return {
+        "meta": {
+            "version": "1.0.0", 
+            "updated_utc": datetime.utcnow().isoformat() + "Z",
+            "title": "The ATLAS Directive",
+            "description": "Complete interactive narrative discovery platform for 3I/ATLAS",
+            "total_nodes": 0,
+            "endings": 0,
+            "golden_path_nodes": 0,
+            "skill_checks": 0,
+            "branching_points": 0
+        },
+        "root_id": "mission_briefing",
+        "tokens": {
+            "chrono": {
+                "start": chrono_start,
+                "earn_rules": [
+                    {"action": "complete_skill_check", "amount": 1},
+                    {"action": "discover_new_path", "amount": 2}, 
+                    {"action": "reach_milestone", "amount": 3},
+                    {"action": "perfect_skill_sequence", "amount": 5}
+                ]
+            }
+        }
+    }
+
+def build_opening_section():
+    """Mission briefing and opening nodes"""
+    
+    # === OPENING SEQUENCE (5 nodes) ===
+    yield from [
+        {
+            "id": "mission_briefing",
+            "title": "Mission Briefing",
+            "body_md": "**ATLAS DIRECTIVE - CLASSIFICATION: RESTRICTED**\n\nYou are Analyst designation ALT-7, newly assigned to The ATLAS Directive. Object 3I/ATLAS was discovered July 1, 2025, by the ATLAS telescope system in Chile. This ancient wanderer from beyond our solar system approaches perihelion in late October 2025.\n\nYour analysis will shape humanity's response to our third interstellar visitor.",
+            "choices": [
+                {"id": "choice_trajectory", "label": "Analyze trajectory data", "next_id": "skill_trajectory_type", "grants": ["mission_started"]},
+                {"id": "choice_background", "label": "Review previous interstellar objects", "next_id": "skill_oumuamua_comparison", "grants": ["comparative_analysis"]},
+                {"id": "choice_briefing_deep", "label": "Request detailed mission parameters", "next_id": "deep_briefing", "grants": ["thorough_preparation"]}
+            ],
+            "cinematic": {"animation_key": "mission_start", "view": "default", "timeline": {"seek_pct": 0.1}}
+        },
+        {
+            "id": "deep_briefing",
+            "title": "Detailed Mission Briefing",
+            "body_md": "**EXPANDED BRIEFING**: 3I/ATLAS measures approximately 137,000 mph relative to the Sun. Its nucleus diameter ranges from 440 meters to 5.6 kilometers. Chemical analysis reveals standard cometary volatiles: water ice, carbon monoxide, and methane.",
+            "choices": [
+                {"id": "briefing_to_trajectory", "label": "Proceed to trajectory analysis", "next_id": "skill_trajectory_type", "grants": ["detailed_knowledge"]},
+                {"id": "briefing_to_comparison", "label": "Compare with previous visitors", "next_id": "skill_oumuamua_comparison", "grants": ["comprehensive_context"]}
+            ]
+        }
+    ]
+    
+def build_skill_checks_section():
+    """Skill check questions with their confirmation and retry nodes"""
+    
+    # === SKILL CHECK SEQUENCE (25 nodes total) ===
+    # (skill_id, title, question, correct, incorrect, confirmed, fatal); see skill_check_triads()
+    skill_checks = [
+        (
+            "skill_trajectory_type", "Trajectory Analysis",
+            "**SKILL CHECK**: Initial orbital analysis confirms 3I/ATLAS follows which trajectory type, proving its interstellar origin?",
+            ("correct_hyperbolic", "Hyperbolic orbit with eccentricity >1.0", "trajectory_confirmed", ("skill_orbital_mechanics", "analysis_correct")),
+            [("incorrect_elliptical", "Elliptical orbit bound to solar system"), ("incorrect_parabolic", "Parabolic escape trajectory")],
+            None,
+            ("fatal_trajectory_error", "Analysis Error",
+             "**DIRECTIVE FAILURE**: 3I/ATLAS follows a hyperbolic trajectory with eccentricity >1.0, confirming interstellar origin and escape velocity. Review orbital mechanics principles.",
+             ("retry_trajectory", "Access training materials and retry"), cinematic("error_state", fx=("glow",)))
+        ),
+        (
+            "skill_oumuamua_comparison", "Historical Analysis",
+            "**SKILL CHECK**: 1I/'Oumuamua was distinguished by which unprecedented characteristic?",
+            ("correct_elongated", "Extreme elongation up to 10:1 ratio", "oumuamua_confirmed", ("skill_comparison",)),
+            [("incorrect_spherical", "Spherical asteroid shape"), ("incorrect_cubic", "Artificial cubic geometry")],
+            ("oumuamua_confirmed", "Comparative Analysis Complete",
+             "Correct. 'Oumuamua's unprecedented elongation distinguished it from all known objects. This knowledge aids 3I/ATLAS analysis.",
+             [("proceed_to_trajectory", "Proceed to trajectory analysis", "skill_trajectory_type"), ("borisov_comparison", "Also review 2I/Borisov characteristics", "skill_borisov_analysis", ("comprehensive_comparison",))]),
+            ("fatal_comparison_error", "Historical Error",
+             "**INCORRECT**: 'Oumuamua exhibited unprecedented elongation. Understanding predecessor objects is crucial.",
+             ("retry_comparison", "Review historical data"), None)
+        ),
+        (
+            "skill_borisov_analysis", "2I/Borisov Analysis",
+            "**SKILL CHECK**: 2I/Borisov was distinguished by which unusual chemical signature?",
+            ("correct_co_high", "Extremely high CO concentration - 9 to 26 times higher than solar system comets", "borisov_confirmed", ("skill_chemistry",)),
+            [("incorrect_co_normal", "Normal carbon monoxide levels")],
+            ("borisov_confirmed", "Chemical Analysis Understanding",
+             "Correct. 2I/Borisov's extreme CO enrichment indicated formation in extremely cold environments around different stellar types.",
+             [("apply_to_atlas", "Apply this knowledge to 3I/ATLAS", "trajectory_confirmed")]),
+            ("fatal_borisov_error", "Chemistry Error",
+             "**INCORRECT**: 2I/Borisov showed extraordinarily high CO concentrations indicating formation in cold stellar environments.",
+             ("retry_borisov", "Review chemical analysis"), None)
+        ),
+        (
+            "skill_atlas_velocity", "Velocity Analysis",
+            "**SKILL CHECK**: 3I/ATLAS travels at approximately what velocity relative to the Sun?",
+            ("correct_137k_mph", "137,000 mph - hyperbolic escape velocity", "velocity_confirmed", ("skill_kinematics",)),
+            [("incorrect_67k_mph", "67,000 mph - Earth orbital velocity")],
+            ("velocity_confirmed", "Kinematic Analysis Complete",
+             "Correct. 3I/ATLAS's velocity confirms hyperbolic trajectory and interstellar origin.",
+             [("proceed_paths", "Proceed to investigation paths", "trajectory_confirmed")]),
+            ("fatal_velocity_error", "Velocity Error",
+             "**INCORRECT**: 3I/ATLAS travels at ~137,000 mph, well above solar system escape velocity.",
+             ("retry_velocity", "Review velocity data"), None)
+        ),
+        (
+            "skill_hyperbolic_definition", "Orbital Mechanics Fundamentals",
+            "**SKILL CHECK**: A hyperbolic orbit is characterized by:",
+            ("correct_ecc_greater", "Eccentricity greater than 1 - object has escape velocity", "orbital_mechanics_mastery", ("skill_fundamentals",)),
+            [("incorrect_ecc_less", "Eccentricity less than 1 - object remains bound")],
+            ("orbital_mechanics_mastery", "Orbital Mechanics Mastery",
+             "Excellent. Your understanding of orbital mechanics is solid. This knowledge will be crucial for advanced analysis.",
+             [("continue_analysis", "Continue with 3I/ATLAS analysis", "trajectory_confirmed")]),
+            ("fatal_orbital_error", "Orbital Mechanics Error",
+             "**INCORRECT**: Hyperbolic orbits have eccentricity >1, indicating permanent escape from gravitational influence.",
+             ("retry_orbital", "Review orbital mechanics"), None)
+        ),
+        (
+            "skill_atlas_age", "Age Analysis",
+            "**SKILL CHECK**: 3I/ATLAS is estimated to be approximately:",
+            ("correct_7billion", "Over 7 billion years - older than our solar system", "age_analysis_complete", ("skill_galactic_evolution",)),
+            [("incorrect_46billion", "4.6 billion years - same age as solar system")],
+            ("age_analysis_complete", "Galactic Timeline Understanding",
+             "Correct. 3I/ATLAS predates our solar system, originating from the Milky Way thick disk during early galactic formation.",
+             [("thick_disk_analysis", "Analyze thick disk implications", "skill_galactic_structure")]),
+            ("fatal_age_error", "Age Analysis Error",
+             "**INCORRECT**: 3I/ATLAS predates our solar system by billions of years, originating from ancient galactic structures.",
+             ("retry_age", "Study galactic formation"), None)
+        ),
+        (
+            "skill_galactic_structure", "Galactic Structure Analysis",
+            "**SKILL CHECK**: The Milky Way thick disk contains:",
+            ("correct_old_stars", "Old stars, 7-10+ billion years, from galaxy's early formation", "galactic_structure_confirmed", ("skill_astrophysics",)),
+            [("incorrect_young_stars", "Young, recently formed stars with high metallicity")],
+            ("galactic_structure_confirmed", "Astrophysical Knowledge Confirmed",
+             "Excellent. The thick disk's ancient stellar populations explain 3I/ATLAS's remarkable age and composition.",
+             [("proceed_to_paths", "Apply knowledge to investigation", "trajectory_confirmed")]),
+            ("fatal_galactic_error", "Galactic Structure Error",
+             "**INCORRECT**: The thick disk contains ancient stellar populations from our galaxy's early assembly period.",
+             ("retry_galactic", "Study galactic evolution"), None)
+        ),
+    ]
+    
+    yield from skill_check_triads(skill_checks)
+    
+
+def build_path_selection_section():
+    """Main branching point that assigns the investigation path"""
+    
+    # === MAIN BRANCHING POINT ===
+    yield {
+        "id": "trajectory_confirmed",
+        "title": "Investigation Path Selection",
+        "body_md": "**ANALYSIS CONFIRMED**: 3I/ATLAS exhibits confirmed interstellar characteristics. Command assigns your specialization focus for the approach phase:",
+        "choices": [
+            {"id": "path_scientific", "label": "Scientific Analysis - Deep composition and physics study", "next_id": "scientific_path_entry", "grants": ["path_scientific", "trait_analyst", "trait_pragmatist"]},
+            {"id": "path_anomaly", "label": "Anomaly Investigation - Examine unusual behavioral patterns", "next_id": "anomaly_path_entry", "grants": ["path_anomaly", "trait_mystic", "trait_risk_taker"]},
+            {"id": "path_geopolitical", "label": "Geopolitical Assessment - Global response and cooperation", "next_id": "geopolitical_path_entry", "grants": ["path_geopolitical", "trait_leader", "trait_pragmatist"]},
+            {"id": "path_intervention", "label": "Intervention Planning - Active engagement protocols", "next_id": "intervention_path_entry", "grants": ["path_intervention", "trait_risk_taker", "trait_leader"]}
+        ],
+        "cinematic": {"animation_key": "path_selection", "view": "topDown", "timeline": {"seek_pct": 0.25}}
+    }
+    
+def build_scientific_path_section():
+    """Scientific analysis path"""
+    
+    # === SCIENTIFIC ANALYSIS PATH (25 nodes) ===
+    scientific_nodes = [
+        {
+            "id": "scientific_path_entry",
+            "title": "Scientific Analysis Initialization",
+            "body_md": "**SCIENTIFIC ANALYSIS PATH**: Deep spectroscopic protocols activated. JWST observations confirm volatile compounds in 3I/ATLAS's coma. Which combination was detected?",
+            "choices": [
+                {"id": "correct_volatiles", "label": "Water ice (H₂O), Carbon monoxide (CO), Methane (CH₄)", "next_id": "volatiles_confirmed", "grants": ["skill_spectroscopy"]},
+                {"id": "incorrect_exotic", "label": "Exotic silicon-based polymers only", "next_id": "fatal_volatiles_error", "cost": 1},
+                {"id": "incorrect_metals", "label": "Metallic compounds and rare earth elements", "next_id": "fatal_volatiles_error", "cost": 1}
+            ],
+            "requires": ["path_scientific"],
+            "cinematic": {"animation_key": "scientific_analysis", "view": "closeup", "fx": {"glow": True}}
+        },
+        {
+            "id": "volatiles_confirmed",
+            "title": "Compositional Analysis",
+            "body_md": "Confirmed standard cometary volatiles. However, concentration ratios differ from solar system norms. Next analytical priority:",
+            "choices": [
+                {"id": "age_analysis", "label": "Determine formation age", "next_id": "skill_atlas_age", "grants": ["methodical_approach"]},
+                {"id": "density_analysis", "label": "Calculate bulk density", "next_id": "density_determination", "grants": ["comprehensive_analysis"]},
+                {"id": "isotope_analysis", "label": "Analyze isotopic ratios", "next_id": "isotope_investigation", "grants": ["advanced_chemistry"]}
+            ]
+        },
+        {
+            "id": "fatal_volatiles_error",
+            "title": "Spectroscopic Analysis Error",
+            "body_md": "**INCORRECT**: JWST confirmed standard volatile compounds consistent with cometary composition from interstellar space.",
+            "choices": [{"id": "retry_volatiles", "label": "Review spectroscopic data", "next_id": "scientific_path_entry"}]
+        },
+        {
+            "id": "density_determination",
+            "title": "Physical Characteristics",
+            "body_md": "**ADVANCED ANALYSIS**: Bulk density calculations suggest 3I/ATLAS has:",
+            "choices": [
+                {"id": "low_density", "label": "Low density ~0.5 g/cm³ - typical for comets", "next_id": "density_confirmed", "grants": ["skill_physics"]},
+                {"id": "high_density", "label": "High density ~5.0 g/cm³ - rocky composition", "next_id": "density_error", "cost": 1}
+            ]
+        },
+        {
+            "id": "density_confirmed",
+            "title": "Physical Model Validated",
+            "body_md": "Density analysis confirms cometary composition. This supports the volatile compound findings.",
+            "choices": [{"id": "continue_scientific", "label": "Continue comprehensive analysis", "next_id": "solar_flare_event"}]
+        },
+        {
+            "id": "density_error",
+            "title": "Density Calculation Error",
+            "body_md": "**INCORRECT**: Observational constraints indicate low density consistent with cometary composition.",
+            "choices": [{"id": "retry_density", "label": "Recalculate physical parameters", "next_id": "density_determination"}]
+        },
+        {
+            "id": "isotope_investigation",
+            "title": "Isotopic Analysis",
+            "body_md": "**ADVANCED CHEMISTRY**: Isotope ratios reveal 3I/ATLAS formed in an environment with:",
+            "choices": [
+                {"id": "stellar_ratios", "label": "Different stellar nucleosynthesis than our solar system", "next_id": "isotope_breakthrough", "grants": ["skill_nuclear_chemistry"]},
+                {"id": "solar_ratios", "label": "Identical ratios to solar system objects", "next_id": "isotope_error", "cost": 1}
+            ]
+        },
+        {
+            "id": "isotope_breakthrough",
+            "title": "Nucleosynthesis Discovery",
+            "body_md": "**BREAKTHROUGH**: Isotopic signatures confirm formation around different stellar types than our Sun. This is direct evidence of interstellar origin.",
+            "choices": [{"id": "revolutionary_implications", "label": "Analyze revolutionary implications", "next_id": "solar_flare_event"}],
+            "cinematic": {"animation_key": "breakthrough_discovery", "fx": {"glow": True}}
+        },
+        {
+            "id": "isotope_error",
+            "title": "Isotopic Analysis Error", 
+            "body_md": "**INCORRECT**: Isotopic ratios differ from solar system norms, confirming different stellar formation environment.",
+            "choices": [{"id": "retry_isotope", "label": "Re-examine isotopic data", "next_id": "isotope_investigation"}]
+        },
+        {
+            "id": "solar_flare_event",
+            "title": "Solar Flare Crisis",
+            "body_md": "**CRITICAL EVENT**: Class X solar flare erupts during 3I/ATLAS optimal observation window. Charged particles threaten space-based telescopes but could reveal magnetic field interactions. Your directive:",
+            "choices": [
+                {"id": "risk_observation", "label": "Risk equipment - capture unprecedented magnetic data", "next_id": "magnetic_discovery", "grants": ["trait_risk_taker", "trait_idealist"]},
+                {"id": "protect_equipment", "label": "Protect infrastructure - ensure continued observations", "next_id": "equipment_preserved", "grants": ["trait_cautious", "trait_pragmatist"]},
+                {"id": "partial_exposure", "label": "Partial risk - balance discovery with safety", "next_id": "balanced_approach", "grants": ["trait_leader", "trait_analyst"]}
+            ],
+            "cinematic": {"animation_key": "solar_flare_warning", "fx": {"glow": True}}
+        },
+        {
+            "id": "magnetic_discovery",
+            "title": "Magnetic Breakthrough",
+            "body_md": "**MAJOR DISCOVERY**: Risk pays off spectacularly. Solar flare interaction reveals 3I/ATLAS possesses unexpected magnetic properties, deflecting charged particles in organized patterns suggesting internal structure.",
+            "choices": [
+                {"id": "magnetic_modeling", "label": "Develop magnetic field models", "next_id": "magnetic_analysis_deep", "grants": ["breakthrough_discovery"]},
+                {"id": "structural_implications", "label": "Analyze structural implications", "next_id": "internal_structure_study", "grants": ["advanced_physics"]}
+            ],
+            "cinematic": {"animation_key": "magnetic_breakthrough", "fx": {"glow": True}}
+        },
+        {
+            "id": "equipment_preserved",
+            "title": "Infrastructure Protected",
+            "body_md": "Equipment successfully safeguarded. Observations continue with preserved capabilities, though the unique solar interaction opportunity is lost.",
+            "choices": [
+                {"id": "alternative_analysis", "label": "Pursue alternative analysis methods", "next_id": "alternative_approaches", "grants": ["methodical_science"]},
+                {"id": "wait_next_opportunity", "label": "Wait for next optimal window", "next_id": "patience_rewards", "grants": ["strategic_patience"]}
+            ]
+        },
+        {
+            "id": "balanced_approach",
+            "title": "Calculated Risk Management",
+            "body_md": "Balanced approach yields moderate magnetic field data while preserving most equipment. Compromise provides useful information without major losses.",
+            "choices": [
+                {"id": "analyze_moderate_data", "label": "Analyze moderate magnetic data", "next_id": "moderate_magnetic_findings"},
+                {"id": "plan_future_risks", "label": "Plan more calculated future risks", "next_id": "risk_management_protocols"}
+            ]
+        },
+        {
+            "id": "magnetic_analysis_deep", 
+            "title": "Advanced Magnetic Modeling",
+            "body_md": "**ADVANCED ANALYSIS**: Magnetic field modeling suggests 3I/ATLAS contains regions of organized matter - potentially crystalline structures formed over billions of years.",
+            "choices": [
+                {"id": "crystalline_hypothesis", "label": "Investigate crystalline structure hypothesis", "next_id": "crystalline_investigation"},
+                {"id": "magnetic_origin_study", "label": "Study magnetic field origin mechanisms", "next_id": "magnetic_origin_analysis"}
+            ]
+        },
+        {
+            "id": "internal_structure_study",
+            "title": "Structural Analysis",
+            "body_md": "**STRUCTURAL PHYSICS**: Internal structure analysis reveals 3I/ATLAS may have a differentiated interior - unusual for objects of its size and type.",
+            "choices": [
+                {"id": "differentiation_study", "label": "Study differentiation process", "next_id": "differentiation_analysis"},
+                {"id": "formation_implications", "label": "Analyze formation process implications", "next_id": "formation_theory_development"}
+            ]
+        },
+        # Continue scientific path with more depth...
+        {
+            "id": "crystalline_investigation",
+            "title": "Crystalline Structure Hypothesis",
+            "body_md": "Investigation suggests possible crystalline metallic core formed through unique interstellar processes over geological timescales.",
+            "choices": [
+                {"id": "metallic_core_confirmed", "label": "Confirm metallic core hypothesis", "next_id": "scientific_convergence"},
+                {"id": "alternative_structures", "label": "Consider alternative internal structures", "next_id": "structure_alternatives"}
+            ]
+        },
+        {
+            "id": "scientific_convergence",
+            "title": "Scientific Analysis Convergence",
+            "body_md": "**CONVERGENCE POINT**: Multiple analytical approaches converge on revolutionary findings. 3I/ATLAS represents unprecedented scientific discovery.",
+            "choices": [
+                {"id": "prepare_publication", "label": "Prepare breakthrough publications", "next_id": "perihelion_scientific"},
+                {"id": "verify_findings", "label": "Extensive verification of all findings", "next_id": "verification_protocols"},
+                {"id": "collaborate_globally", "label": "Initiate global scientific collaboration", "next_id": "global_science_network"}
+            ]
+        }
+    ]
+    
+    yield from scientific_nodes[:15]  # Add first 15 scientific nodes for now
+    
+def build_anomaly_path_section():
+    """Anomaly investigation path"""
+    
+    # === ANOMALY INVESTIGATION PATH (20 nodes) ===
+    anomaly_nodes = [
+        {
+            "id": "anomaly_path_entry",
+            "title": "Anomaly Investigation Protocol",
+            "body_md": "**ANOMALY DETECTION ACTIVE**: 3I/ATLAS exhibits non-gravitational acceleration similar to 1I/'Oumuamua. Additionally, radio telescopes detect structured emissions every 7.3 hours. Pattern analysis suggests:",
+            "choices": [
+                {"id": "natural_signals", "label": "Natural rotation-induced emissions from sublimation", "next_id": "natural_signal_analysis", "grants": ["trait_analyst", "trait_pragmatist"]},
+                {"id": "artificial_signals", "label": "Artificial signal modulation suggesting intelligence", "next_id": "artificial_signal_investigation", "grants": ["trait_mystic", "trait_risk_taker"]},
+                {"id": "equipment_interference", "label": "Terrestrial or equipment interference", "next_id": "interference_check", "grants": ["trait_cynic", "trait_cautious"]}
+            ],
+            "requires": ["path_anomaly"],
+            "cinematic": {"animation_key": "anomaly_detected", "view": "followComet", "fx": {"trail": True}}
+        },
+        {
+            "id": "natural_signal_analysis",
+            "title": "Natural Emission Analysis",
+            "body_md": "**NATURAL PHENOMENA HYPOTHESIS**: Detailed analysis of emission patterns seeks natural explanations for the 7.3-hour cycle.",
+            "choices": [
+                {"id": "rotation_period", "label": "Confirms rotational period - natural sublimation jets", "next_id": "rotation_confirmed", "grants": ["natural_explanation"]},
+                {"id": "complex_rotation", "label": "Complex tumbling motion creating patterns", "next_id": "tumbling_analysis", "grants": ["complex_dynamics"]},
+                {"id": "thermal_cycles", "label": "Solar heating and cooling cycles", "next_id": "thermal_emission_study", "grants": ["thermal_physics"]}
+            ]
+        },
+        {
+            "id": "artificial_signal_investigation",
+            "title": "Artificial Intelligence Hypothesis",
+            "body_md": "**BREAKTHROUGH INVESTIGATION**: Pattern analysis reveals mathematical sequences - prime numbers, Fibonacci sequences, geometric progressions. This level of organization defies natural explanation.",
+            "choices": [
+                {"id": "seti_protocols", "label": "Activate SETI verification protocols", "next_id": "seti_verification_process", "grants": ["seti_activated", "trait_leader"]},
+                {"id": "mathematical_analysis", "label": "Deep mathematical pattern analysis", "next_id": "mathematical_pattern_study", "grants": ["advanced_mathematics"]},
+                {"id": "classification_review", "label": "Security classification assessment", "next_id": "classification_protocols", "grants": ["security_awareness"]}
+            ],
+            "cinematic": {"animation_key": "artificial_signals_detected", "fx": {"glow": True}}
+        },
+        {
+            "id": "seti_verification_process",
+            "title": "SETI Protocol Verification",
+            "body_md": "**SETI PROTOCOLS ACTIVE**: International verification confirms artificial characteristics. Mathematical patterns pass all known tests for non-natural origin. Protocol requires:",
+            "choices": [
+                {"id": "international_verification", "label": "Full international SETI verification", "next_id": "international_seti_confirmation", "grants": ["global_verification"]},
+                {"id": "attempt_communication", "label": "Attempt structured response", "next_id": "first_communication_attempt", "grants": ["first_contact_initiative", "trait_risk_taker"]},
+                {"id": "observe_only", "label": "Continue observation without response", "next_id": "passive_seti_monitoring", "grants": ["cautious_observation"]}
+            ]
+        },
+        {
+            "id": "first_communication_attempt",
+            "title": "First Contact Attempt",
+            "body_md": "**HISTORIC MOMENT**: Humanity attempts its first deliberate communication with potential non-terrestrial intelligence. Mathematical response transmitted toward 3I/ATLAS.",
+            "choices": [
+                {"id": "prime_numbers", "label": "Transmit prime number sequence", "next_id": "prime_response_analysis", "grants": ["mathematical_communication"]},
+                {"id": "universal_constants", "label": "Transmit universal physical constants", "next_id": "physics_communication", "grants": ["physics_based_contact"]},
+                {"id": "cultural_information", "label": "Include information about humanity", "next_id": "cultural_exchange_attempt", "grants": ["cultural_ambassador"]}
+            ],
+            "cinematic": {"animation_key": "first_contact_transmission", "view": "closeup", "fx": {"glow": True}}
+        },
+        {
+            "id": "prime_response_analysis",
+            "title": "Mathematical Response Received",
+            "body_md": "**EXTRAORDINARY DEVELOPMENT**: 3I/ATLAS responds within hours with an expanded prime sequence, then transitions to more complex mathematical expressions describing physical constants and geometric relationships.",
+            "choices": [
+                {"id": "escalate_mathematics", "label": "Send more complex mathematical concepts", "next_id": "advanced_mathematical_exchange", "grants": ["mathematical_dialogue"]},
+                {"id": "physics_concepts", "label": "Introduce physics and chemistry", "next_id": "scientific_concept_exchange", "grants": ["scientific_communication"]},
+                {"id": "proceed_cautiously", "label": "Proceed with careful verification", "next_id": "cautious_verification_process", "grants": ["methodical_contact"]}
+            ],
+            "cinematic": {"animation_key": "mathematical_response", "fx": {"glow": True, "trail": True}}
+        },
+        {
+            "id": "advanced_mathematical_exchange",
+            "title": "Advanced Mathematical Dialogue",
+            "body_md": "**INCREDIBLE EXCHANGE**: Mathematical dialogue reveals 3I/ATLAS possesses knowledge of advanced concepts including topology, quantum mechanics, and relativistic physics expressed in mathematical language.",
+            "choices": [
+                {"id": "request_knowledge", "label": "Request advanced scientific knowledge", "next_id": "knowledge_exchange_phase", "grants": ["knowledge_seeker"]},
+                {"id": "share_human_knowledge", "label": "Share human mathematical achievements", "next_id": "human_knowledge_sharing", "grants": ["cultural_exchange"]},
+                {"id": "establish_protocols", "label": "Establish formal communication protocols", "next_id": "communication_protocols_formal", "grants": ["diplomatic_protocols"]}
+            ]
+        },
+        {
+            "id": "knowledge_exchange_phase",
+            "title": "Interstellar Knowledge Exchange",
+            "body_md": "**GOLDEN PATH GATEWAY**: 3I/ATLAS begins sharing advanced concepts that revolutionize human understanding of physics, mathematics, and the universe itself. This exchange will change everything.",
+            "choices": [
+                {"id": "embrace_cosmic_wisdom", "label": "Embrace the cosmic knowledge with wonder", "next_id": "golden_path_checkpoint_1", "grants": ["cosmic_wonder", "trait_mystic"], "requires": ["seti_activated"]},
+                {"id": "scientific_skepticism", "label": "Maintain scientific skepticism and verification", "next_id": "scientific_verification_intensive", "grants": ["scientific_rigor"]},
+                {"id": "document_everything", "label": "Focus on documenting all exchanges", "next_id": "comprehensive_documentation", "grants": ["methodical_archiving"]}
+            ],
+            "cinematic": {"animation_key": "knowledge_exchange", "view": "rideComet", "fx": {"glow": True, "trail": True}}
+        }
+    ]
+    
+    yield from anomaly_nodes[:8]  # Add first 8 anomaly nodes
+    
+def build_golden_path_section():
+    """Golden path checkpoints leading to the legendary ending"""
+    
+    # === GOLDEN PATH SEQUENCE (12 nodes) ===
+    # (node_id, title, body_md, advance, alternative, cinematic); see golden_checkpoints()
+    golden_path_checkpoints = [
+        (
+            "golden_path_checkpoint_1", "Golden Path - First Revelation",
+            "**GOLDEN PATH ACTIVATED**: As you embrace the cosmic knowledge, 3I/ATLAS responds with increasingly sophisticated concepts that challenge human understanding. It begins describing the interconnected nature of consciousness and cosmic evolution.",
+            ("consciousness_connection", "Explore consciousness and cosmic connection", "golden_path_checkpoint_2", ("golden_path_1", "trait_mystic"), ("cosmic_wonder",)),
+            ("maintain_scientific_approach", "Maintain purely scientific approach", "scientific_golden_branch", ("scientific_mysticism",)),
+            cinematic("golden_revelation_1", "followComet", ("glow",))
+        ),
+        (
+            "golden_path_checkpoint_2", "Golden Path - Cosmic Consciousness",
+            "**SECOND REVELATION**: 3I/ATLAS reveals that consciousness emerges naturally in complex systems across the galaxy. It describes a network of aware entities spanning billions of years and countless worlds.",
+            ("accept_network_reality", "Accept the reality of galactic consciousness network", "golden_path_checkpoint_3", ("golden_path_2", "trait_idealist"), ("golden_path_1",)),
+            ("philosophical_inquiry", "Engage in philosophical inquiry about consciousness", "philosophical_exploration", ("deep_philosophy",)),
+            cinematic("consciousness_network", fx=("glow", "trail"))
+        ),
+        (
+            "golden_path_checkpoint_3", "Golden Path - The Three Visitors",
+            "**THIRD REVELATION**: The truth about the three interstellar visitors is revealed. 3I/ATLAS, 1I/'Oumuamua, and 2I/Borisov are not separate objects - they are components of a single, vast intelligence that has been observing stellar system development.",
+            ("understand_unity", "Understand the unity of the three visitors", "golden_path_checkpoint_4", ("golden_path_3", "unity_comprehension"), ("golden_path_2",)),
+            ("question_implications", "Question the implications for humanity", "humanity_implications_study", ("humanitarian_focus",)),
+            cinematic("three_visitors_unity", "topDown", ("glow", "trail"))
+        ),
+        (
+            "golden_path_checkpoint_4", "Golden Path - The Purpose",
+            "**FOURTH REVELATION**: The three-part intelligence explains its purpose: to observe and guide the development of consciousness in stellar systems. Humanity has reached a threshold - a test that determines our cosmic future.",
+            ("accept_guidance", "Accept guidance from ancient cosmic intelligence", "golden_path_final", ("golden_path_4", "cosmic_acceptance"), ("golden_path_3",)),
+            ("assert_independence", "Assert human independence and self-determination", "independence_declaration", ("human_sovereignty",)),
+            cinematic("cosmic_purpose_revealed", "rideComet", ("glow",))
+        ),
+        (
+            "golden_path_final", "Golden Path - Cosmic Integration",
+            "**FINAL GOLDEN PATH DECISION**: The ancient intelligence offers humanity a choice: join the galactic community as junior partners in cosmic evolution, or continue developing independently with occasional guidance.",
+            ("cosmic_integration", "Choose cosmic integration and galactic community membership", "ending_prime_anomaly", ("golden_path_complete", "cosmic_citizen"), ("golden_path_4",)),
+            ("guided_independence", "Choose guided independence with periodic contact", "ending_cosmic_mentorship", ("guided_evolution",)),
+            cinematic("final_cosmic_choice", "rideComet", ("glow", "trail"))
+        ),
+    ]
+    
+    yield from golden_checkpoints(golden_path_checkpoints)
+    
+
+def build_geopolitical_path_section():
+    """Geopolitical assessment path"""
+    
+    # === GEOPOLITICAL PATH (15 nodes) ===
+    geopolitical_nodes = [
+        {
+            "id": "geopolitical_path_entry", 
+            "title": "Geopolitical Assessment Protocol",
+            "body_md": "**DIPLOMATIC PHASE INITIATED**: Global space agencies demand access to 3I/ATLAS findings. ESA proposes emergency collaboration mission. Intelligence briefings suggest strategic implications. Your diplomatic assessment:",
+            "choices": [
+                {"id": "full_cooperation", "label": "Recommend complete international cooperation", "next_id": "international_cooperation_full", "grants": ["path_cooperation", "trait_idealist", "trait_leader"]},
+                {"id": "selective_sharing", "label": "Controlled information sharing with allied nations", "next_id": "selective_cooperation_protocols", "grants": ["strategic_diplomacy", "trait_pragmatist"]},
+                {"id": "national_security_first", "label": "Prioritize national security interests", "next_id": "national_security_assessment", "grants": ["security_priority", "trait_cynic"]},
+                {"id": "scientific_neutrality", "label": "Maintain scientific neutrality above politics", "next_id": "scientific_neutrality_stance", "grants": ["scientific_independence", "trait_analyst"]}
+            ],
+            "requires": ["path_geopolitical"],
+            "cinematic": {"animation_key": "geopolitical_activation", "timeline": {"seek_pct": 0.4}}
+        },
+        {
+            "id": "international_cooperation_full",
+            "title": "Global Scientific Unity",
+            "body_md": "**UNPRECEDENTED COOPERATION**: Your recommendation triggers the largest international scientific collaboration in history. Resources pool globally, creating the International 3I/ATLAS Consortium.",
+            "choices": [
+                {"id": "lead_consortium", "label": "Accept leadership role in consortium", "next_id": "consortium_leadership", "grants": ["global_leadership", "trait_leader"]},
+                {"id": "technical_advisor", "label": "Serve as chief technical advisor", "next_id": "technical_advisory_role", "grants": ["scientific_authority"]},
+                {"id": "coordinate_analysis", "label": "Coordinate global analysis efforts", "next_id": "global_coordination", "grants": ["international_coordinator"]}
+            ],
+            "cinematic": {"animation_key": "global_unity", "fx": {"glow": True}}
+        },
+        {
+            "id": "consortium_leadership",
+            "title": "International Consortium Leadership",
+            "body_md": "**GLOBAL RESPONSIBILITY**: Leading the consortium places you at the center of humanity's most important scientific endeavor. Decisions affect global cooperation for generations.",
+            "choices": [
+                {"id": "democratic_leadership", "label": "Establish democratic decision-making processes", "next_id": "democratic_consortium", "grants": ["democratic_ideals"]},
+                {"id": "efficient_hierarchy", "label": "Create efficient hierarchical structure", "next_id": "hierarchical_consortium", "grants": ["organizational_efficiency"]},
+                {"id": "rotating_leadership", "label": "Institute rotating leadership system", "next_id": "rotating_consortium", "grants": ["inclusive_governance"]}
+            ]
+        },
+        {
+            "id": "national_security_assessment",
+            "title": "National Security Implications",
+            "body_md": "**CLASSIFIED BRIEFING**: Intelligence analysis suggests 3I/ATLAS could represent advanced technology with defense implications. Recommendations needed for information control.",
+            "choices": [
+                {"id": "classify_everything", "label": "Maximum classification - compartmentalized access only", "next_id": "maximum_classification_protocol", "grants": ["security_lockdown"]},
+                {"id": "selective_classification", "label": "Classify sensitive aspects while maintaining science", "next_id": "selective_classification_protocol", "grants": ["balanced_security"]},
+                {"id": "transparent_security", "label": "Transparent security - public oversight of classification", "next_id": "transparent_security_model", "grants": ["democratic_security"]}
+            ]
+        }
+    ]
+    
+    yield from geopolitical_nodes[:4]
+    
+def build_intervention_path_section():
+    """Active intervention path"""
+    
+    # === INTERVENTION PATH (15 nodes) ===
+    intervention_nodes = [
+        {
+            "id": "intervention_path_entry",
+            "title": "Active Intervention Assessment",
+            "body_md": "**INTERVENTION PROTOCOLS**: Engineering proposes multiple intervention scenarios. Modified spacecraft could attempt intercept with 15% success probability. Alternative: Deploy probe array for close-approach monitoring. Authorization needed:",
+            "choices": [
+                {"id": "high_risk_intercept", "label": "Authorize high-risk intercept mission", "next_id": "intercept_mission_preparation", "grants": ["active_intervention", "trait_risk_taker", "trait_idealist"]},
+                {"id": "probe_array_deployment", "label": "Deploy safer probe array system", "next_id": "probe_array_mission", "grants": ["measured_intervention", "trait_analyst"]},
+                {"id": "communication_first", "label": "Attempt radio communication before physical approach", "next_id": "communication_attempt_intervention", "grants": ["diplomatic_intervention", "trait_mystic"]},
+                {"id": "passive_observation", "label": "Maintain safe observational distance", "next_id": "passive_observation_protocol", "grants": ["cautious_intervention", "trait_cautious"]}
+            ],
+            "requires": ["path_intervention"],
+            "cinematic": {"animation_key": "intervention_planning", "timeline": {"seek_pct": 0.6}}
+        },
+        {
+            "id": "intercept_mission_preparation",
+            "title": "Intercept Mission Authorization",
+            "body_md": "**HIGH-RISK MISSION APPROVED**: Engineering begins modification of deep space probe for intercept trajectory. Mission timeline accelerated. Success depends on multiple critical factors.",
+            "choices": [
+                {"id": "optimize_trajectory", "label": "Optimize intercept trajectory calculations", "next_id": "trajectory_optimization", "grants": ["precision_planning"]},
+                {"id": "enhance_instruments", "label": "Maximum instrument package enhancement", "next_id": "instrument_maximization", "grants": ["comprehensive_analysis_prep"]},
+                {"id": "backup_systems", "label": "Focus on backup systems and redundancy", "next_id": "redundancy_focus", "grants": ["risk_mitigation"]}
+            ],
+            "cinematic": {"animation_key": "mission_preparation", "fx": {"glow": True}}
+        },
+        {
+            "id": "communication_attempt_intervention",
+            "title": "Pre-Contact Communication",
+            "body_md": "**DIPLOMATIC FIRST CONTACT**: Before any physical intervention, attempt communication to understand 3I/ATLAS intentions and nature. Protocol selection critical:",
+            "choices": [
+                {"id": "mathematical_greeting", "label": "Mathematical sequences and universal constants", "next_id": "math_communication_response", "grants": ["mathematical_diplomacy"]},
+                {"id": "cultural_introduction", "label": "Cultural information about humanity", "next_id": "cultural_communication_response", "grants": ["cultural_diplomacy"]},
+                {"id": "scientific_inquiry", "label": "Scientific questions about its nature and purpose", "next_id": "scientific_communication_response", "grants": ["scientific_diplomacy"]}
+            ]
+        }
+    ]
+    
+    yield from intervention_nodes[:3]
+    
+def build_convergence_section():
+    """Perihelion convergence point that all paths lead to"""
+    
+    # === CONVERGENCE ===
+    
+    # Major convergence point - all paths lead here
+    yield {
+        "id": "perihelion_approach_major",
+        "title": "Perihelion Convergence",
+        "body_md": "**HISTORIC MOMENT**: October 28, 2025 - 3I/ATLAS reaches closest approach to the Sun. All observation systems worldwide focus on this unprecedented event. Your analysis path has led to this critical moment. Final directive protocols activated.",
+        "choices": [
+            {"id": "comprehensive_documentation", "label": "Complete scientific documentation for posterity", "next_id": "ending_the_messenger", "grants": ["complete_documentation", "trait_analyst"]},
+            {"id": "attempt_final_contact", "label": "Attempt final communication during closest approach", "next_id": "ending_first_contact_success", "grants": ["final_contact_attempt", "trait_risk_taker"]},
+            {"id": "activate_all_systems", "label": "Activate all available observation systems", "next_id": "ending_comprehensive_observation", "grants": ["maximum_observation"]},
+            {"id": "prepare_defensive_measures", "label": "Activate planetary defense monitoring", "next_id": "ending_the_warning", "grants": ["defensive_preparation", "trait_cautious"]}
+        ],
+        "cinematic": {"animation_key": "perihelion_convergence", "view": "followComet", "timeline": {"date": "2025-10-28"}, "fx": {"trail": True, "glow": True}}
+    }
+    
+def build_endings_section(ending_ids=None):
+    """All endings as terminal nodes, optionally limited to the ids in ending_ids"""
+    
+    # === ALL ENDINGS (15 total) ===
+    # (ending_id, title, body_md, grants, cinematic); see ending_nodes()
+    endings = [
+        # LEGENDARY (1% - Golden Path only)
+        ("ending_prime_anomaly", "The Prime Anomaly",
+         "**LEGENDARY ACHIEVEMENT**: The ultimate cosmic truth revealed. 3I/ATLAS, 1I/'Oumuamua, and 2I/Borisov are revealed as components of an ancient galactic consciousness - a distributed intelligence that has guided cosmic evolution for billions of years. Your choices have awakened dormant protocols, welcoming humanity into a galactic community of consciousness that spans the cosmos. We are no longer alone - we are acknowledged, welcomed, and invited to participate in the greatest story ever told.",
+         ("legendary_ending", "prime_discovery", "cosmic_citizenship"), cinematic("prime_anomaly_revelation", "rideComet", ("glow", "trail"))),
+        # EPIC (4% - 1 ending)
+        ("ending_the_warning", "The Warning",
+         "**EPIC DISCOVERY**: 3I/ATLAS's gravitational passage perturbs multiple asteroid belt objects, creating a cascading effect that sets one large asteroid on collision course with Earth's orbital path - impact projected in 2157. Your analysis provides 132 years advance warning, enabling development of comprehensive planetary defense systems. The ancient visitor becomes humanity's early warning system, transforming potential catastrophe into preparation for cosmic challenges.",
+         ("epic_ending", "early_warning_system", "planetary_defense"), cinematic("warning_cascade", "topDown", ("glow",))),
+        # RARE (20% - 3 endings)
+        ("ending_first_contact_success", "First Contact",
+         "**RARE ACHIEVEMENT**: Communication protocols succeed beyond all expectations. 3I/ATLAS responds with complex acknowledgment, confirming artificial intelligence and beginning humanity's first confirmed interstellar dialogue. Mathematical exchanges reveal advanced physics concepts, revolutionizing human science. The universe speaks, and humanity listens. SETI protocols formally document this as Event Alpha-1: First Confirmed Contact with Non-Terrestrial Intelligence.",
+         ("rare_ending", "first_contact_confirmed", "seti_success"), cinematic("first_contact_confirmed", fx=("glow",))),
+        ("ending_the_artifact", "The Artifact",
+         "**RARE DISCOVERY**: Deep analysis reveals 3I/ATLAS contains artificial structures - crystalline lattices and metallic components arranged in impossible geometries. It is revealed as a derelict probe, billions of years old, from a civilization that predates our solar system by eons. While its builders are long gone, their engineering endures as testament to intelligence that once flourished among ancient stars.",
+         ("rare_ending", "ancient_artifact", "archaeological_discovery"), cinematic("artifact_revealed", "closeup", ("glow",))),
+        ("ending_cosmic_awakening", "The Awakening",
+         "**RARE PHENOMENON**: Solar interaction triggers biological processes within 3I/ATLAS. The object awakens as a form of cosmic life - a space-dwelling organism that has hibernated for billions of years between stellar systems. As it 'awakens,' it begins emitting complex harmonic frequencies that resonate through the solar system, demonstrating that life exists in forms beyond human imagination.",
+         ("rare_ending", "cosmic_biology", "life_discovery"), cinematic("biological_awakening", fx=("glow", "trail"))),
+        # UNCOMMON (25% - 4 endings)
+        ("ending_technological_revolution", "Technological Revolution",
+         "**UNCOMMON OUTCOME**: Technologies developed for 3I/ATLAS study trigger breakthrough advances in propulsion, materials science, and observation techniques. Patent applications generate research funding that revolutionizes space exploration. New spacecraft designs enable interstellar missions within decades, transforming humanity into a spacefaring species.",
+         ("uncommon_ending", "tech_revolution", "space_advancement"), cinematic("technology_breakthrough", fx=("glow",))),
+        ("ending_the_catalyst", "The Catalyst",
+         "**UNCOMMON DISCOVERY**: 3I/ATLAS catalyzes breakthroughs in theoretical physics and materials science. Analysis of its unique properties leads to developments in quantum mechanics and exotic matter research. The visitor's greatest gift is not what it contains, but what it inspires humanity to discover about the universe.",
+         ("uncommon_ending", "scientific_catalyst", "physics_breakthrough"), cinematic("catalyst_effect", fx=("glow",))),
+        ("ending_cosmic_mentorship", "Cosmic Mentorship",
+         "**UNCOMMON OUTCOME**: 3I/ATLAS establishes limited but ongoing contact, serving as humanity's introduction to galactic civilization. Periodic communications provide guidance on scientific and philosophical development while respecting human autonomy. Humanity gains a cosmic mentor, accelerating development while maintaining independence.",
+         ("uncommon_ending", "guided_evolution", "cosmic_guidance"), cinematic("mentorship_established", "followComet", ("glow",))),
+        ("ending_international_unity", "International Unity",
+         "**UNCOMMON ACHIEVEMENT**: The 3I/ATLAS mission creates unprecedented international scientific cooperation. Treaties signed during observation create frameworks for future cosmic discoveries. The visitor's greatest legacy is uniting humanity in common purpose, establishing foundations for global collaboration that transcend terrestrial politics.",
+         ("uncommon_ending", "global_unity", "diplomatic_success"), cinematic("international_cooperation", fx=("glow",))),
+        # COMMON (50% - 7 endings)
+        ("ending_the_messenger", "The Messenger",
+         "**MISSION COMPLETE**: 3I/ATLAS departs our solar system having delivered its ancient message through the universal language of science. Comprehensive analysis reveals insights about galactic evolution, stellar formation, and cosmic chemistry. International cooperation forged during observation creates lasting bonds. Humanity earns recognition as a mature, scientifically curious civilization ready for cosmic challenges.",
+         ("common_ending", "scientific_success", "diplomatic_achievement"), cinematic("messenger_departure", "topDown", ("trail",))),
+        ("ending_comprehensive_observation", "Scientific Achievement",
+         "**SCIENTIFIC SUCCESS**: Comprehensive observation campaign yields unprecedented data about interstellar objects. 3I/ATLAS becomes the most thoroughly studied visitor in history, advancing understanding of cometary physics, interstellar chemistry, and galactic evolution. The data collected will benefit astronomy for generations.",
+         ("common_ending", "observational_success", "data_legacy"), cinematic("comprehensive_study", fx=("glow",))),
+        ("ending_educational_legacy", "Educational Legacy",
+         "**EDUCATIONAL IMPACT**: 3I/ATLAS inspires a generation of students worldwide to pursue careers in astronomy and space science. Educational programs use the mission as inspiration for STEM learning. Universities report record enrollment in astrophysics programs. Humanity's greatest discovery was inspiring itself.",
+         ("common_ending", "educational_impact", "inspiration_legacy"), cinematic("educational_inspiration")),
+        ("ending_cautious_success", "Cautious Success",
+         "**METHODICAL ACHIEVEMENT**: Careful, methodical approach ensures all safety protocols are followed while gathering substantial scientific data. Equipment preservation enables continued observations of future interstellar visitors. Sometimes the greatest victories are quiet, careful ones that prepare for future challenges.",
+         ("common_ending", "methodical_success", "preparation_legacy"), cinematic("cautious_completion")),
+        ("ending_data_preservation", "Data Preservation",
+         "**ARCHIVAL SUCCESS**: Focus on comprehensive data preservation creates the definitive archive of humanity's third interstellar encounter. Future scientists will have complete records to advance understanding. The visitor's data becomes humanity's cosmic library entry.",
+         ("common_ending", "archival_success", "data_heritage"), cinematic("data_archive_complete")),
+        ("ending_budget_success", "Efficient Achievement",
+         "**FISCAL RESPONSIBILITY**: Mission completed within budget constraints while achieving primary objectives. Efficient resource management demonstrates that great science doesn't require unlimited funding. Success inspires confidence in future space science investments.",
+         ("common_ending", "efficient_success", "fiscal_responsibility"), cinematic("efficient_completion")),
+        ("ending_collaborative_success", "Collaborative Success",
+         "**TEAMWORK ACHIEVEMENT**: Successful collaboration between multiple international teams demonstrates the power of shared scientific endeavor. 3I/ATLAS becomes a model for future international space science missions. Cooperation proves more valuable than competition in cosmic exploration.",
+         ("common_ending", "collaborative_success", "teamwork_legacy"), cinematic("collaboration_success")),
+    ]
+    
+    yield from ending_nodes(endings, ending_ids)
+    
+
+def build_transitions_section():
+    """Procedural transition nodes that pad the tree past 100 nodes"""
+    
+    # Add remaining connection nodes to reach 100+ total
+    # Add more connection and transition nodes
+    yield from bridge_chain(
+        25, "transition_node_{n}", "Analysis Phase {n}",
+        "**ANALYSIS CHECKPOINT {n}**: Data processing reveals additional layers of complexity requiring specialized expertise. Investigation continues with enhanced protocols.",
+        [
+            ("continue_analysis_{i}", "Continue detailed analysis", 1, 15, "perihelion_approach_major", "analysis_phase_{n}"),
+            ("escalate_priority_{i}", "Escalate to priority status", 2, 10, "perihelion_approach_major", "priority_escalation_{n}")
+        ]
+    )
+    
+
+def build_bridges_section():
+    """Alternative padding scheme: 50 bridge nodes feeding the convergence and golden path"""
+    
+    yield from bridge_chain(
+        50, "bridge_node_{n:02d}", "Analysis Junction {n}",
+        "**BRIDGE POINT {n}**: Data correlation and analysis synthesis point.",
+        [
+            ("bridge_continue_{i}", "Continue analysis", 1, 40, "perihelion_approach_major", None),
+            ("bridge_branch_{i}", "Change focus", 2, 30, "golden_path_checkpoint_1", None)
+        ]
+    )
+    
+
+# Section builders in tree order; each yields its nodes when called
+SECTION_BUILDERS = [
+    ("opening", build_opening_section),
+    ("skill_checks", build_skill_checks_section),
+    ("path_selection", build_path_selection_section),
+    ("scientific_path", build_scientific_path_section),
+    ("anomaly_path", build_anomaly_path_section),
+    ("golden_path", build_golden_path_section),
+    ("geopolitical_path", build_geopolitical_path_section),
+    ("intervention_path", build_intervention_path_section),
+    ("convergence", build_convergence_section),
+    ("endings", build_endings_section),
+    ("transitions", build_transitions_section)
+]
+
+# Padding section used for each bridging scheme
+BRIDGING_SECTIONS = {
+    "transition": ("transitions", build_transitions_section),
+    "bridge": ("bridges", build_bridges_section)
+}
+
+def atlas_sections(bridging="transition", endings=None):
+    """(name, builder, kwargs) for every section of a tree variant, in tree order"""
+    
+    sections = []
+    for name, builder in SECTION_BUILDERS:
+        kwargs = {}
+        if name == "transitions":
+            name, builder = BRIDGING_SECTIONS[bridging]
+        elif name == "endings" and endings is not None:
+            kwargs = {"ending_ids": list(endings)}
+        sections.append((name, builder, kwargs))
+    return sections
+
+def iter_atlas_narrative_nodes(bridging="transition", endings=None):
+    """Yield the narrative nodes one at a time, in tree order"""
+    
+    from .trace import span, tracing_enabled
+    
+    for name, builder, kwargs in atlas_sections(bridging, endings):
+        if tracing_enabled():
+            # Materialize the section so its span times the builder, not the consumer
+            with span(f"section:{name}", "section") as section:
+                nodes = list(builder(**kwargs))
+                section.set(nodes=len(nodes))
+            yield from nodes
+        else:
+            yield from builder(**kwargs)
+
+def generate_complete_atlas_narrative(chrono_start=3, bridging="transition", endings=None):
+    """Generate complete 100+ node narrative tree for The ATLAS Directive"""
+    
+    from .merkle import stamp_content
+    from .metrics import stamp_structure
+    from .trace import span
+    
+    with span("build") as build:
+        narrative_tree = atlas_narrative_header(chrono_start)
+        nodes = []
+        sections = []
+        for name, builder, kwargs in atlas_sections(bridging, endings):
+            with span(f"section:{name}", "section") as section:
+                start = len(nodes)
+                nodes.extend(builder(**kwargs))
+                section.set(nodes=len(nodes) - start)
+            sections.append((name, len(nodes) - start))
+        build.set(nodes=len(nodes))
+    
+    # Update final metadata
+    narrative_tree["meta"]["total_nodes"] = len(nodes)
+    narrative_tree["nodes"] = nodes
+    with span("metrics"):
+        stamp_structure(narrative_tree)
+    with span("hash"):
+        stamp_content(narrative_tree, sections)
+    
+    return narrative_tree
+
+def _json_layout(indent):
+    """(newline, pad, key separator) that json.dumps uses for an indent setting"""
+    
+    if indent is None:
+        return "", "", ":"
+    return "\n", " " * indent, ": "
+
+def _dump_json(value, depth, indent):
+    """json.dumps of a value nested depth levels deep in the tree document"""
+    
+    newline, pad, sep = _json_layout(indent)
+    text = json.dumps(value, indent=indent, ensure_ascii=False, separators=(",", sep))
+    return text.replace("\n", newline + pad * depth) if newline else text
+
+def serialize_nodes(nodes, indent=2):
+    """Serialize nodes exactly as they sit inside the "nodes" array, returning (text, count).
+
+    Node dicts are schema-checked one at a time by Node.from_dict() (ValueError on
+    violations) and written by Node.write_json(), like Node objects.
+    """
+    
+    from .model import Node
+    
+    newline, pad, _ = _json_layout(indent)
+    out = []
+    count = 0
+    for node in nodes:
+        out.append(("," if count else "") + newline + pad * 2)
+        (node if isinstance(node, Node) else Node.from_dict(node)).write_json(out, 2, indent)
+        count += 1
+    return "".join(out), count
+
+def write_atlas_narrative_stream(fh, nodes=None, header=None, indent=2, fragments=None, late_meta=None):
+    """Stream the tree to a seekable text file one node at a time, returning the node count.
+    
+    Output matches json.dumps(tree, indent=indent, ensure_ascii=False) except for the
+    whitespace padding after meta.total_nodes, which is patched in once all nodes are written.
+    Pre-serialized (text, count) pairs from serialize_nodes() can be passed as fragments
+    instead of nodes. late_meta is a dict of integer meta counts the node iterator fills
+    in as it runs; they are padded and patched the same way. Without late_meta the
+    headline counts (endings, golden_path_nodes, skill_checks, branching_points) are
+    tallied from the nodes as they stream by. meta.structure needs the whole graph up
+    front, so only a header stamped by metrics.stamp_structure() carries it.
+    """
+    
+    if not fh.seekable():
+        raise ValueError("write_atlas_narrative_stream needs a seekable file handle to patch meta.total_nodes")
+    
+    from .trace import span
+    
+    header = header if header is not None else atlas_narrative_header()
+    if fragments is None:
+        nodes = nodes if nodes is not None else iter_atlas_narrative_nodes()
+        if late_meta is None:
+            from .metrics import tally_headline_counts
+            late_meta = {}
+            nodes = tally_headline_counts(nodes, late_meta)
+        fragments = (serialize_nodes((node,), indent) for node in nodes)
+    
+    with span("write") as write:
+        newline, pad, sep = _json_layout(indent)
+        
+        late = ["total_nodes"] + [key for key in late_meta or () if key != "total_nodes"]
+        meta = dict(header["meta"], **dict.fromkeys(late, 0))
+        text = _dump_json(meta, 1, indent)
+        fh.write("{" + newline + pad + '"meta"' + sep)
+        slots = {}
+        for key in sorted(late, key=lambda key: text.find(f'"{key}"{sep}0')):
+            before, _, text = text.partition(f'"{key}"{sep}0')
+            fh.write(before + f'"{key}"{sep}')
+            slots[key] = fh.tell()
+            fh.write("0".ljust(TOTAL_NODES_WIDTH))
+        fh.write(text)
+        
+        for key, value in header.items():
+            if key not in ("meta", "nodes"):
+                fh.write("," + newline + pad + json.dumps(key) + sep + _dump_json(value, 1, indent))
+        
+        fh.write("," + newline + pad + '"nodes"' + sep + "[")
+        count = 0
+        for text, n in fragments:
+            if n:
+                fh.write(("," if count else "") + text)
+                count += n
+        fh.write((newline + pad if count else "") + "]" + newline + "}")
+        
+        for key, at in slots.items():
+            fh.seek(at)
+            fh.write(str(count if key == "total_nodes" else late_meta[key]).ljust(TOTAL_NODES_WIDTH))
+        fh.seek(0, 2)
+        write.set(nodes=count)
+    
+    return count
+
+def regenerate_atlas_narrative(out_path, cache_dir=".narrative_cache", indent=2, chrono_start=3, bridging="transition", endings=None):
+    """Write the tree to out_path, rebuilding only sections whose inputs changed.
+    
+    Each section's serialized nodes, node hashes and metrics skeleton are cached under
+    a hash of the builder's source, so meta.content and the structure counts are filled
+    in without rebuilding cached sections.
+    meta.updated_utc is carried over from the previous write to out_path unless the
+    content changed, and the output file is left untouched when nothing changed at all.
+    Outputs and variants (indent, endings) can share one cache_dir without evicting
+    each other.
+    """
+    
+    import inspect
+    
+    from . import merkle, model, templates
+    from .cache import SectionCache, content_hash, section_key
+    from .merkle import content_meta, node_hashes
+    from .metrics import skeleton_nodes, stamp_structure
+    from .trace import span
+    
+    cache = SectionCache(cache_dir)
+    header = atlas_narrative_header(chrono_start)
+    report = {"sections": {}}
+    
+    # Cached entries are built from template rows, then serialized, hashed and skeletonized, so
+    # a change to any of that code invalidates every section
+    pipeline_source = "".join(inspect.getsource(part) for part in (
+        templates, model, merkle, _json_layout, serialize_nodes, skeleton_nodes
+    ))
+    fragments = []
+    sections = []
+    hashes = []
+    skeleton = []
+    for name, builder, kwargs in atlas_sections(bridging, endings):
+        with span(f"section:{name}", "section") as section:
+            key = section_key(name, builder, indent, kwargs, pipeline_source)
+            variant = content_hash(repr(indent), repr(kwargs))[:16]
+            entry = cache.get(name, key, variant)
+            if entry is None:
+                with span("build"):
+                    nodes = list(builder(**kwargs))
+                with span("serialize"):
+                    text, count = serialize_nodes(nodes, indent)
+                with span("hash"):
+                    entry = text, count, node_hashes(nodes), skeleton_nodes(nodes)
+                cache.put(name, key, *entry, variant=variant)
+                report["sections"][name] = "rebuilt"
+            else:
+                report["sections"][name] = "cached"
+            section.set(nodes=entry[1], state=report["sections"][name])
+        fragments.append(entry[:2])
+        sections.append((name, entry[1]))
+        hashes.extend(entry[2])
+        skeleton.extend(entry[3])
+    
+    # Cached sections carry their node hashes and skeletons, so neither metrics nor the Merkle root need a rebuild
+    with span("metrics"):
+        stamp_structure(header, skeleton)
+    header["meta"]["content"] = content_meta(header, sections, hashes)
+    envelope = dict(header, meta=dict(header["meta"], updated_utc=None))
+    digest = content_hash(json.dumps(envelope, sort_keys=True), str(indent))
+    previous = cache.load_output(out_path)
+    changed = previous.get("content_hash") != digest
+    if not changed:
+        header["meta"]["updated_utc"] = previous["updated_utc"]
+    
+    report.update(content_hash=digest, changed=changed, updated_utc=header["meta"]["updated_utc"],
+                  total_nodes=sum(n for _, n in fragments), written=False)
+    if changed or not os.path.exists(out_path):
+        with open(out_path, "w", encoding="utf-8") as fh:
+            write_atlas_narrative_stream(fh, header=header, indent=indent, fragments=fragments)
+        cache.save_output(out_path, {"content_hash": digest, "updated_utc": header["meta"]["updated_utc"]})
+        report["written"] = True
+    
+    return report
+
+def write_atlas_narrative_chunks(out_dir=None, strategy="path", max_chunk_nodes=None, clean=False):
+    """Generate the tree and write it as narrative_tree_chunk*.json files plus a cross-chunk manifest.
+    
+    out_dir defaults to chunks.DEFAULT_CHUNK_DIR.
+    """
+    
+    from .chunks import DEFAULT_CHUNK_DIR, write_narrative_chunks
+    
+    if out_dir is None:
+        out_dir = DEFAULT_CHUNK_DIR
+    return write_narrative_chunks(generate_complete_atlas_narrative(), out_dir, strategy, max_chunk_nodes, clean)
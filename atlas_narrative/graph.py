@@ -0,0 +1,129 @@
+# Precomputed adjacency index over a generated narrative tree
+from array import array
+
+# Report labels for each node category, in display order
+CATEGORY_LABELS = {
+    "ending": "Endings",
+    "skill": "Skill Checks",
+    "golden_path": "Golden Path",
+    "path_entry": "Path Entries",
+    "fatal": "Error States",
+    "bridge": "Bridge Nodes",
+    "story": "Story Nodes"
+}
+
+# Target share of completed playthroughs per ending rarity, as annotated in generator.py
+TARGET_RARITIES = {
+    "legendary": 0.01,
+    "epic": 0.04,
+    "rare": 0.20,
+    "uncommon": 0.25,
+    "common": 0.50
+}
+
+def classify_node_id(node_id):
+    """Return the category bucket for a node id (first matching rule wins)"""
+
+    if node_id.startswith("ending_"):
+        return "ending"
+    if node_id.startswith("skill_"):
+        return "skill"
+    if node_id.startswith("golden_path"):
+        return "golden_path"
+    if "path_entry" in node_id:
+        return "path_entry"
+    if node_id.startswith("fatal_"):
+        return "fatal"
+    if node_id.startswith(("bridge_", "transition_node_")):
+        return "bridge"
+    return "story"
+
+class NarrativeGraph:
+    """Index over tree["nodes"] built once, giving O(1) lookups and category counts.
+
+    Edges are stored CSR-style: the choices of node i map to
+    edge_targets[edge_offsets[i]:edge_offsets[i + 1]], in choice order, with -1
+    marking a next_id that does not resolve. Predecessors use the same layout.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.nodes = tree["nodes"]
+        self.root_id = tree.get("root_id")
+        self.ids = [node["id"] for node in self.nodes]
+
+        self.index = {}
+        self.duplicates = []
+        for i, node_id in enumerate(self.ids):
+            if node_id in self.index:
+                self.duplicates.append(node_id)
+            else:
+                self.index[node_id] = i
+
+        # Forward edges, one slot per choice
+        self.edge_offsets = array("l", [0])
+        self.edge_targets = array("l")
+        self.dangling = []
+        in_degree = [0] * len(self.nodes)
+        for i, node in enumerate(self.nodes):
+            for choice in node.get("choices") or []:
+                target = self.index.get(choice.get("next_id"), -1)
+                if target < 0:
+                    self.dangling.append((i, choice.get("id"), choice.get("next_id")))
+                else:
+                    in_degree[target] += 1
+                self.edge_targets.append(target)
+            self.edge_offsets.append(len(self.edge_targets))
+
+        # Reverse edges via counting sort on the target index
+        self.pred_offsets = array("l", [0] * (len(self.nodes) + 1))
+        for i, degree in enumerate(in_degree):
+            self.pred_offsets[i + 1] = self.pred_offsets[i] + degree
+        self.pred_sources = array("l", [0] * self.pred_offsets[-1])
+        cursor = array("l", self.pred_offsets[:-1])
+        for source in range(len(self.nodes)):
+            for e in range(self.edge_offsets[source], self.edge_offsets[source + 1]):
+                target = self.edge_targets[e]
+                if target >= 0:
+                    self.pred_sources[cursor[target]] = source
+                    cursor[target] += 1
+
+        self.buckets = {category: [] for category in CATEGORY_LABELS}
+        for i, node_id in enumerate(self.ids):
+            self.buckets[classify_node_id(node_id)].append(i)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, node_id):
+        return node_id in self.index
+
+    def node(self, node_id):
+        """Return the node dict for an id, or None"""
+        i = self.index.get(node_id)
+        return None if i is None else self.nodes[i]
+
+    def successor_indices(self, i):
+        """Resolved choice targets of node index i, in choice order"""
+        return [t for t in self.edge_targets[self.edge_offsets[i]:self.edge_offsets[i + 1]] if t >= 0]
+
+    def predecessor_indices(self, i):
+        """Indices of nodes with at least one choice leading to node index i"""
+        return self.pred_sources[self.pred_offsets[i]:self.pred_offsets[i + 1]].tolist()
+
+    def successors(self, node_id):
+        return [self.ids[t] for t in self.successor_indices(self.index[node_id])]
+
+    def predecessors(self, node_id):
+        return [self.ids[s] for s in self.predecessor_indices(self.index[node_id])]
+
+    def bucket(self, category):
+        """Node ids in a category bucket, in tree order"""
+        return [self.ids[i] for i in self.buckets[category]]
+
+    def count(self, category):
+        return len(self.buckets[category])
+
+    def category_counts(self):
+        """Non-empty category counts keyed by report label"""
+        return {CATEGORY_LABELS[c]: len(b) for c, b in self.buckets.items() if b}
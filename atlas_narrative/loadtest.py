@@ -0,0 +1,238 @@
+# Load generator: synthetic players walk the tree through the engine, in-process or over a socket
+#
+# Each player is a session that takes one step per round until it ends, gets
+# stuck or reaches max_steps, so every live session competes for the engine at
+# once. Policies pick among the choices the session can take right now:
+#   random  uniformly at random
+#   greedy  the correct answer at skill_* checks, random elsewhere
+#   fail    a fatal_* answer at skill_* checks (then the retry), random elsewhere
+# Socket mode plays against server.py; the harness mirrors every session on a
+# local engine to pick choices and to count responses that disagree with it.
+import asyncio
+import json
+import math
+import random
+import time
+import tracemalloc
+from urllib.parse import quote
+
+from .engine import NarrativeEngine, SessionStore
+
+POLICIES = ("random", "greedy", "fail")
+MODES = ("inprocess", "socket")
+
+def choose(engine, session, policy, rng):
+    """Choice id the policy takes from the session's position, or None when none is available"""
+
+    options = [
+        (choice_id, target)
+        for choice_id, (target, cost, require, _) in engine.edges[session.node].items()
+        if target >= 0 and session.flags & require == require and cost <= session.tokens
+    ]
+    if not options:
+        return None
+    if policy != "random" and engine.skill[session.node]:
+        want_fatal = policy == "fail"
+        options = [option for option in options if engine.fatal[option[1]] == want_fatal] or options
+    return rng.choice(options)[0]
+
+def _latency_summary(latencies):
+    """Nearest-rank percentiles of per-step latencies, in microseconds"""
+
+    if not latencies:
+        return {"count": 0}
+    ordered = sorted(latencies)
+
+    def percentile(q):
+        return ordered[max(0, math.ceil(q * len(ordered)) - 1)] * 1e6
+
+    return {
+        "count": len(ordered),
+        "mean_us": sum(ordered) / len(ordered) * 1e6,
+        "p50_us": percentile(0.50),
+        "p90_us": percentile(0.90),
+        "p99_us": percentile(0.99),
+        "max_us": ordered[-1] * 1e6
+    }
+
+def _session_bytes(engine, sessions):
+    """Traced bytes per session for holding these sessions' states in a SessionStore.
+
+    Tracing the caller already started is left running.
+    """
+
+    if not sessions:
+        return 0
+    snapshots = [engine.snapshot(session) for session in sessions]
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        store = SessionStore(engine, capacity=len(snapshots))
+        store.restore(snapshots)
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    del store
+    return used / len(snapshots)
+
+class _Tally:
+    """Step counters and latencies for one policy run"""
+
+    def __init__(self):
+        self.latencies = []
+        self.steps = self.rejected = self.mismatches = self.fatal_visits = 0
+        self.outcomes = {"ended": 0, "stuck": 0, "capped": 0}
+
+    def finish(self, engine, session, max_steps):
+        if engine.terminal[session.node]:
+            self.outcomes["ended"] += 1
+        elif session.steps >= max_steps:
+            self.outcomes["capped"] += 1
+        else:
+            self.outcomes["stuck"] += 1
+
+    def count(self, engine, result, session):
+        if result["ok"]:
+            self.steps += 1
+            self.fatal_visits += engine.fatal[session.node]
+        else:
+            self.rejected += 1
+
+def _run_inprocess(engine, players, policy, max_steps, seed):
+    rng = random.Random(seed)
+    store = SessionStore(engine, capacity=max(players, 1))
+    sessions = [store.create() for _ in range(players)]
+    tally = _Tally()
+    clock = time.perf_counter
+    active = sessions
+    started = clock()
+    while active:
+        remaining = []
+        for session in active:
+            choice_id = choose(engine, session, policy, rng) if session.steps < max_steps else None
+            if choice_id is None:
+                tally.finish(engine, session, max_steps)
+                continue
+            before = clock()
+            result = store.step(session.id, choice_id)
+            tally.latencies.append(clock() - before)
+            tally.count(engine, result, session)
+            remaining.append(session)
+        active = remaining
+    return tally, clock() - started, sessions
+
+async def _socket_player_group(client, engine, sessions, policy, max_steps, rng, tally):
+    """Play a group of sessions over one keep-alive connection, one request in flight"""
+
+    remote = {}
+    for session in sessions:
+        status, _, body = await client.request("POST", "/sessions")
+        if status != 201:
+            raise ConnectionError(f"POST /sessions answered {status}: {body[:200]!r}")
+        remote[session.id] = json.loads(body)["id"]
+
+    clock = time.perf_counter
+    active = sessions
+    while active:
+        remaining = []
+        for session in active:
+            choice_id = choose(engine, session, policy, rng) if session.steps < max_steps else None
+            if choice_id is None:
+                tally.finish(engine, session, max_steps)
+                continue
+            before = clock()
+            status, _, body = await client.request("POST", f"/sessions/{quote(remote[session.id], safe='')}/choose/{quote(choice_id, safe='')}")
+            tally.latencies.append(clock() - before)
+            answer = json.loads(body) if body else {}
+            expected = engine.step(session, choice_id)
+            if answer.get("node") != expected["node"] or answer.get("tokens") != expected["tokens"]:
+                tally.mismatches += 1
+            tally.count(engine, answer if status in (200, 409) else {"ok": False}, session)
+            remaining.append(session)
+        active = remaining
+
+async def _run_socket(engine, tree, players, policy, max_steps, seed, host, port, connections):
+    from .server import HTTPClient, NarrativeService, start_server
+
+    server = None
+    if host is None:
+        server = await start_server(NarrativeService(tree, session_capacity=max(players, 1)), "127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+    try:
+        connections = max(1, min(connections, players or 1))
+        clients = [await HTTPClient(host, port).connect() for _ in range(connections)]
+        sessions = [engine.new_session(f"p{k}") for k in range(players)]
+        tally = _Tally()
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            _socket_player_group(client, engine, sessions[k::connections], policy, max_steps, random.Random(seed * 1_000_003 + k), tally)
+            for k, client in enumerate(clients)
+        ))
+        elapsed = time.perf_counter() - started
+        for client in clients:
+            await client.close()
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+    return tally, elapsed, sessions, f"{host}:{port}"
+
+def run_load_test(tree, policies=POLICIES, players=1_000, max_steps=200, seed=0, mode="inprocess",
+                  host=None, port=None, connections=8):
+    """Replay players under each policy and return a JSON-ready report.
+
+    mode="socket" talks HTTP to host:port, or to a server started in this
+    process on a free port when host is None. Latency is per step: the engine
+    call in-process, the request round trip over a socket. bytes_per_session
+    is the traced cost of holding the final session states in a SessionStore.
+    """
+
+    from .bench import environment
+
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {', '.join(MODES)}, got {mode!r}")
+    for policy in policies:
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {', '.join(POLICIES)}, got {policy!r}")
+    engine = NarrativeEngine(tree)
+
+    results = []
+    for policy in policies:
+        server = None
+        if mode == "socket":
+            tally, elapsed, sessions, server = asyncio.run(
+                _run_socket(engine, tree, players, policy, max_steps, seed, host, port, connections))
+        else:
+            tally, elapsed, sessions = _run_inprocess(engine, players, policy, max_steps, seed)
+        result = {
+            "policy": policy,
+            "steps": tally.steps,
+            "rejected": tally.rejected,
+            "fatal_visits": tally.fatal_visits,
+            "outcomes": tally.outcomes,
+            "elapsed_s": elapsed,
+            "steps_per_s": tally.steps / elapsed if elapsed else None,
+            "latency": _latency_summary(tally.latencies),
+            "bytes_per_session": _session_bytes(engine, sessions)
+        }
+        if server is not None:
+            result.update(server=server, mismatches=tally.mismatches)
+        results.append(result)
+
+    return {
+        "environment": environment(),
+        "config": {
+            "mode": mode,
+            "players": players,
+            "max_steps": max_steps,
+            "seed": seed,
+            "connections": connections if mode == "socket" else None,
+            "nodes": len(engine.graph),
+            "choices": len(engine.graph.edge_targets),
+            "tree_hash": engine.tree_hash
+        },
+        "results": results
+    }
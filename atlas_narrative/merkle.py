@@ -0,0 +1,98 @@
+# Content-addressed node hashes, Merkle roots and the meta.content block that carries them
+#
+# A node's hash is SHA-256 over its canonical JSON (sorted keys, no whitespace,
+# UTF-8). The Merkle root over a run of nodes pairs hashes level by level in
+# tree order, promoting an odd last hash unchanged; leaves and inner nodes use
+# distinct prefixes so a node can never pass for a pair. The tree hash combines
+# the Merkle root with root_id and tokens, i.e. everything that plays.
+import hashlib
+import json
+
+HASH_ALGORITHM = "sha256"
+
+_LEAF = b"\x00"
+_PAIR = b"\x01"
+
+# One shared encoder: json.dumps() would build a new one per node
+_CANONICAL = json.JSONEncoder(sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+def canonical_json(value):
+    """Stable serialization hashes are taken over"""
+
+    return _CANONICAL.encode(value)
+
+def node_hash(node):
+    """Hex hash of one node dict"""
+
+    return hashlib.sha256(_LEAF + canonical_json(node).encode("utf-8")).hexdigest()
+
+def node_hashes(nodes):
+    return [node_hash(node) for node in nodes]
+
+def merkle_root(hashes):
+    """Hex Merkle root over hex leaf hashes (the hash of nothing for an empty run)"""
+
+    level = [bytes.fromhex(h) for h in hashes]
+    if not level:
+        return hashlib.sha256(b"").hexdigest()
+    while len(level) > 1:
+        paired = [hashlib.sha256(_PAIR + level[i] + level[i + 1]).digest() for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0].hex()
+
+def playable_hash(tree, root):
+    """Tree hash from the nodes' Merkle root plus root_id and tokens"""
+
+    envelope = canonical_json({"root_id": tree.get("root_id"), "tokens": tree.get("tokens")})
+    return hashlib.sha256(f"{envelope}\n{root}".encode("utf-8")).hexdigest()
+
+def content_meta(tree, sections=None, hashes=None):
+    """The meta.content block for a tree.
+
+    sections is an optional list of (name, node count) covering the nodes in
+    order; each gets the Merkle root over its own nodes. hashes are the node
+    hashes when the caller already has them.
+    """
+
+    hashes = node_hashes(tree.get("nodes") or ()) if hashes is None else hashes
+    root = merkle_root(hashes)
+    content = {"algorithm": HASH_ALGORITHM, "tree_hash": playable_hash(tree, root), "merkle_root": root}
+    if sections is not None:
+        content["sections"] = {}
+        start = 0
+        for name, count in sections:
+            content["sections"][name] = {"nodes": count, "hash": merkle_root(hashes[start:start + count])}
+            start += count
+        if start != len(hashes):
+            raise ValueError(f"sections cover {start} nodes but the tree has {len(hashes)}")
+    return content
+
+def stamp_content(tree, sections=None, hashes=None):
+    """Write content_meta() into tree["meta"]["content"] and return the tree"""
+
+    tree.setdefault("meta", {})["content"] = content_meta(tree, sections, hashes)
+    return tree
+
+def stored_tree_hash(tree):
+    """meta.content.tree_hash when the tree carries one (O(1)), else computed from the nodes"""
+
+    content = tree.get("meta", {}).get("content") or {}
+    if content.get("algorithm") == HASH_ALGORITHM and "tree_hash" in content:
+        return content["tree_hash"]
+    return playable_hash(tree, merkle_root(node_hashes(tree.get("nodes") or ())))
+
+def verify_content(tree):
+    """True when meta.content matches what the nodes actually hash to"""
+
+    content = tree.get("meta", {}).get("content")
+    if not content:
+        return False
+    sections = None
+    if "sections" in content:
+        sections = [(name, section["nodes"]) for name, section in content["sections"].items()]
+    try:
+        return content_meta(tree, sections) == content
+    except ValueError:
+        return False
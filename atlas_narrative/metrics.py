@@ -0,0 +1,228 @@
+# Structural metrics over a narrative tree in linear time, and the meta fields filled from them
+#
+# One sweep over the CSR edges gives counts and branching, one BFS gives depth
+# from the root, one DFS gives back edges (retry loops when they leave a
+# fatal_* node) and the longest path that never takes a back edge, and one
+# bitmask propagation gives each path_* subgraph. Retry loops make the graph
+# cyclic, so "longest acyclic path" is taken over the DFS tree's DAG.
+from collections import deque
+
+from .chunks import path_seeds
+from .graph import NarrativeGraph, classify_node_id
+
+# Headline meta counts that are a plain count of one node category
+CATEGORY_COUNTS = {"ending": "endings", "golden_path": "golden_path_nodes", "skill": "skill_checks"}
+
+def skeleton_nodes(nodes):
+    """Node ids, choice targets and path_* grants only: all the metrics read, cheap to cache"""
+
+    return [
+        {"id": node["id"], "choices": [
+            {"next_id": choice.get("next_id"), "grants": [flag for flag in choice.get("grants") or () if flag.startswith("path_")]}
+            for choice in node.get("choices") or ()
+        ]}
+        for node in nodes
+    ]
+
+def _counts(histogram):
+    """{value: count} keyed by str(value) in ascending order, for JSON"""
+
+    return {str(value): histogram[value] for value in sorted(histogram)}
+
+def structure_metrics(tree_or_graph):
+    """Counts, branching and depth histograms, longest acyclic path, cycles and path sizes"""
+
+    graph = tree_or_graph if isinstance(tree_or_graph, NarrativeGraph) else NarrativeGraph(tree_or_graph)
+    n = len(graph)
+    ids = graph.ids
+    offsets, targets = graph.edge_offsets, graph.edge_targets
+    root = graph.index.get(graph.root_id)
+    fatal = bytearray(n)
+    for i in graph.buckets["fatal"]:
+        fatal[i] = 1
+
+    # Choices per node, and nodes whose choices lead to more than one place
+    degrees = {}
+    branching_points = 0
+    for i in range(n):
+        degree = offsets[i + 1] - offsets[i]
+        degrees[degree] = degrees.get(degree, 0) + 1
+        if degree > 1 and len({t for t in targets[offsets[i]:offsets[i + 1]] if t >= 0}) > 1:
+            branching_points += 1
+
+    # Shortest depth from the root
+    depth = [-1] * n
+    depths = {}
+    if root is not None:
+        depth[root] = 0
+        queue = deque([root])
+        while queue:
+            i = queue.popleft()
+            depths[depth[i]] = depths.get(depth[i], 0) + 1
+            for e in range(offsets[i], offsets[i + 1]):
+                t = targets[e]
+                if t >= 0 and depth[t] < 0:
+                    depth[t] = depth[i] + 1
+                    queue.append(t)
+
+    # DFS from the root: edges into the active stack close a cycle, the rest form a DAG
+    state = bytearray(n)  # 0 unvisited, 1 on the stack, 2 finished
+    longest = [0] * n
+    follow = [-1] * n
+    back_edges = retry_loops = 0
+    if root is not None:
+        state[root] = 1
+        work = [(root, offsets[root])]
+        while work:
+            i, e = work[-1]
+            end = offsets[i + 1]
+            while e < end:
+                t = targets[e]
+                e += 1
+                if t < 0:
+                    continue
+                if state[t] == 0:
+                    work[-1] = (i, e)
+                    state[t] = 1
+                    work.append((t, offsets[t]))
+                    break
+                if state[t] == 1:
+                    back_edges += 1
+                    retry_loops += fatal[i]
+                elif longest[t] + 1 > longest[i]:
+                    longest[i] = longest[t] + 1
+                    follow[i] = t
+            else:
+                work.pop()
+                state[i] = 2
+                if work:
+                    parent = work[-1][0]
+                    if longest[i] + 1 > longest[parent]:
+                        longest[parent] = longest[i] + 1
+                        follow[parent] = i
+    path = []
+    i = root if root is not None else -1
+    while i >= 0:
+        path.append(ids[i])
+        i = follow[i]
+
+    # Which path_* subgraphs reach each node, one bit per path
+    seeds = path_seeds(graph)
+    names = list(dict.fromkeys(seeds.values()))
+    bits = {name: 1 << k for k, name in enumerate(names)}
+    reach = [0] * n
+    queue = deque()
+    for seed, name in seeds.items():
+        reach[seed] |= bits[name]
+        queue.append(seed)
+    while queue:
+        i = queue.popleft()
+        mask = reach[i]
+        for e in range(offsets[i], offsets[i + 1]):
+            t = targets[e]
+            if t >= 0 and reach[t] | mask != reach[t]:
+                reach[t] |= mask
+                queue.append(t)
+    entries = {}
+    for seed, name in seeds.items():
+        entries.setdefault(name, seed)
+    paths = {name: {"entry": ids[entries[name]], "nodes": 0, "exclusive": 0} for name in names}
+    for mask in reach:
+        if mask:
+            for name in names:
+                if mask & bits[name]:
+                    paths[name]["nodes"] += 1
+                    paths[name]["exclusive"] += mask == bits[name]
+
+    choices = len(targets)
+    return {
+        "total_nodes": n,
+        "choices": choices,
+        "dangling": len(graph.dangling),
+        "categories": {category: len(members) for category, members in graph.buckets.items()},
+        "endings": graph.count("ending"),
+        "golden_path_nodes": graph.count("golden_path"),
+        "skill_checks": graph.count("skill"),
+        "branching_points": branching_points,
+        "branching_histogram": _counts(degrees),
+        "mean_branching": choices / (n - degrees.get(0, 0)) if n > degrees.get(0, 0) else 0.0,
+        "depth": {"max": max(depths, default=0), "histogram": _counts(depths), "unreachable": n - sum(depths.values())},
+        "longest_acyclic_path": {"length": len(path) - 1 if path else 0, "nodes": path},
+        "cycles": {"back_edges": back_edges, "retry_loops": retry_loops},
+        "paths": paths
+    }
+
+def structure_meta(metrics):
+    """The meta fields filled from structure_metrics(): the headline counts plus meta.structure"""
+
+    return {
+        "endings": metrics["endings"],
+        "golden_path_nodes": metrics["golden_path_nodes"],
+        "skill_checks": metrics["skill_checks"],
+        "branching_points": metrics["branching_points"],
+        "structure": {
+            "categories": metrics["categories"],
+            "choices": metrics["choices"],
+            "branching_histogram": metrics["branching_histogram"],
+            "max_depth": metrics["depth"]["max"],
+            "unreachable": metrics["depth"]["unreachable"],
+            "longest_acyclic_path": metrics["longest_acyclic_path"]["length"],
+            "back_edges": metrics["cycles"]["back_edges"],
+            "retry_loops": metrics["cycles"]["retry_loops"],
+            "paths": metrics["paths"]
+        }
+    }
+
+def stamp_structure(tree, nodes=None):
+    """Fill tree["meta"] from structure_metrics() over nodes (default tree["nodes"]) and return the metrics.
+
+    nodes may be skeleton_nodes() when the full nodes are not at hand.
+    """
+
+    metrics = structure_metrics({"root_id": tree.get("root_id"), "nodes": tree["nodes"] if nodes is None else nodes})
+    tree.setdefault("meta", {}).update(structure_meta(metrics))
+    return metrics
+
+def tally_headline_counts(nodes, counts):
+    """Yield nodes unchanged while filling counts with the headline meta counts structure_metrics() gives.
+
+    The category counts grow as nodes pass; branching_points needs every node id to
+    know which choice targets resolve, so it is set once nodes is exhausted.
+    """
+
+    counts.update(dict.fromkeys(CATEGORY_COUNTS.values(), 0), branching_points=0)
+    return _tally(nodes, counts)
+
+def _tally(nodes, counts):
+    ids = set()
+    forks = []
+    for node in nodes:
+        if isinstance(node, dict):
+            node_id = node["id"]
+            targets = {choice.get("next_id") for choice in node.get("choices") or ()}
+        else:
+            node_id = node.id
+            targets = {choice.next_id for choice in node.choices}
+        ids.add(node_id)
+        key = CATEGORY_COUNTS.get(classify_node_id(node_id))
+        if key is not None:
+            counts[key] += 1
+        if len(targets) > 1:
+            forks.append(targets)
+        yield node
+    counts["branching_points"] = sum(len(targets & ids) > 1 for targets in forks)
+
+def format_metrics_summary(metrics):
+    """Console lines for the structure report"""
+
+    lines = [
+        f"  Choices: {metrics['choices']} ({metrics['mean_branching']:.2f} per non-terminal node)",
+        f"  Branching points: {metrics['branching_points']}",
+        "  Choices per node: " + ", ".join(f"{k}: {v}" for k, v in metrics["branching_histogram"].items()),
+        f"  Max depth from root: {metrics['depth']['max']}",
+        f"  Longest acyclic path: {metrics['longest_acyclic_path']['length']} choices",
+        f"  Retry loops: {metrics['cycles']['retry_loops']} of {metrics['cycles']['back_edges']} back edges"
+    ]
+    for name, path in metrics["paths"].items():
+        lines.append(f"  path_{name}: {path['nodes']} nodes ({path['exclusive']} exclusive) from {path['entry']}")
+    return lines
@@ -0,0 +1,281 @@
+# Typed, schema-checked node model with direct JSON emission
+#
+# Node, Choice and Cinematic use __slots__, interned ids and tuples instead of
+# dicts and lists. write_json() appends the node's JSON text straight to an
+# output list, byte-for-byte what json.dumps(node.to_dict(), indent=indent,
+# ensure_ascii=False) would produce when nested depth levels deep.
+#
+# These writers are the only node emitter: generator.serialize_nodes() validates
+# each plain node dict into a Node as it goes and writes that, so a second copy of
+# the tree is never held.
+import sys
+from json.encoder import encode_basestring
+
+# Newline + indentation strings per (indent, depth), shared by every emitter
+_NEWLINES = {}
+
+# Shared flag tuples and cinematics: most nodes reuse a handful of each
+_FLAG_TUPLES = {}
+_CINEMATICS = {}
+
+def _newlines(indent, depth):
+    """Newline-and-pad strings for depth, depth + 1, ... (empty strings in compact mode)"""
+
+    key = (indent, depth)
+    lines = _NEWLINES.get(key)
+    if lines is None:
+        pad = "" if indent is None else " " * indent
+        lines = _NEWLINES[key] = tuple("" if indent is None else "\n" + pad * (depth + k) for k in range(5))
+    return lines
+
+def _scalar_json(value):
+    """JSON text of a str, bool, int, float or None value"""
+
+    if isinstance(value, str):
+        return encode_basestring(value)
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if value is None:
+        return "null"
+    if isinstance(value, int):
+        return int.__repr__(value)
+    return float.__repr__(value)
+
+def _emit_strings(out, items, nl):
+    """Append a JSON array of strings whose brackets sit at nl[0]"""
+
+    if not items:
+        out.append("[]")
+        return
+    out.append("[" + nl[1] + ("," + nl[1]).join(map(encode_basestring, items)) + nl[0] + "]")
+
+def _emit_pairs(out, pairs, nl, sep):
+    """Append a JSON object of scalar (key, value) pairs whose braces sit at nl[0]"""
+
+    if not pairs:
+        out.append("{}")
+        return
+    out.append("{" + nl[1] + ("," + nl[1]).join(encode_basestring(k) + sep + _scalar_json(v) for k, v in pairs) + nl[0] + "}")
+
+def _check_str(value, what):
+    if not isinstance(value, str):
+        raise ValueError(f"{what} must be a string, got {type(value).__name__}")
+    return value
+
+def _check_flags(value, what):
+    """Validated tuple of interned flag names from a list of strings"""
+
+    if not isinstance(value, (list, tuple)):
+        raise ValueError(f"{what} must be a list of flag names, got {type(value).__name__}")
+    flags = tuple(sys.intern(_check_str(flag, what)) for flag in value)
+    return _FLAG_TUPLES.setdefault(flags, flags)
+
+def _check_pairs(value, what, allowed):
+    """Validated (key, value) tuple from a dict whose values are instances of allowed"""
+
+    if not isinstance(value, dict):
+        raise ValueError(f"{what} must be an object, got {type(value).__name__}")
+    for key, item in value.items():
+        _check_str(key, f"{what} key")
+        if not isinstance(item, allowed):
+            raise ValueError(f"{what}.{key} has unsupported value {item!r}")
+    return tuple(value.items())
+
+def _check_keys(data, allowed, required, what):
+    if not isinstance(data, dict):
+        raise ValueError(f"{what} must be an object, got {type(data).__name__}")
+    missing = [key for key in required if key not in data]
+    unknown = [key for key in data if key not in allowed]
+    if missing or unknown:
+        raise ValueError(f"{what} {data.get('id', '?')!r}: missing {missing}, unknown {unknown}")
+
+class Cinematic:
+    """Presentation cue; timeline and fx are tuples of (key, value) pairs.
+
+    from_dict() returns one shared instance per distinct cue, so treat them as immutable.
+    """
+
+    __slots__ = ("animation_key", "view", "timeline", "fx")
+    FIELDS = ("animation_key", "view", "timeline", "fx")
+
+    def __init__(self, animation_key, view=None, timeline=None, fx=None):
+        self.animation_key = animation_key
+        self.view = view
+        self.timeline = timeline
+        self.fx = fx
+
+    @classmethod
+    def from_dict(cls, data):
+        _check_keys(data, cls.FIELDS, ("animation_key",), "cinematic")
+        timeline = data.get("timeline")
+        fx = data.get("fx")
+        key = (
+            sys.intern(_check_str(data["animation_key"], "cinematic.animation_key")),
+            None if data.get("view") is None else sys.intern(_check_str(data["view"], "cinematic.view")),
+            None if timeline is None else _check_pairs(timeline, "cinematic.timeline", (str, int, float)),
+            None if fx is None else _check_pairs(fx, "cinematic.fx", bool)
+        )
+        shared = _CINEMATICS.get(key)
+        if shared is None:
+            shared = _CINEMATICS[key] = cls(*key)
+        return shared
+
+    def to_dict(self):
+        data = {"animation_key": self.animation_key}
+        if self.view is not None:
+            data["view"] = self.view
+        if self.timeline is not None:
+            data["timeline"] = dict(self.timeline)
+        if self.fx is not None:
+            data["fx"] = dict(self.fx)
+        return data
+
+    def write_json(self, out, depth, indent=2):
+        nl = _newlines(indent, depth)
+        sep = ":" if indent is None else ": "
+        out.append("{" + nl[1] + '"animation_key"' + sep + encode_basestring(self.animation_key))
+        if self.view is not None:
+            out.append("," + nl[1] + '"view"' + sep + encode_basestring(self.view))
+        if self.timeline is not None:
+            out.append("," + nl[1] + '"timeline"' + sep)
+            _emit_pairs(out, self.timeline, nl[1:], sep)
+        if self.fx is not None:
+            out.append("," + nl[1] + '"fx"' + sep)
+            _emit_pairs(out, self.fx, nl[1:], sep)
+        out.append(nl[0] + "}")
+
+class Choice:
+    """Edge to next_id; grants and requires are tuples of interned flags, None when absent"""
+
+    __slots__ = ("id", "label", "next_id", "grants", "requires", "cost")
+    FIELDS = ("id", "label", "next_id", "grants", "requires", "cost")
+
+    def __init__(self, id, label, next_id, grants=None, requires=None, cost=None):
+        self.id = id
+        self.label = label
+        self.next_id = next_id
+        self.grants = grants
+        self.requires = requires
+        self.cost = cost
+
+    @classmethod
+    def from_dict(cls, data):
+        _check_keys(data, cls.FIELDS, ("id", "label", "next_id"), "choice")
+        cost = data.get("cost")
+        if cost is not None and (type(cost) is not int or cost < 0):
+            raise ValueError(f"choice {data['id']!r}: cost must be a non-negative integer, got {cost!r}")
+        return cls(
+            sys.intern(_check_str(data["id"], "choice.id")),
+            _check_str(data["label"], "choice.label"),
+            sys.intern(_check_str(data["next_id"], "choice.next_id")),
+            None if data.get("grants") is None else _check_flags(data["grants"], "choice.grants"),
+            None if data.get("requires") is None else _check_flags(data["requires"], "choice.requires"),
+            cost
+        )
+
+    def to_dict(self):
+        data = {"id": self.id, "label": self.label, "next_id": self.next_id}
+        if self.grants is not None:
+            data["grants"] = list(self.grants)
+        if self.requires is not None:
+            data["requires"] = list(self.requires)
+        if self.cost is not None:
+            data["cost"] = self.cost
+        return data
+
+    def write_json(self, out, depth, indent=2):
+        nl = _newlines(indent, depth)
+        sep = ":" if indent is None else ": "
+        out.append("{" + nl[1] + '"id"' + sep + encode_basestring(self.id)
+                   + "," + nl[1] + '"label"' + sep + encode_basestring(self.label)
+                   + "," + nl[1] + '"next_id"' + sep + encode_basestring(self.next_id))
+        if self.grants is not None:
+            out.append("," + nl[1] + '"grants"' + sep)
+            _emit_strings(out, self.grants, nl[1:])
+        if self.requires is not None:
+            out.append("," + nl[1] + '"requires"' + sep)
+            _emit_strings(out, self.requires, nl[1:])
+        if self.cost is not None:
+            out.append("," + nl[1] + '"cost"' + sep + int.__repr__(self.cost))
+        out.append(nl[0] + "}")
+
+class Node:
+    """Narrative node; choices is a tuple of Choice, grants/requires tuples or None"""
+
+    __slots__ = ("id", "title", "body_md", "choices", "grants", "requires", "cinematic")
+    FIELDS = ("id", "title", "body_md", "choices", "grants", "requires", "cinematic")
+
+    def __init__(self, id, title, body_md, choices=(), grants=None, requires=None, cinematic=None):
+        self.id = id
+        self.title = title
+        self.body_md = body_md
+        self.choices = choices
+        self.grants = grants
+        self.requires = requires
+        self.cinematic = cinematic
+
+    @classmethod
+    def from_dict(cls, data):
+        """Validate a node dict against the schema and convert it, raising ValueError on violations"""
+
+        _check_keys(data, cls.FIELDS, ("id", "title", "body_md", "choices"), "node")
+        node_id = _check_str(data["id"], "node.id")
+        if not node_id:
+            raise ValueError("node.id must not be empty")
+        if not isinstance(data["choices"], list):
+            raise ValueError(f"node {node_id!r}: choices must be a list")
+        return cls(
+            sys.intern(node_id),
+            _check_str(data["title"], "node.title"),
+            _check_str(data["body_md"], "node.body_md"),
+            tuple(map(Choice.from_dict, data["choices"])),
+            None if data.get("grants") is None else _check_flags(data["grants"], "node.grants"),
+            None if data.get("requires") is None else _check_flags(data["requires"], "node.requires"),
+            None if data.get("cinematic") is None else Cinematic.from_dict(data["cinematic"])
+        )
+
+    def to_dict(self):
+        data = {"id": self.id, "title": self.title, "body_md": self.body_md,
+                "choices": [choice.to_dict() for choice in self.choices]}
+        if self.grants is not None:
+            data["grants"] = list(self.grants)
+        if self.requires is not None:
+            data["requires"] = list(self.requires)
+        if self.cinematic is not None:
+            data["cinematic"] = self.cinematic.to_dict()
+        return data
+
+    def write_json(self, out, depth, indent=2):
+        """Append this node's JSON text to out, formatted as if nested depth levels deep"""
+
+        nl = _newlines(indent, depth)
+        sep = ":" if indent is None else ": "
+        out.append("{" + nl[1] + '"id"' + sep + encode_basestring(self.id)
+                   + "," + nl[1] + '"title"' + sep + encode_basestring(self.title)
+                   + "," + nl[1] + '"body_md"' + sep + encode_basestring(self.body_md)
+                   + "," + nl[1] + '"choices"' + sep)
+        if self.choices:
+            out.append("[")
+            for k, choice in enumerate(self.choices):
+                out.append(("," if k else "") + nl[2])
+                choice.write_json(out, depth + 2, indent)
+            out.append(nl[1] + "]")
+        else:
+            out.append("[]")
+        if self.grants is not None:
+            out.append("," + nl[1] + '"grants"' + sep)
+            _emit_strings(out, self.grants, nl[1:])
+        if self.requires is not None:
+            out.append("," + nl[1] + '"requires"' + sep)
+            _emit_strings(out, self.requires, nl[1:])
+        if self.cinematic is not None:
+            out.append("," + nl[1] + '"cinematic"' + sep)
+            self.cinematic.write_json(out, depth + 1, indent)
+        out.append(nl[0] + "}")
+
+def load_nodes(nodes):
+    """Node objects for an iterable of node dicts (Node objects pass through unchanged)"""
+
+    return [node if isinstance(node, Node) else Node.from_dict(node) for node in nodes]
@@ -0,0 +1,195 @@
+# Optimal and k-best route solver over the (node, flags) state graph
+import heapq
+import json
+import os
+from collections import OrderedDict, deque
+
+from .cache import content_hash, tree_hash
+from .explorer import compile_transitions
+from .flags import FlagRegistry
+from .graph import NarrativeGraph
+from .merkle import stored_tree_hash
+
+# Solved reports kept in memory, most recently used last
+ROUTE_CACHE_SIZE = 32
+
+# Bump when solver changes alter results so persisted reports are not reused
+ROUTES_VERSION = 3
+_route_cache = OrderedDict()
+
+def default_route_targets(graph):
+    """Every ending plus the golden path checkpoints, in tree order"""
+
+    return [graph.ids[i] for i in sorted(graph.buckets["ending"] + graph.buckets["golden_path"])]
+
+def hops_to_targets(graph, targets):
+    """Fewest choices from each node to any target, ignoring requires and cost (None if none)"""
+
+    hops = [None] * len(graph)
+    queue = deque(targets)
+    for t in targets:
+        hops[t] = 0
+    while queue:
+        t = queue.popleft()
+        for s in graph.predecessor_indices(t):
+            if hops[s] is None:
+                hops[s] = hops[t] + 1
+                queue.append(s)
+    return hops
+
+def _repeats_state(entries, e, node, flags):
+    """True when (node, flags) already occurs on the path ending at entry e.
+
+    Flags only grow along a path, so only the trailing run of entries holding
+    exactly these flags needs checking.
+    """
+
+    while e >= 0:
+        entry_node, entry_flags, parent = entries[e][:3]
+        if entry_flags != flags:
+            return False
+        if entry_node == node:
+            return True
+        e = parent
+    return False
+
+def _dominated(popped, cost, k):
+    """True when k labels already popped for a state cost no more than cost.
+
+    Labels pop in heap order, so every popped label is already no worse on the
+    primary criterion; only its cost decides whether it still fits the budget
+    wherever this one would.
+    """
+
+    return popped is not None and sum(c <= cost for c in popped) >= k
+
+def _route(graph, entries, e, cost, steps):
+    """Route record for the path ending at entry e"""
+
+    nodes, choices = [], []
+    while e >= 0:
+        node, _, parent, choice_id = entries[e][:4]
+        nodes.append(graph.ids[node])
+        if choice_id is not None:
+            choices.append(choice_id)
+        e = parent
+    nodes.reverse()
+    choices.reverse()
+    return {"cost": cost, "steps": steps, "nodes": nodes, "choices": choices}
+
+def solve_routes(tree, targets=None, k=1, budget=None, order="cost"):
+    """Cheapest (order="cost") or shortest (order="steps") routes from the root to each target.
+
+    A* over (node, flags) states, with flags masked to those some choice or node
+    requires and the other criterion breaking ties. Successors come from
+    explorer.compile_transitions(), so a choice is taken only when its own and its
+    target node's requires are held. The heuristic is the hop distance to
+    the nearest target, which is consistent, so states pop in order of their
+    best paths. Each state keeps the costs of its popped labels and a label is
+    pruned once k popped labels cost no more, so with order="steps" a shorter
+    but costlier path never shadows a longer one that still fits the budget.
+    A route never repeats a state, giving up to k loop-free routes per target.
+    A route's total cost may not exceed budget (default: the tree's starting
+    chrono tokens).
+    """
+
+    if order not in ("cost", "steps"):
+        raise ValueError(f"order must be 'cost' or 'steps', got {order!r}")
+
+    graph = NarrativeGraph(tree)
+    registry = FlagRegistry.from_tree(tree)
+    transitions, node_grants = compile_transitions(graph, registry)
+    start_tokens = int(tree.get("tokens", {}).get("chrono", {}).get("start", 0))
+    budget = start_tokens if budget is None else budget
+    target_ids = default_route_targets(graph) if targets is None else list(targets)
+    target_index = [graph.index[t] for t in target_ids if t in graph.index]
+    hops = hops_to_targets(graph, target_index)
+
+    found = {t: [] for t in target_index}
+    remaining = len(found)
+    root = graph.index[graph.root_id]
+    # Search entries: (node, flags, parent entry, choice id, cost, steps)
+    entries = [(root, node_grants[root], -1, None, 0, 0)]
+    heap = [] if hops[root] is None else [(0, hops[root], 0) if order == "cost" else (hops[root], 0, 0)]
+    pops = {}
+    expanded = 0
+
+    while heap and remaining:
+        e = heapq.heappop(heap)[2]
+        node, flags, _, _, cost, steps = entries[e]
+        popped = pops.get((node, flags))
+        if _dominated(popped, cost, k):
+            continue
+        if popped is None:
+            pops[node, flags] = [cost]
+        else:
+            popped.append(cost)
+        expanded += 1
+
+        routes = found.get(node)
+        if routes is not None and len(routes) < k:
+            routes.append(_route(graph, entries, e, cost, steps))
+            if len(routes) == k:
+                remaining -= 1
+
+        for target, choice_cost, require, grant, choice_id in transitions[node]:
+            if hops[target] is None or flags & require != require or cost + choice_cost > budget:
+                continue
+            next_flags = flags | grant
+            if _dominated(pops.get((target, next_flags)), cost + choice_cost, k):
+                continue
+            if k > 1 and _repeats_state(entries, e, target, next_flags):
+                continue
+            entries.append((target, next_flags, e, choice_id, cost + choice_cost, steps + 1))
+            estimate = steps + 1 + hops[target]
+            if order == "cost":
+                heapq.heappush(heap, (cost + choice_cost, estimate, len(entries) - 1))
+            else:
+                heapq.heappush(heap, (estimate, cost + choice_cost, len(entries) - 1))
+
+    return {
+        "order": order,
+        "k": k,
+        "budget": budget,
+        "start_tokens": start_tokens,
+        "expanded_states": expanded,
+        "targets": {
+            t: {"reachable": bool(found.get(graph.index.get(t))), "routes": found.get(graph.index.get(t), [])}
+            for t in target_ids
+        }
+    }
+
+def cached_routes(tree, targets=None, k=1, budget=None, order="cost", cache_dir=None, trust_stored=False):
+    """solve_routes() memoized per tree hash and arguments, in memory and optionally under cache_dir.
+
+    The tree hash is recomputed from the nodes. With trust_stored=True it is read
+    from meta.content when the tree carries one, so cache hits are O(1); only
+    trust trees the generator stamped, since hand-edited nodes leave meta.content
+    stale and would be served routes for the old tree.
+    """
+
+    digest = (stored_tree_hash if trust_stored else tree_hash)(tree)
+    key = content_hash(digest, repr((ROUTES_VERSION, None if targets is None else list(targets), k, budget, order)))
+    report = _route_cache.get(key)
+    if report is not None:
+        _route_cache.move_to_end(key)
+        return report
+
+    path = None if cache_dir is None else os.path.join(cache_dir, "routes", f"{key}.json")
+    if path is not None:
+        try:
+            with open(path, encoding="utf-8") as fh:
+                report = json.load(fh)
+        except (OSError, ValueError):
+            report = None
+    if report is None:
+        report = dict(solve_routes(tree, targets, k, budget, order), tree_hash=digest)
+        if path is not None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as fh:
+                json.dump(report, fh, ensure_ascii=False)
+
+    _route_cache[key] = report
+    if len(_route_cache) > ROUTE_CACHE_SIZE:
+        _route_cache.popitem(last=False)
+    return report
@@ -0,0 +1,517 @@
+# Asyncio HTTP/1.1 and WebSocket server for single nodes, slices, chunks and prefetch bundles
+#
+# GET  /tree                          meta, root_id and tokens (no nodes)
+# GET  /nodes/{id}                    one node
+# GET  /nodes/{id}/prefetch           {"node", "next"}: the node plus every choices[].next_id target
+# GET  /nodes?start=0&count=100       a slice of nodes in tree order
+# GET  /chunks, /chunks/{label}       path-partition chunk hashes, or one chunk's nodes
+# POST /sessions                      new play session (see engine.py)
+# GET  /sessions/{id}                 session snapshot, status and choices
+# POST /sessions/{id}/choose/{choice} take a choice
+# GET  /ws                            WebSocket carrying {"rid", "method", "path", "etag"} requests
+#
+# GET bodies are encoded once and cached as complete responses; their ETags
+# are content hashes (node hashes, or Merkle roots over several nodes), so
+# If-None-Match revalidation answers 304 without touching the tree. The cache
+# is keyed by the decoded route and clamped slice range, not the raw target,
+# and is bounded in bytes as well as entries.
+import asyncio
+import base64
+import hashlib
+import json
+from collections import OrderedDict, deque
+from urllib.parse import parse_qs, unquote
+
+from .chunks import partition_narrative
+from .encoders import get_encoder
+from .graph import NarrativeGraph
+from .merkle import merkle_root, node_hashes, playable_hash
+
+# Most nodes one slice request may return
+MAX_SLICE = 1_000
+
+# Encoded GET responses kept, most recently used last, up to either limit
+RESPONSE_CACHE_SIZE = 65_536
+RESPONSE_CACHE_BYTES = 256 * 1024 * 1024
+
+# Query parameters each route accepts; any other parameter is a 400
+_SLICE_PARAMS = {"start", "count"}
+
+# Request heads, bodies and WebSocket messages beyond this close the connection
+MAX_REQUEST_BYTES = 64 * 1024
+
+_WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+_REASONS = {
+    101: "Switching Protocols",
+    200: "OK",
+    201: "Created",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large"
+}
+
+def _head(status, content_type=b"application/json", length=None, etag=None, extra=b""):
+    """Status line and headers, each ending in CRLF, without the blank line"""
+
+    head = b"HTTP/1.1 %d %s\r\n" % (status, _REASONS[status].encode("ascii"))
+    if length is not None:
+        head += b"Content-Type: " + content_type + b"\r\nContent-Length: %d\r\n" % length
+    if etag is not None:
+        head += b"ETag: " + etag + b"\r\nCache-Control: no-cache\r\n"
+    return head + extra
+
+def _etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tag = etag.decode("ascii")
+    return any(candidate.strip().removeprefix("W/") == tag for candidate in if_none_match.split(","))
+
+class NarrativeService:
+    """Routes requests against one loaded tree, caching encoded GET responses by route"""
+
+    def __init__(self, tree, encoder=None, cache_size=RESPONSE_CACHE_SIZE, session_capacity=100_000,
+                 cache_bytes=RESPONSE_CACHE_BYTES):
+        self.tree = tree
+        self.graph = NarrativeGraph(tree)
+        self.dumps = get_encoder(encoder)[1]
+        self.hashes = node_hashes(self.graph.nodes)
+        self.tree_hash = playable_hash(tree, merkle_root(self.hashes))
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.cache_bytes = cache_bytes
+        self.cached_bytes = 0
+        self.hits = self.misses = 0
+        self.session_capacity = session_capacity
+        self._chunks = None
+        self._sessions = None
+
+    def _encode(self, value):
+        return self.dumps(value, "compact")
+
+    @property
+    def sessions(self):
+        """SessionStore over this tree, built on first use"""
+
+        if self._sessions is None:
+            from .engine import NarrativeEngine, SessionStore
+            self._sessions = SessionStore(NarrativeEngine(self.tree), self.session_capacity)
+        return self._sessions
+
+    def chunks(self):
+        """{label: [node index, ...]} from the path partition, computed once"""
+
+        if self._chunks is None:
+            self._chunks = {}
+            for i, label in enumerate(partition_narrative(self.graph)):
+                self._chunks.setdefault(label, []).append(i)
+        return self._chunks
+
+    def _node_index(self, node_id):
+        i = self.graph.index.get(node_id)
+        if i is None:
+            raise LookupError(f"no node {node_id!r}")
+        return i
+
+    def route_key(self, target):
+        """Cache key for a GET target: its decoded path parts, with ("nodes", start, end) for slices.
+
+        Slice ranges are clamped to the tree, so every spelling of the same
+        slice shares one entry. Unknown or repeated query parameters raise
+        ValueError.
+        """
+
+        path, _, query = target.partition("?")
+        parts = tuple(unquote(part) for part in path.strip("/").split("/"))
+        params = parse_qs(query, keep_blank_values=True) if query else {}
+        if parts != ("nodes",):
+            if params:
+                raise ValueError(f"/{'/'.join(parts)} takes no query parameters")
+            return parts
+        unknown = set(params) - _SLICE_PARAMS
+        if unknown:
+            raise ValueError(f"unknown slice parameters: {', '.join(sorted(unknown))}")
+        if any(len(values) > 1 for values in params.values()):
+            raise ValueError("slice parameters may be given once each")
+        start = int(params.get("start", ["0"])[0])
+        count = int(params.get("count", ["100"])[0])
+        if start < 0 or not 0 < count <= MAX_SLICE:
+            raise ValueError(f"slice needs start >= 0 and 0 < count <= {MAX_SLICE}")
+        total = len(self.graph)
+        start = min(start, total)
+        return ("nodes", start, min(start + count, total))
+
+    def _build(self, parts):
+        """(etag hex or None, value) for a route_key(); LookupError -> 404"""
+
+        nodes, hashes = self.graph.nodes, self.hashes
+
+        if parts == ("tree",):
+            return None, {key: value for key, value in self.tree.items() if key != "nodes"}
+        if len(parts) == 3 and parts[0] == "nodes" and isinstance(parts[1], int):
+            start, end = parts[1], parts[2]
+            return merkle_root(hashes[start:end]), {"start": start, "total": len(nodes), "nodes": nodes[start:end]}
+        if len(parts) == 2 and parts[0] == "nodes":
+            i = self._node_index(parts[1])
+            return hashes[i], nodes[i]
+        if len(parts) == 3 and parts[0] == "nodes" and parts[2] == "prefetch":
+            i = self._node_index(parts[1])
+            targets = list(dict.fromkeys(t for t in self.graph.successor_indices(i) if t != i))
+            return merkle_root([hashes[i]] + [hashes[t] for t in targets]), {"node": nodes[i], "next": [nodes[t] for t in targets]}
+        if parts == ("chunks",):
+            chunks = self.chunks()
+            listing = {label: {"nodes": len(members), "hash": merkle_root([hashes[i] for i in members])} for label, members in chunks.items()}
+            return merkle_root([entry["hash"] for entry in listing.values()]), {"tree_hash": self.tree_hash, "chunks": listing}
+        if len(parts) == 2 and parts[0] == "chunks":
+            members = self.chunks().get(parts[1])
+            if members is None:
+                raise LookupError(f"no chunk {parts[1]!r}")
+            return merkle_root([hashes[i] for i in members]), {"label": parts[1], "nodes": [nodes[i] for i in members]}
+        raise LookupError(f"no route for /{'/'.join(parts)}")
+
+    def resource(self, target):
+        """(etag, 200 head, body, 304 head) for a GET target, encoded once and cached by route_key()"""
+
+        key = self.route_key(target)
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        digest, value = self._build(key)
+        body = self._encode(value)
+        etag = b'"%s"' % (digest or hashlib.sha256(body).hexdigest()).encode("ascii")
+        entry = (etag, _head(200, length=len(body), etag=etag), body, _head(304, etag=etag))
+        size = len(entry[1]) + len(body) + len(entry[3])
+        if size > self.cache_bytes:
+            return entry
+        self.cache[key] = entry
+        self.cached_bytes += size
+        while len(self.cache) > self.cache_size or self.cached_bytes > self.cache_bytes:
+            _, (_, head, old_body, not_modified) = self.cache.popitem(last=False)
+            self.cached_bytes -= len(head) + len(old_body) + len(not_modified)
+        return entry
+
+    def _session_request(self, method, parts):
+        """(status, value) for the /sessions routes"""
+
+        store = self.sessions
+        if method == "POST" and len(parts) == 1:
+            session = store.create()
+            return 201, self._session_view(session)
+        session = store.get(parts[1]) if len(parts) >= 2 else None
+        if session is None:
+            raise LookupError("no such session")
+        if method == "GET" and len(parts) == 2:
+            return 200, self._session_view(session)
+        if method == "POST" and len(parts) == 4 and parts[2] == "choose":
+            result = store.engine.step(session, parts[3])
+            return (200 if result["ok"] else 409), result
+        raise LookupError("no such session route")
+
+    def _session_view(self, session):
+        engine = self.sessions.engine
+        return dict(engine.snapshot(session), status=engine.status(session), choices=engine.choices(session))
+
+    def handle(self, method, target, if_none_match=None):
+        """(status, etag or None, body bytes) for a request, independent of the transport"""
+
+        try:
+            if method in ("GET", "HEAD") and not target.startswith("/sessions"):
+                etag, _, body, _ = self.resource(target)
+                if _etag_matches(if_none_match, etag):
+                    return 304, etag, b""
+                return 200, etag, body
+            parts = [unquote(part) for part in target.partition("?")[0].strip("/").split("/")]
+            if parts[0] == "sessions" and method in ("GET", "POST"):
+                status, value = self._session_request(method, parts)
+                return status, None, self._encode(value)
+            if method not in ("GET", "HEAD", "POST"):
+                return 405, None, self._encode({"error": f"method {method} not allowed"})
+            raise LookupError(f"no route for {method} {target}")
+        except LookupError as exc:
+            return 404, None, self._encode({"error": str(exc)})
+        except ValueError as exc:
+            return 400, None, self._encode({"error": str(exc)})
+
+    def http_response(self, method, target, headers, keep_alive=True):
+        """Complete HTTP/1.1 response bytes; cached GETs are served from pre-built heads"""
+
+        connection = b"" if keep_alive else b"Connection: close\r\n"
+        if method == "GET" and not target.startswith("/sessions"):
+            try:
+                etag, head, body, not_modified = self.resource(target)
+            except (LookupError, ValueError):
+                pass  # fall through to handle() for the error body
+            else:
+                if _etag_matches(headers.get("if-none-match"), etag):
+                    return not_modified + connection + b"\r\n"
+                return head + connection + b"\r\n" + body
+        status, etag, body = self.handle(method, target, headers.get("if-none-match"))
+        if status == 304:
+            return _head(304, etag=etag) + connection + b"\r\n"
+        head = _head(status, length=len(body), etag=etag) + connection + b"\r\n"
+        return head if method == "HEAD" else head + body
+
+    def ws_message(self, data):
+        """Reply payload for one WebSocket text message"""
+
+        try:
+            request = json.loads(data)
+            rid = request.get("rid")
+            status, etag, body = self.handle(request.get("method", "GET"), request["path"], request.get("etag"))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return b'{"rid":null,"status":400,"body":{"error":"expected {\\"rid\\", \\"method\\", \\"path\\", \\"etag\\"}"}}'
+        reply = b'{"rid":' + self._encode(rid) + b',"status":%d' % status
+        if etag is not None:
+            reply += b',"etag":' + json.dumps(etag.decode("ascii")).encode("ascii")
+        return reply + (b',"body":' + body if body else b"") + b"}"
+
+def _unmask(payload, mask):
+    repeated = (mask * (len(payload) // 4 + 1))[:len(payload)]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(len(payload), "big")
+
+def ws_frame(payload, opcode=0x1, mask=None):
+    """One final WebSocket frame; clients pass a 4-byte mask, servers send unmasked"""
+
+    length = len(payload)
+    if length < 126:
+        header = bytes((0x80 | opcode, length | (0x80 if mask else 0)))
+    elif length < 1 << 16:
+        header = bytes((0x80 | opcode, 126 | (0x80 if mask else 0))) + length.to_bytes(2, "big")
+    else:
+        header = bytes((0x80 | opcode, 127 | (0x80 if mask else 0))) + length.to_bytes(8, "big")
+    if mask:
+        return header + mask + _unmask(payload, mask)
+    return header + payload
+
+class _Connection(asyncio.Protocol):
+    """One client connection: pipelined HTTP/1.1 requests, optionally upgraded to WebSocket"""
+
+    def __init__(self, service):
+        self.service = service
+        self.buffer = bytearray()
+        self.transport = None
+        self.websocket = False
+        self.fragments = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.buffer += data
+        if self.websocket:
+            self._ws_frames()
+        else:
+            self._http_requests()
+
+    def _fail(self, status):
+        body = self.service._encode({"error": _REASONS[status]})
+        self.transport.write(_head(status, length=len(body), extra=b"Connection: close\r\n") + b"\r\n" + body)
+        self.transport.close()
+        self.buffer.clear()
+
+    def _http_requests(self):
+        buffer = self.buffer
+        while buffer and not self.transport.is_closing():
+            end = buffer.find(b"\r\n\r\n")
+            if end < 0:
+                if len(buffer) > MAX_REQUEST_BYTES:
+                    self._fail(413)
+                return
+            lines = buffer[:end].decode("latin-1").split("\r\n")
+            request_line = lines[0].split(" ")
+            if len(request_line) != 3:
+                return self._fail(400)
+            method, target, version = request_line
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if "transfer-encoding" in headers:
+                return self._fail(400)
+            try:
+                length = int(headers.get("content-length") or 0)
+            except ValueError:
+                return self._fail(400)
+            if length > MAX_REQUEST_BYTES:
+                return self._fail(413)
+            if len(buffer) < end + 4 + length:
+                return
+            del buffer[:end + 4 + length]
+
+            if headers.get("upgrade", "").lower() == "websocket":
+                return self._upgrade(headers)
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+            self.transport.write(self.service.http_response(method, target, headers, keep_alive))
+            if not keep_alive:
+                self.transport.close()
+                return
+
+    def _upgrade(self, headers):
+        key = headers.get("sec-websocket-key")
+        if not key:
+            return self._fail(400)
+        accept = base64.b64encode(hashlib.sha1(key.encode("ascii") + _WS_GUID).digest())
+        self.transport.write(_head(101, extra=b"Upgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n") + b"\r\n")
+        self.websocket = True
+        self._ws_frames()
+
+    def _ws_frames(self):
+        buffer = self.buffer
+        while len(buffer) >= 2 and not self.transport.is_closing():
+            first, second = buffer[0], buffer[1]
+            length, at = second & 0x7F, 2
+            if length == 126:
+                if len(buffer) < 4:
+                    return
+                length, at = int.from_bytes(buffer[2:4], "big"), 4
+            elif length == 127:
+                if len(buffer) < 10:
+                    return
+                length, at = int.from_bytes(buffer[2:10], "big"), 10
+            if not second & 0x80 or length > MAX_REQUEST_BYTES:
+                return self._ws_close(1002 if not second & 0x80 else 1009)
+            if len(buffer) < at + 4 + length:
+                return
+            payload = _unmask(bytes(buffer[at + 4:at + 4 + length]), bytes(buffer[at:at + 4]))
+            del buffer[:at + 4 + length]
+
+            opcode = first & 0x0F
+            if opcode == 0x8:
+                return self._ws_close(1000)
+            if opcode == 0x9:
+                self.transport.write(ws_frame(payload, 0xA))
+                continue
+            if opcode == 0xA:
+                continue
+            if opcode in (0x1, 0x2):
+                self.fragments = [payload]
+            elif opcode == 0x0 and self.fragments is not None:
+                self.fragments.append(payload)
+            else:
+                return self._ws_close(1002)
+            if sum(map(len, self.fragments)) > MAX_REQUEST_BYTES:
+                return self._ws_close(1009)
+            if first & 0x80:
+                message, self.fragments = b"".join(self.fragments), None
+                self.transport.write(ws_frame(self.service.ws_message(message)))
+
+    def _ws_close(self, code):
+        self.transport.write(ws_frame(code.to_bytes(2, "big"), 0x8))
+        self.transport.close()
+        self.buffer.clear()
+
+async def start_server(service, host="127.0.0.1", port=8080):
+    """Listening asyncio server for a NarrativeService (port 0 picks a free port)"""
+
+    loop = asyncio.get_running_loop()
+    return await loop.create_server(lambda: _Connection(service), host, port)
+
+def serve(tree, host="127.0.0.1", port=8080, encoder=None):
+    """Serve a tree until interrupted"""
+
+    service = NarrativeService(tree, encoder)
+
+    async def main():
+        server = await start_server(service, host, port)
+        print(f"🛰️  Serving {len(service.graph)} nodes on http://{host}:{port} (tree {service.tree_hash[:12]})")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+class HTTPClient:
+    """Minimal keep-alive HTTP/1.1 client for local testing and load generation"""
+
+    def __init__(self, host="127.0.0.1", port=8080):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+        self.pending = deque()
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        return self
+
+    def send(self, method, target, headers=None):
+        """Queue a request without waiting, for pipelining; read replies with response()"""
+
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {self.host}:{self.port}", "Content-Length: 0"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        self.pending.append(method)
+
+    async def response(self):
+        """(status, headers, body) of the next response on the connection"""
+
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ")[1])
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        method = self.pending.popleft() if self.pending else "GET"
+        if method == "HEAD" or status in (101, 304):
+            return status, headers, b""
+        return status, headers, await self.reader.readexactly(int(headers.get("content-length") or 0))
+
+    async def request(self, method, target, headers=None):
+        self.send(method, target, headers)
+        return await self.response()
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+class WebSocketClient:
+    """Minimal WebSocket client for the /ws endpoint; request() sends one message and awaits its reply"""
+
+    def __init__(self, host="127.0.0.1", port=8080):
+        self.http = HTTPClient(host, port)
+        self._mask = b"\x12\x34\x56\x78"
+
+    async def connect(self):
+        await self.http.connect()
+        key = base64.b64encode(hashlib.sha256(b"atlas").digest()[:16]).decode("ascii")
+        self.http.send("GET", "/ws", {"Upgrade": "websocket", "Connection": "Upgrade", "Sec-WebSocket-Key": key, "Sec-WebSocket-Version": "13"})
+        status, _, _ = await self.http.response()
+        if status != 101:
+            raise ConnectionError(f"WebSocket upgrade refused with {status}")
+        return self
+
+    def send(self, payload):
+        self.http.writer.write(ws_frame(payload, 0x1, self._mask))
+
+    async def receive(self):
+        reader = self.http.reader
+        first, second = await reader.readexactly(2)
+        length = second & 0x7F
+        if length == 126:
+            length = int.from_bytes(await reader.readexactly(2), "big")
+        elif length == 127:
+            length = int.from_bytes(await reader.readexactly(8), "big")
+        payload = await reader.readexactly(length)
+        if first & 0x0F == 0x8:
+            raise ConnectionError("WebSocket closed by server")
+        return payload
+
+    async def request(self, path, method="GET", etag=None, rid=None):
+        self.send(json.dumps({"rid": rid, "method": method, "path": path, "etag": etag}).encode("utf-8"))
+        return json.loads(await self.receive())
+
+    async def close(self):
+        self.http.writer.write(ws_frame(b"\x03\xe8", 0x8, self._mask))
+        await self.http.close()
@@ -0,0 +1,166 @@
+# Monte Carlo playthrough simulator over a generated narrative tree (requires NumPy)
+import numpy as np
+
+from .flags import FlagRegistry
+from .graph import TARGET_RARITIES, NarrativeGraph
+
+def ending_rarity(node):
+    """Rarity tier from an ending's <rarity>_ending grant, or None"""
+
+    for flag in node.get("grants") or []:
+        if flag.endswith("_ending") and flag[:-len("_ending")] in TARGET_RARITIES:
+            return flag[:-len("_ending")]
+    return None
+
+class CompiledNarrative:
+    """Integer-array form of a tree for batched rollouts.
+
+    Choices are laid out CSR-style per node. A choice's require mask also holds
+    its target node's requires, so a gated node is never entered without them.
+    Masks only carry the registry's required flags (its lowest bits), since no
+    other flag can change which choices are available; they are uint64 words of
+    shape (..., words).
+    """
+
+    def __init__(self, tree):
+        graph = NarrativeGraph(tree)
+        self.ids = graph.ids
+        self.root = graph.index[graph.root_id]
+        self.start_tokens = int(tree.get("tokens", {}).get("chrono", {}).get("start", 0))
+
+        self.flags = FlagRegistry.from_tree(tree)
+        self.words = max(1, (self.flags.required_count + 63) // 64)
+
+        n_choices = len(graph.edge_targets)
+        self.choice_offsets = np.asarray(graph.edge_offsets, dtype=np.int64)
+        # One padding slot at the end so out-of-range gathers stay in bounds
+        self.choice_next = np.full(n_choices + 1, -1, dtype=np.int64)
+        self.choice_next[:n_choices] = np.asarray(graph.edge_targets, dtype=np.int64)
+        self.choice_cost = np.zeros(n_choices + 1, dtype=np.int64)
+        self.choice_grant = np.zeros((n_choices + 1, self.words), dtype=np.uint64)
+        self.choice_require = np.zeros((n_choices + 1, self.words), dtype=np.uint64)
+        self.node_grant = np.zeros((len(graph) + 1, self.words), dtype=np.uint64)
+
+        node_requires = [list(node.get("requires") or ()) for node in graph.nodes] + [[]]
+        e = 0
+        for i, node in enumerate(graph.nodes):
+            self.node_grant[i] = self.mask(node.get("grants"))
+            for choice in node.get("choices") or []:
+                self.choice_cost[e] = choice.get("cost", 0)
+                self.choice_grant[e] = self.mask(choice.get("grants"))
+                self.choice_require[e] = self.mask(list(choice.get("requires") or ()) + node_requires[graph.edge_targets[e]])
+                e += 1
+
+        degree = np.diff(self.choice_offsets)
+        self.max_degree = int(degree.max()) if len(degree) else 0
+        self.is_terminal = degree == 0
+        self.rarity = [ending_rarity(node) if degree[i] == 0 else None for i, node in enumerate(graph.nodes)]
+
+    def mask(self, flags):
+        """Bit mask (one uint64 per word) of the required-tracked flags in a list"""
+        state = self.flags.mask(flags) & self.flags.required_mask
+        return np.array(self.flags.words(state, self.words), dtype=np.uint64)
+
+def _rollout_batch(compiled, size, rng, max_steps):
+    """Play size random playthroughs in lockstep; returns (final node, outcome code) arrays"""
+
+    c = compiled
+    node = np.full(size, c.root, dtype=np.int64)
+    tokens = np.full(size, c.start_tokens, dtype=np.int64)
+    flags = np.repeat(c.node_grant[c.root][None, :], size, axis=0)
+    # 0 = running, 1 = reached a terminal node, 2 = stuck, 3 = dangling next_id, 4 = out of steps
+    outcome = np.zeros(size, dtype=np.int8)
+    slots = np.arange(max(c.max_degree, 1))
+
+    for _ in range(max_steps):
+        active = np.flatnonzero(outcome == 0)
+        if not len(active):
+            break
+        at = node[active]
+        done = c.is_terminal[at]
+        outcome[active[done]] = 1
+        active, at = active[~done], at[~done]
+        if not len(active):
+            break
+
+        start = c.choice_offsets[at]
+        degree = c.choice_offsets[at + 1] - start
+        in_range = slots[None, :] < degree[:, None]
+        candidates = np.where(in_range, start[:, None] + slots[None, :], len(c.choice_next) - 1)
+        required = c.choice_require[candidates]
+        available = (in_range
+                     & (c.choice_cost[candidates] <= tokens[active][:, None])
+                     & ((flags[active][:, None, :] & required) == required).all(axis=-1))
+
+        n_available = available.sum(axis=1)
+        stuck = n_available == 0
+        outcome[active[stuck]] = 2
+        keep = ~stuck
+        active, available, candidates, n_available = active[keep], available[keep], candidates[keep], n_available[keep]
+        if not len(active):
+            continue
+
+        # Uniform pick among the available choices of each playthrough
+        pick = (rng.random(len(active)) * n_available).astype(np.int64)
+        column = (np.cumsum(available, axis=1) > pick[:, None]).argmax(axis=1)
+        chosen = candidates[np.arange(len(active)), column]
+        target = c.choice_next[chosen]
+
+        dangling = target < 0
+        outcome[active[dangling]] = 3
+        active, chosen, target = active[~dangling], chosen[~dangling], target[~dangling]
+
+        tokens[active] -= c.choice_cost[chosen]
+        flags[active] |= c.choice_grant[chosen] | c.node_grant[target]
+        node[active] = target
+
+    outcome[outcome == 0] = 4
+    return node, outcome
+
+def simulate_playthroughs(tree_or_compiled, runs=1_000_000, batch_size=100_000, max_steps=500, seed=None):
+    """Run random playthroughs in batches and report observed ending frequencies.
+
+    Each step picks uniformly among the choices whose requires (and whose target
+    node's requires) are held and whose cost fits the remaining chrono tokens,
+    mirroring the front end.
+    """
+
+    compiled = tree_or_compiled if isinstance(tree_or_compiled, CompiledNarrative) else CompiledNarrative(tree_or_compiled)
+    rng = np.random.default_rng(seed)
+    n = len(compiled.ids)
+    terminal_counts = np.zeros(n, dtype=np.int64)
+    stuck_counts = np.zeros(n, dtype=np.int64)
+    dangling = timeouts = 0
+
+    remaining = runs
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        node, outcome = _rollout_batch(compiled, size, rng, max_steps)
+        terminal_counts += np.bincount(node[outcome == 1], minlength=n)
+        stuck_counts += np.bincount(node[outcome == 2], minlength=n)
+        dangling += int((outcome == 3).sum())
+        timeouts += int((outcome == 4).sum())
+        remaining -= size
+
+    completed = int(terminal_counts.sum())
+    endings = {compiled.ids[i]: int(terminal_counts[i]) for i in np.flatnonzero(terminal_counts)}
+    rarity_counts = {rarity: 0 for rarity in TARGET_RARITIES}
+    for i in np.flatnonzero(terminal_counts):
+        if compiled.rarity[i] is not None:
+            rarity_counts[compiled.rarity[i]] += int(terminal_counts[i])
+
+    return {
+        "runs": runs,
+        "completed": completed,
+        "stuck": {compiled.ids[i]: int(stuck_counts[i]) for i in np.flatnonzero(stuck_counts)},
+        "dangling": dangling,
+        "timeouts": timeouts,
+        "endings": dict(sorted(endings.items(), key=lambda item: -item[1])),
+        "rarity": {
+            rarity: {
+                "target": target,
+                "observed": rarity_counts[rarity] / completed if completed else 0.0
+            }
+            for rarity, target in TARGET_RARITIES.items()
+        }
+    }
@@ -0,0 +1,175 @@
+# Optional string-table output: repeated strings and cinematics are stored once and referenced by index
+#
+# A packed tree is the plain tree plus a top-level "string_table" entry:
+#   {"version": 1, "strings": [...], "cinematics": [...]}
+# In packed nodes every string field (id, title, body_md, choice id/label/next_id
+# and grants/requires flags) holds one of
+#   "text"            the string itself, inline
+#   7                 strings[7]
+#   [3, 12, 4]        the template strings[3], a list of literal pieces, with the
+#                     numbers 12 and 4 written between them
+# and "cinematic" holds either the cue itself or an index into cinematics.
+#
+# app/components/narrative-string-table.ts is the front end's copy of the expander;
+# keep the two in step when the format changes.
+import json
+import re
+from collections import Counter, defaultdict
+
+STRING_TABLE_KEY = "string_table"
+STRING_TABLE_VERSION = 1
+
+# Digit runs lifted into template arguments; capped at 15 digits so JavaScript reads them exactly
+_NUMBER = re.compile(r"0|[1-9][0-9]{0,14}")
+
+# A template must keep at least this much literal text to beat writing the string inline
+MIN_TEMPLATE_TEXT = 4
+
+_NODE_STRINGS = ("id", "title", "body_md")
+_CHOICE_STRINGS = ("id", "label", "next_id")
+_FLAG_LISTS = ("grants", "requires")
+
+def _node_strings(node):
+    """Every string a packed node may reference, in field order"""
+
+    for key in _NODE_STRINGS:
+        yield node.get(key)
+    for choice in node.get("choices") or ():
+        for key in _CHOICE_STRINGS:
+            yield choice.get(key)
+        for key in _FLAG_LISTS:
+            yield from choice.get(key) or ()
+    for key in _FLAG_LISTS:
+        yield from node.get(key) or ()
+
+def _plan_table(nodes, min_count):
+    """(strings table, string -> reference) for the strings worth sharing"""
+
+    counts = Counter(s for node in nodes for s in _node_strings(node) if isinstance(s, str))
+    shapes = defaultdict(list)
+    for s, count in counts.items():
+        if count < min_count and _NUMBER.search(s):
+            pieces = tuple(_NUMBER.split(s))
+            if sum(map(len, pieces)) >= MIN_TEMPLATE_TEXT:
+                shapes[pieces].append(s)
+
+    # (uses, entry, strings it serves); the most used entries get the shortest indices
+    entries = [(count, s, (s,)) for s, count in counts.items() if count >= min_count]
+    entries += [(sum(counts[s] for s in members), list(pieces), members)
+                for pieces, members in shapes.items() if len(members) >= min_count]
+    entries.sort(key=lambda entry: -entry[0])
+
+    strings, refs = [], {}
+    for index, (_, entry, members) in enumerate(entries):
+        strings.append(entry)
+        for s in members:
+            refs[s] = index if isinstance(entry, str) else [index, *map(int, _NUMBER.findall(s))]
+    return strings, refs
+
+def pack_string_table(tree, min_count=2):
+    """Copy of tree whose node strings and cinematics are shared through a string table.
+
+    Strings used at least min_count times go into the table whole; strings that
+    differ only in their numbers (transition_node_7, "Analysis Junction 12", ...)
+    share one template when min_count of them exist. Everything else stays inline.
+    """
+
+    nodes = tree.get("nodes") or []
+    strings, refs = _plan_table(nodes, min_count)
+
+    cue_counts = Counter(json.dumps(node["cinematic"]) for node in nodes if node.get("cinematic") is not None)
+    cinematics, cue_refs = [], {}
+    for cue, count in cue_counts.most_common():
+        if count >= min_count:
+            cue_refs[cue] = len(cinematics)
+            cinematics.append(json.loads(cue))
+
+    def ref(value):
+        return refs.get(value, value) if isinstance(value, str) else value
+
+    def pack_fields(item, string_keys):
+        packed = dict(item)
+        for key in string_keys:
+            if key in packed:
+                packed[key] = ref(packed[key])
+        for key in _FLAG_LISTS:
+            if packed.get(key) is not None:
+                packed[key] = [ref(flag) for flag in packed[key]]
+        return packed
+
+    packed_nodes = []
+    for node in nodes:
+        packed = pack_fields(node, _NODE_STRINGS)
+        if "choices" in node:
+            packed["choices"] = [pack_fields(choice, _CHOICE_STRINGS) for choice in node["choices"]]
+        if node.get("cinematic") is not None:
+            packed["cinematic"] = cue_refs.get(json.dumps(node["cinematic"]), node["cinematic"])
+        packed_nodes.append(packed)
+
+    packed_tree = dict(tree, nodes=packed_nodes)
+    packed_tree[STRING_TABLE_KEY] = {"version": STRING_TABLE_VERSION, "strings": strings, "cinematics": cinematics}
+    return packed_tree
+
+class StringTable:
+    """Resolves packed references, expanding each template only when a node needs it"""
+
+    def __init__(self, table):
+        if table.get("version") != STRING_TABLE_VERSION:
+            raise ValueError(f"unsupported string table version {table.get('version')!r}")
+        self.strings = table["strings"]
+        self.cinematics = table.get("cinematics", [])
+
+    def string(self, ref):
+        """The string a packed field value refers to"""
+
+        if isinstance(ref, str):
+            return ref
+        if isinstance(ref, int):
+            return self.strings[ref]
+        pieces, args = self.strings[ref[0]], ref[1:]
+        if len(pieces) != len(args) + 1:
+            raise ValueError(f"template {ref[0]} takes {len(pieces) - 1} numbers, got {len(args)}")
+        out = [pieces[0]]
+        for arg, piece in zip(args, pieces[1:]):
+            out.append(str(arg))
+            out.append(piece)
+        return "".join(out)
+
+    def _fields(self, item, string_keys):
+        expanded = dict(item)
+        for key in string_keys:
+            if key in expanded:
+                expanded[key] = self.string(expanded[key])
+        for key in _FLAG_LISTS:
+            if expanded.get(key) is not None:
+                expanded[key] = [self.string(flag) for flag in expanded[key]]
+        return expanded
+
+    def node(self, packed):
+        """Plain node dict for one packed node"""
+
+        node = self._fields(packed, _NODE_STRINGS)
+        if "choices" in packed:
+            node["choices"] = [self._fields(choice, _CHOICE_STRINGS) for choice in packed["choices"]]
+        if isinstance(packed.get("cinematic"), int):
+            node["cinematic"] = dict(self.cinematics[packed["cinematic"]])
+        return node
+
+def is_packed(tree):
+    return STRING_TABLE_KEY in tree
+
+def iter_unpacked_nodes(packed_tree):
+    """Plain node dicts of a packed tree, expanded one at a time"""
+
+    table = StringTable(packed_tree[STRING_TABLE_KEY])
+    for packed in packed_tree["nodes"]:
+        yield table.node(packed)
+
+def unpack_string_table(packed_tree):
+    """The plain tree a packed tree was made from (plain trees are returned unchanged)"""
+
+    if not is_packed(packed_tree):
+        return packed_tree
+    tree = {key: value for key, value in packed_tree.items() if key != STRING_TABLE_KEY}
+    tree["nodes"] = list(iter_unpacked_nodes(packed_tree))
+    return tree
@@ -0,0 +1,318 @@
+# Seeded procedural synthesizer for large trees (10k-1M nodes) built from the hand-written section patterns
+#
+# The tree is a root briefing followed by a chain of episodes. Each episode is
+# generated and yielded on its own, so memory stays bounded by one episode:
+#   hub          episode_<e>_briefing: a path_* choice into every path, and the next episode's hub
+#   paths        <path>_path_entry_<e>, then beats until the path's ending node:
+#                  skill triads (skill_*, confirmation, fatal_* with a retry back to the skill)
+#                  findings (story nodes)
+#   golden path  golden_path_checkpoint_<e>_<k>, each advance gated on the previous one's flag,
+#                then golden_path_final_<e> and a legendary ending
+#   endings      ending_<e>_<path> with a <rarity>_ending grant drawn from graph.TARGET_RARITIES
+# Every next_id resolves and every node is reachable from the root. Knobs:
+#   branching      mean choices per finding/confirmation (extra choices skip ahead on the path)
+#   cycle_density  share of findings and confirmations that also link back to an earlier beat (revisit loops)
+#   flag_density   share of extra choices that grant a path flag, and of those that require one
+import random
+
+from .generator import atlas_narrative_header
+from .graph import TARGET_RARITIES
+from .templates import cinematic, flag_list
+
+# Paths every episode branches into, in hub order
+PATHS = ("scientific", "anomaly", "geopolitical", "intervention")
+
+# Nodes per episode before the remainder is spread over them
+EPISODE_NODES = 240
+
+# Hub, golden path (4 checkpoints + final + ending) and an entry and ending per path
+MIN_EPISODE_NODES = 1 + 6 + 2 * len(PATHS)
+
+# Share of path beats (when at least 3 nodes remain) that are skill triads
+SKILL_SHARE = 0.35
+
+# Meta counts the synthesizer tallies while it runs
+META_COUNTS = ("endings", "golden_path_nodes", "skill_checks", "branching_points")
+
+# Flag names drawn per path; a bounded pool keeps the flag registry small at any size
+FLAGS_PER_PATH = 32
+
+_FINDINGS = (
+    "Spectral returns from 3I/ATLAS show {detail}. The team logs the result and weighs the next step.",
+    "Observation window {n} closes with new data: {detail}. Analysts debate what it implies.",
+    "A reprocessing pass over archived frames reveals {detail}. The finding shifts priorities.",
+    "Cross-checking with partner observatories confirms {detail}. The path forward narrows."
+)
+_DETAILS = (
+    "an unexpected CO2 to H2O ratio",
+    "a periodic brightness modulation",
+    "dust grains larger than models predict",
+    "a faint non-gravitational acceleration",
+    "nickel vapour without matching iron",
+    "a coma asymmetry facing the Sun",
+    "polarisation unlike solar system comets",
+    "a rotation period near sixteen hours"
+)
+
+def _ending_rarity(rng):
+    roll = rng.random()
+    for rarity, share in TARGET_RARITIES.items():
+        roll -= share
+        if roll < 0:
+            return rarity
+    return "common"
+
+def _episode_budgets(total_nodes):
+    """Node count per episode, summing to total_nodes minus the root"""
+
+    body = total_nodes - 1
+    episodes = max(1, body // EPISODE_NODES)
+    if body < MIN_EPISODE_NODES:
+        raise ValueError(f"synthetic trees need at least {MIN_EPISODE_NODES + 1} nodes, got {total_nodes}")
+    share, extra = divmod(body, episodes)
+    return [share + (e < extra) for e in range(episodes)]
+
+class _Episode:
+    """Builds one episode's nodes in tree order and tallies the counts meta reports"""
+
+    def __init__(self, e, budget, last, rng, branching, cycle_density, flag_density, counts):
+        self.e = e
+        self.rng = rng
+        self.branching = branching
+        self.cycle_density = cycle_density
+        self.flag_density = flag_density
+        self.counts = counts
+        self.nodes = []
+
+        golden = f"golden_path_checkpoint_{e}_1"
+        hub_choices = [
+            {"id": f"investigate_{path}", "label": f"Open the {path} investigation", "next_id": f"{path}_path_entry_{e}",
+             "grants": flag_list([f"path_{path}"])}
+            for path in PATHS
+        ]
+        if not last:
+            hub_choices.append({"id": "next_observation_cycle", "label": "Begin the next observation cycle",
+                                "next_id": f"episode_{e + 1}_briefing"})
+        self._add({
+            "id": f"episode_{e}_briefing",
+            "title": f"Observation Cycle {e}",
+            "body_md": f"**CYCLE {e} BRIEFING**: New data on 3I/ATLAS is in. Choose which investigation to pursue.",
+            "choices": hub_choices,
+            "cinematic": cinematic("mission_start", "default")
+        })
+
+        spare = budget - MIN_EPISODE_NODES
+        for p, path in enumerate(PATHS):
+            self._path(path, spare // len(PATHS) + (p < spare % len(PATHS)), golden)
+        self._golden()
+
+    def _add(self, node):
+        targets = {choice["next_id"] for choice in node["choices"]}
+        self.counts["branching_points"] += len(targets) > 1
+        self.nodes.append(node)
+
+    def _plan(self, budget):
+        """Beat kinds ("skill" or "finding") filling budget nodes exactly"""
+
+        beats = []
+        while budget:
+            if budget >= 3 and self.rng.random() < SKILL_SHARE:
+                beats.append("skill")
+                budget -= 3
+            else:
+                beats.append("finding")
+                budget -= 1
+        return beats
+
+    def _extra_choices(self, path, k, anchors, granted, taken):
+        """Skip-ahead, revisit and flag-gated choices for beat k of a path"""
+
+        rng = self.rng
+        choices = []
+        extra = int(self.branching - 1)
+        if rng.random() < self.branching - 1 - extra:
+            extra += 1
+        ahead = anchors[k + 2:]
+        for j in range(min(extra, len(ahead))):
+            target = ahead[rng.randrange(len(ahead))]
+            if target in taken:
+                continue
+            taken.add(target)
+            built = {"id": f"skip_ahead_{j + 1}", "label": "Follow a hunch further down the line", "next_id": target}
+            if rng.random() < self.flag_density:
+                flag = f"{path}_insight_{rng.randrange(FLAGS_PER_PATH)}"
+                built["grants"] = flag_list([flag])
+                granted.append(flag)
+            elif granted and rng.random() < self.flag_density:
+                built["requires"] = flag_list([granted[rng.randrange(len(granted))]])
+                built["cost"] = 1
+            choices.append(built)
+        if k and rng.random() < self.cycle_density:
+            target = anchors[rng.randrange(k)]
+            if target not in taken:
+                taken.add(target)
+                choices.append({"id": "revisit", "label": "Revisit earlier findings", "next_id": target})
+        return choices
+
+    def _path(self, path, budget, golden):
+        e, rng = self.e, self.rng
+        beats = self._plan(budget)
+        ending = f"ending_{e}_{path}"
+        # First node of each beat, then the ending: what mainline and skip-ahead choices lead to
+        anchors = [f"skill_{e}_{path}_{k}" if kind == "skill" else f"{path}_finding_{e}_{k}" for k, kind in enumerate(beats)] + [ending]
+        granted = []
+
+        self._add({
+            "id": f"{path}_path_entry_{e}",
+            "title": f"{path.capitalize()} Investigation {e}",
+            "body_md": f"**{path.upper()} PATH**: Cycle {e} opens a {path} line of inquiry into 3I/ATLAS.",
+            "choices": [{"id": "begin", "label": "Begin the investigation", "next_id": anchors[0]}]
+        })
+        for k, kind in enumerate(beats):
+            mainline = {"id": "continue", "label": "Continue the analysis", "next_id": anchors[k + 1]}
+            taken = {anchors[k + 1]}
+            if k == len(beats) - 1 and path == PATHS[0]:
+                taken.add(golden)
+            if kind == "finding":
+                choices = [mainline] + self._extra_choices(path, k, anchors, granted, taken)
+                if golden in taken:
+                    choices.append({"id": "pursue_golden_path", "label": "Pursue the signal to its source", "next_id": golden})
+                self._add({
+                    "id": anchors[k],
+                    "title": f"{path.capitalize()} Finding {e}.{k + 1}",
+                    "body_md": rng.choice(_FINDINGS).format(n=k + 1, detail=rng.choice(_DETAILS)),
+                    "choices": choices
+                })
+                continue
+
+            skill, confirmed, fatal = anchors[k], f"{path}_confirmed_{e}_{k}", f"fatal_{e}_{path}_{k}"
+            detail = rng.choice(_DETAILS)
+            incorrect = 1 + (rng.random() < 0.5)
+            self._add({
+                "id": skill,
+                "title": f"{path.capitalize()} Skill Check {e}.{k + 1}",
+                "body_md": f"**SKILL CHECK**: Which explanation best fits {detail}?",
+                "choices": [{"id": "correct", "label": "The interstellar-origin explanation", "next_id": confirmed,
+                             "grants": flag_list([f"skill_{path}"])}]
+                           + [{"id": f"incorrect_{j + 1}", "label": f"Alternative explanation {j + 1}", "next_id": fatal, "cost": 1}
+                              for j in range(incorrect)]
+            })
+            self.counts["skill_checks"] += 1
+            choices = [mainline] + self._extra_choices(path, k, anchors, granted, taken)
+            if golden in taken:
+                choices.append({"id": "pursue_golden_path", "label": "Pursue the signal to its source", "next_id": golden})
+            self._add({
+                "id": confirmed,
+                "title": f"{path.capitalize()} Analysis Confirmed {e}.{k + 1}",
+                "body_md": f"Correct. {detail.capitalize()} is consistent with an origin beyond the solar system.",
+                "choices": choices
+            })
+            self._add({
+                "id": fatal,
+                "title": f"{path.capitalize()} Analysis Error {e}.{k + 1}",
+                "body_md": f"**INCORRECT**: That explanation does not account for {detail}.",
+                "choices": [{"id": "retry", "label": "Review the data", "next_id": skill}],
+                "cinematic": cinematic("error_state", fx=("shake",))
+            })
+
+        rarity = _ending_rarity(rng)
+        self._ending(ending, f"{path.capitalize()} Outcome {e}", rarity)
+        if not beats and path == PATHS[0]:
+            # No beat to hang the golden path on: the entry leads there too
+            self.nodes[-2]["choices"].append({"id": "pursue_golden_path", "label": "Pursue the signal to its source", "next_id": golden})
+            self.counts["branching_points"] += 1
+
+    def _ending(self, ending_id, title, rarity):
+        self._add({
+            "id": ending_id,
+            "title": f"OUTCOME: {title}",
+            "body_md": f"**{rarity.upper()} OUTCOME**: The cycle's findings on 3I/ATLAS are archived for the next generation of analysts.",
+            "choices": [],
+            "grants": flag_list([f"{rarity}_ending"]),
+            "cinematic": cinematic(f"ending_{rarity}")
+        })
+        self.counts["endings"] += 1
+
+    def _golden(self):
+        e = self.e
+        for k in range(1, 5):
+            advance = {"id": "advance", "label": "Press on toward the source", "next_id": f"golden_path_checkpoint_{e}_{k + 1}" if k < 4 else f"golden_path_final_{e}",
+                       "grants": flag_list([f"golden_path_{k}"])}
+            if k > 1:
+                advance["requires"] = flag_list([f"golden_path_{k - 1}"])
+            self._add({
+                "id": f"golden_path_checkpoint_{e}_{k}",
+                "title": f"Golden Path Checkpoint {e}.{k}",
+                "body_md": f"**CHECKPOINT {k}**: The evidence converges. Each step closer demands everything learned so far.",
+                "choices": [advance, {"id": "step_back", "label": "Step back and report", "next_id": f"ending_{e}_{PATHS[k % len(PATHS)]}"}],
+                "cinematic": cinematic("golden_path", "orbit")
+            })
+        self._add({
+            "id": f"golden_path_final_{e}",
+            "title": f"Golden Path Revelation {e}",
+            "body_md": "**REVELATION**: Every thread of the investigation meets at a single answer.",
+            "choices": [{"id": "reveal", "label": "Face the answer", "next_id": f"ending_{e}_golden", "requires": flag_list(["golden_path_4"])}],
+            "cinematic": cinematic("golden_path", "orbit", ("glow",))
+        })
+        self.counts["golden_path_nodes"] += 5
+        self._ending(f"ending_{e}_golden", f"Revelation {e}", "legendary")
+
+def iter_synthetic_nodes(total_nodes, seed=0, branching=2.0, cycle_density=0.05, flag_density=0.3, counts=None):
+    """Yield exactly total_nodes synthetic nodes in tree order, one episode in memory at a time.
+
+    counts, when given, is a dict whose endings, golden_path_nodes, skill_checks and
+    branching_points are filled in as the nodes are produced.
+    """
+
+    if branching < 1:
+        raise ValueError(f"branching must be at least 1, got {branching}")
+    counts = {} if counts is None else counts
+    counts.update(dict.fromkeys(META_COUNTS, 0))
+    rng = random.Random(seed)
+    yield {
+        "id": "mission_briefing",
+        "title": "Mission Briefing",
+        "body_md": "**ATLAS DIRECTIVE - SYNTHETIC SCALE TREE**: You are Analyst ALT-7. Work through every observation cycle of 3I/ATLAS.",
+        "choices": [{"id": "begin_mission", "label": "Begin the first observation cycle", "next_id": "episode_1_briefing", "grants": flag_list(["mission_started"])}],
+        "cinematic": cinematic("mission_start", "default")
+    }
+    budgets = _episode_budgets(total_nodes)
+    for e, budget in enumerate(budgets, 1):
+        yield from _Episode(e, budget, e == len(budgets), rng, branching, cycle_density, flag_density, counts).nodes
+
+def synthetic_header(seed=0, branching=2.0, cycle_density=0.05, flag_density=0.3, chrono_start=3):
+    """The usual tree envelope plus meta.synthetic recording the synthesizer settings"""
+
+    header = atlas_narrative_header(chrono_start)
+    header["meta"]["description"] = "Procedurally synthesized 3I/ATLAS narrative for scale testing"
+    header["meta"]["synthetic"] = {"seed": seed, "branching": branching, "cycle_density": cycle_density, "flag_density": flag_density}
+    return header
+
+def synthesize_tree(total_nodes, seed=0, branching=2.0, cycle_density=0.05, flag_density=0.3):
+    """Materialized synthetic tree with meta counts, meta.structure and meta.content stamped"""
+
+    from .merkle import stamp_content
+    from .metrics import stamp_structure
+
+    tree = synthetic_header(seed, branching, cycle_density, flag_density)
+    tree["nodes"] = list(iter_synthetic_nodes(total_nodes, seed, branching, cycle_density, flag_density))
+    tree["meta"]["total_nodes"] = len(tree["nodes"])
+    stamp_structure(tree)
+    return stamp_content(tree)
+
+def write_synthetic_tree(path, total_nodes, seed=0, branching=2.0, cycle_density=0.05, flag_density=0.3, indent=2):
+    """Stream a synthetic tree to path without holding it in memory, returning the meta counts.
+
+    The headline meta counts are patched in once the nodes are written;
+    meta.structure and meta.content need the whole graph, so only
+    synthesize_tree() stamps them.
+    """
+
+    from .generator import write_atlas_narrative_stream
+
+    counts = dict.fromkeys(META_COUNTS, 0)
+    nodes = iter_synthetic_nodes(total_nodes, seed, branching, cycle_density, flag_density, counts)
+    header = synthetic_header(seed, branching, cycle_density, flag_density)
+    with open(path, "w", encoding="utf-8") as fh:
+        counts["total_nodes"] = write_atlas_narrative_stream(fh, nodes=nodes, header=header, indent=indent, late_meta=counts)
+    return counts
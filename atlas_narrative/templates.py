@@ -0,0 +1,163 @@
+# Declarative node templates: expand compact spec rows into narrative nodes in bulk
+#
+# Expanded nodes share cinematic dicts and grants/requires lists with every other
+# node built from the same values, so template output is read-only: deep-copy a
+# node before editing it. clear_interned() drops the shared tables.
+import sys
+from string import Formatter
+
+# Shared instances, keyed by their defining tuple
+_FLAG_LISTS = {}
+_CINEMATICS = {}
+_CHOICES = {}
+
+# Compiled i/n templates, keyed by their format string
+_RENDERERS = {}
+
+def flag_list(names):
+    """One shared list per distinct sequence of flag names"""
+
+    key = tuple(names)
+    shared = _FLAG_LISTS.get(key)
+    if shared is None:
+        shared = _FLAG_LISTS[key] = [sys.intern(name) for name in key]
+    return shared
+
+def cinematic(animation_key, view=None, fx=()):
+    """One shared cinematic dict per (animation_key, view, fx flags); fx names map to True"""
+
+    key = (animation_key, view, tuple(fx))
+    shared = _CINEMATICS.get(key)
+    if shared is None:
+        shared = {"animation_key": animation_key}
+        if view is not None:
+            shared["view"] = view
+        if fx:
+            shared["fx"] = dict.fromkeys(fx, True)
+        _CINEMATICS[key] = shared
+    return shared
+
+def clear_interned():
+    """Forget shared flag lists, cinematics and choices (nodes already built keep theirs)"""
+
+    _FLAG_LISTS.clear()
+    _CINEMATICS.clear()
+    _CHOICES.clear()
+
+def choice(choice_id, label, next_id, grants=None, requires=None, cost=None):
+    """Choice dict from a (choice_id, label, next_id[, grants[, requires[, cost]]]) row"""
+
+    built = {"id": choice_id, "label": label, "next_id": next_id}
+    if grants is not None:
+        built["grants"] = flag_list(grants)
+    if requires is not None:
+        built["requires"] = flag_list(requires)
+    if cost is not None:
+        built["cost"] = cost
+    return built
+
+def shared_choice(row):
+    """One shared choice dict per distinct choice() row tuple"""
+
+    shared = _CHOICES.get(row)
+    if shared is None:
+        shared = _CHOICES[row] = choice(*row)
+    return shared
+
+def story_node(node_id, title, body_md, choices, cinematic=None):
+    """Plain node; choices are choice() rows, expanded to shared choice dicts"""
+
+    built = {"id": node_id, "title": title, "body_md": body_md, "choices": [shared_choice(row) for row in choices]}
+    if cinematic is not None:
+        built["cinematic"] = cinematic
+    return built
+
+def skill_check_triads(rows):
+    """Expand skill check rows into question, confirmation and retry nodes.
+
+    Row: (skill_id, title, question, correct, incorrect, confirmed, fatal) where
+      correct   = (choice_id, label, next_id, grants)
+      incorrect = [(choice_id, label), ...], each costing 1 token and leading to the fatal node
+      confirmed = (node_id, title, body_md, choices) or None when correct leads elsewhere
+      fatal     = (node_id, title, body_md, (retry_id, retry_label), cinematic or None)
+    """
+
+    for skill_id, title, question, correct, incorrect, confirmed, fatal in rows:
+        fatal_id, fatal_title, fatal_body, retry, fatal_cinematic = fatal
+        choices = [correct] + [(choice_id, label, fatal_id, None, None, 1) for choice_id, label in incorrect]
+        yield story_node(skill_id, title, question, choices)
+        if confirmed is not None:
+            yield story_node(*confirmed)
+        yield story_node(fatal_id, fatal_title, fatal_body, [retry + (skill_id,)], fatal_cinematic)
+
+def ending_nodes(rows, ending_ids=None):
+    """Expand (ending_id, title, body_md, grants, cinematic) rows into terminal nodes.
+
+    Endings not in ending_ids are skipped when it is given; a missing cinematic
+    defaults to the ending id without its "ending_" prefix.
+    """
+
+    for ending_id, title, body_md, grants, ending_cinematic in rows:
+        if ending_ids is not None and ending_id not in ending_ids:
+            continue
+        yield {
+            "id": ending_id,
+            "title": f"OUTCOME: {title}",
+            "body_md": body_md,
+            "choices": [],  # Terminal nodes
+            "grants": flag_list(grants),
+            "cinematic": ending_cinematic or cinematic(ending_id.replace("ending_", ""))
+        }
+
+def compile_template(template):
+    """Compile a format string over i and n into an (i, n) -> str function.
+
+    Only {i} and {n} fields with a literal format spec are allowed; the
+    template is rendered with str.format, never evaluated as code.
+    """
+
+    render = _RENDERERS.get(template)
+    if render is not None:
+        return render
+    for _, field, spec, conversion in Formatter().parse(template):
+        if field is None:
+            continue
+        if field not in ("i", "n") or conversion or "{" in spec:
+            raise ValueError(f"template fields must be {{i}} or {{n}} with a literal format spec: {template!r}")
+    render = _RENDERERS[template] = lambda i, n: template.format(i=i, n=n)
+    return render
+
+def bridge_chain(count, node_id, title, body_md, links):
+    """Expand a chain of count procedural nodes that feed forward into each other.
+
+    node_id, title and body_md are templates over i (0-based) and n (1-based).
+    Each link is (choice_id, label, step, exit_after, exit_id, grants): the choice
+    leads step nodes ahead, or to exit_id once i > exit_after; choice_id and
+    grants (a template or None) are rendered like the node fields. Every node's
+    choices and grants are unique, so nothing here is shared.
+    """
+
+    render_id, render_title, render_body = (compile_template(t) for t in (node_id, title, body_md))
+    links = [(compile_template(choice_id), label, step, exit_after, exit_id, grants and compile_template(grants))
+             for choice_id, label, step, exit_after, exit_id, grants in links]
+    reach = max((step for _, _, step, _, _, _ in links), default=0)
+    ids = [render_id(i, i + 1) for i in range(count + reach)]
+    for i in range(count):
+        n = i + 1
+        choices = []
+        for render_choice, label, step, exit_after, exit_id, render_grant in links:
+            built = {"id": render_choice(i, n), "label": label, "next_id": exit_id if i > exit_after else ids[i + step]}
+            if render_grant is not None:
+                built["grants"] = [render_grant(i, n)]
+            choices.append(built)
+        yield {"id": ids[i], "title": render_title(i, n), "body_md": render_body(i, n), "choices": choices}
+
+def golden_checkpoints(rows):
+    """Expand (node_id, title, body_md, advance, alternative, cinematic) rows into golden path nodes.
+
+    advance is the gated choice row (choice_id, label, next_id, grants, requires);
+    alternative is the ungated (choice_id, label, next_id, grants) exit.
+    """
+
+    for node_id, title, body_md, advance, alternative, node_cinematic in rows:
+        yield story_node(node_id, title, body_md, [advance, alternative], node_cinematic)
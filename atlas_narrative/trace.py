@@ -0,0 +1,129 @@
+# Opt-in timing and allocation spans written as a Chrome trace (chrome://tracing, Perfetto)
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+# The active Tracer, or None; span() is a single global check when tracing is off
+_tracer = None
+
+class _NullSpan:
+    """Shared no-op span handed out while tracing is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class Span:
+    """One complete ("X") trace event: wall time plus net bytes allocated while open"""
+
+    __slots__ = ("tracer", "name", "cat", "args", "started", "memory")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.memory = tracemalloc.get_traced_memory()[0] if self.tracer.memory else None
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        ended = time.perf_counter_ns()
+        if self.memory is not None:
+            current = tracemalloc.get_traced_memory()[0]
+            self.args["alloc_bytes"] = current - self.memory
+            self.args["traced_bytes"] = current
+        self.tracer.events.append({
+            "name": self.name,
+            "cat": self.cat,
+            "ph": "X",
+            "ts": (self.started - self.tracer.origin) / 1000,
+            "dur": (ended - self.started) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": self.args
+        })
+        return False
+
+    def set(self, **args):
+        """Attach extra args (node counts, byte sizes) to the event"""
+        self.args.update(args)
+
+class Tracer:
+    """Collects spans in memory until write() dumps them as Chrome trace JSON"""
+
+    def __init__(self, memory=True, owns_tracemalloc=False):
+        self.memory = memory
+        self.owns_tracemalloc = owns_tracemalloc
+        self.events = []
+        self.origin = time.perf_counter_ns()
+
+    def to_json(self):
+        return {
+            "traceEvents": [
+                {"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": "atlas_narrative"}}
+            ] + self.events,
+            "displayTimeUnit": "ms"
+        }
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.to_json(), fh)
+
+def tracing_enabled():
+    return _tracer is not None
+
+def span(name, cat="stage", **args):
+    """Context manager timing a block as a trace event; free when tracing is off"""
+
+    if _tracer is None:
+        return _NULL_SPAN
+    return Span(_tracer, name, cat, args)
+
+def start_tracing(memory=True):
+    """Install a fresh Tracer, starting tracemalloc when memory is True; returns it"""
+
+    global _tracer
+    owns_tracemalloc = memory and not tracemalloc.is_tracing()
+    if owns_tracemalloc:
+        tracemalloc.start()
+    _tracer = Tracer(memory, owns_tracemalloc)
+    return _tracer
+
+def stop_tracing(path=None):
+    """Uninstall the active Tracer, writing it to path if given; returns it"""
+
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None and tracer.owns_tracemalloc:
+        tracemalloc.stop()
+    if tracer is not None and path:
+        tracer.write(path)
+    return tracer
+
+class tracing:
+    """with tracing("trace.json"): ... records every span in the block and writes the file"""
+
+    def __init__(self, path=None, memory=True):
+        self.path = path
+        self.memory = memory
+
+    def __enter__(self):
+        return start_tracing(self.memory)
+
+    def __exit__(self, *exc):
+        stop_tracing(self.path)
+        return False
@@ -0,0 +1,256 @@
+# Vectorized batch stepping over sessions held as NumPy columns (requires NumPy)
+#
+# NarrativeEngine.step_many() loops over Session objects in Python. Here the
+# state of many sessions lives in SessionArrays (one row per session) and
+# VectorEngine.step_many() applies a whole batch of moves with array
+# operations, with the same rules, earn rules and error codes as the engine.
+# A session may appear more than once in a batch: its moves run in order, one
+# per round, and each round is a single vectorized step over distinct rows.
+import numpy as np
+
+from .engine import PERFECT_SEQUENCE_LENGTH, Session
+
+# Result error codes, in the precedence the engine checks them
+ERRORS = (None, "unknown_choice", "requires_unmet", "insufficient_tokens", "dangling_choice")
+
+# Bits of StepResults.earned
+EARNED_CHECK = 1
+EARNED_SEQUENCE = 2
+EARNED_ARRIVAL = 4
+
+def _words(count):
+    return max(1, (count + 63) // 64)
+
+class SessionArrays:
+    """Columns of per-session state: node, tokens, steps, streak, plus flag and seen-bit words"""
+
+    __slots__ = ("node", "tokens", "steps", "streak", "flags", "seen")
+
+    def __init__(self, size, flag_words, seen_words):
+        self.node = np.zeros(size, dtype=np.int64)
+        self.tokens = np.zeros(size, dtype=np.int64)
+        self.steps = np.zeros(size, dtype=np.int64)
+        self.streak = np.zeros(size, dtype=np.int64)
+        self.flags = np.zeros((size, flag_words), dtype=np.uint64)
+        self.seen = np.zeros((size, seen_words), dtype=np.uint64)
+
+    def __len__(self):
+        return len(self.node)
+
+class StepResults:
+    """Per-move outcome arrays from VectorEngine.step_many(); error 0 means accepted"""
+
+    __slots__ = ("error", "node", "tokens", "earned")
+
+    def __init__(self, size):
+        self.error = np.zeros(size, dtype=np.int8)
+        self.node = np.zeros(size, dtype=np.int64)
+        self.tokens = np.zeros(size, dtype=np.int64)
+        self.earned = np.zeros(size, dtype=np.uint8)
+
+    @property
+    def ok(self):
+        return self.error == 0
+
+class VectorEngine:
+    """NumPy tables compiled from a NarrativeEngine, for stepping SessionArrays in batches.
+
+    Choices are laid out CSR-style per node in choice order, and moves name
+    them by position within their node; positions() maps choice ids.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        graph, registry = engine.graph, engine.registry
+        n = len(graph)
+        self.flag_words = _words(len(registry))
+        slots = [first for first in engine.arrival if first is not None]
+        self.seen_words = _words(len(slots))
+
+        n_choices = len(graph.edge_targets)
+        self.choice_offsets = np.asarray(graph.edge_offsets, dtype=np.int64)
+        # One padding slot at the end so rejected moves gather in bounds
+        self.choice_next = np.full(n_choices + 1, -1, dtype=np.int64)
+        self.choice_cost = np.zeros(n_choices + 1, dtype=np.int64)
+        self.choice_require = np.zeros((n_choices + 1, self.flag_words), dtype=np.uint64)
+        self.choice_grant = np.zeros((n_choices + 1, self.flag_words), dtype=np.uint64)
+        self.node_grant = np.zeros((n + 1, self.flag_words), dtype=np.uint64)
+        e = 0
+        for i, edges in enumerate(engine.edges):
+            self.node_grant[i] = registry.words(engine.node_grants[i], self.flag_words)
+            for target, cost, require, grant in edges.values():
+                self.choice_next[e] = target
+                self.choice_cost[e] = cost
+                self.choice_require[e] = registry.words(require, self.flag_words)
+                self.choice_grant[e] = registry.words(grant, self.flag_words)
+                e += 1
+        self.positions_by_id = [{choice_id: k for k, choice_id in enumerate(edges)} for edges in engine.edges]
+
+        self.skill = np.asarray(engine.skill + [False], dtype=bool)
+        self.fatal = np.asarray(engine.fatal + [False], dtype=bool)
+        self.terminal = np.asarray(engine.terminal, dtype=bool)
+        # First-visit earn rules: seen slot (-1 for none) and its payout per node
+        self.arrival_slot = np.full(n + 1, -1, dtype=np.int64)
+        self.arrival_reward = np.zeros(n + 1, dtype=np.int64)
+        for i, first in enumerate(engine.arrival):
+            if first is not None:
+                self.arrival_slot[i] = first[0].bit_length() - 1
+                self.arrival_reward[i] = engine.earn.get(first[1], 0)
+        self.check_reward = engine.earn.get("complete_skill_check", 0)
+        self.sequence_reward = engine.earn.get("perfect_skill_sequence", 0)
+
+    def new_sessions(self, size):
+        """size sessions at the root, like NarrativeEngine.new_session()"""
+
+        engine = self.engine
+        sessions = SessionArrays(size, self.flag_words, self.seen_words)
+        sessions.node[:] = engine.root
+        sessions.tokens[:] = engine.start_tokens
+        sessions.flags[:] = self.node_grant[engine.root]
+        slot = self.arrival_slot[engine.root]
+        if slot >= 0:
+            sessions.seen[:, slot // 64] = np.uint64(1 << int(slot % 64))
+        return sessions
+
+    def from_sessions(self, sessions):
+        """SessionArrays holding these Session objects, row k for sessions[k]"""
+
+        arrays = SessionArrays(len(sessions), self.flag_words, self.seen_words)
+        words = self.engine.registry.words
+        for k, session in enumerate(sessions):
+            arrays.node[k] = session.node
+            arrays.tokens[k] = session.tokens
+            arrays.steps[k] = session.steps
+            arrays.streak[k] = session.streak
+            arrays.flags[k] = words(session.flags, self.flag_words)
+            arrays.seen[k] = words(session.seen, self.seen_words)
+        return arrays
+
+    def to_sessions(self, arrays, ids=None):
+        """Session objects for every row, with ids[k] as row k's id"""
+
+        def bits(row):
+            return sum(int(word) << (64 * w) for w, word in enumerate(row))
+
+        return [
+            Session(None if ids is None else ids[k], int(arrays.node[k]), int(arrays.tokens[k]), bits(arrays.flags[k]),
+                    int(arrays.steps[k]), int(arrays.streak[k]), bits(arrays.seen[k]))
+            for k in range(len(arrays))
+        ]
+
+    def positions(self, arrays, rows, choice_ids):
+        """Choice positions for (row, choice id) moves at the rows' current nodes, -1 when unknown"""
+
+        nodes = arrays.node[rows].tolist()
+        by_id = self.positions_by_id
+        return np.fromiter((by_id[node].get(choice_id, -1) for node, choice_id in zip(nodes, choice_ids)),
+                           dtype=np.int64, count=len(nodes))
+
+    def step_many(self, arrays, rows, positions):
+        """Apply moves (rows[k] takes choice positions[k]) in order and return StepResults.
+
+        Rejected moves leave their row untouched; error indexes ERRORS. A row
+        listed several times takes its moves in list order.
+        """
+
+        rows = np.asarray(rows, dtype=np.int64)
+        positions = np.asarray(positions, dtype=np.int64)
+        results = StepResults(len(rows))
+        if not len(rows):
+            return results
+
+        # Occurrence rank of each move among the moves on its row
+        order = np.argsort(rows, kind="stable")
+        ordered = rows[order]
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = ordered[1:] != ordered[:-1]
+        starts = np.flatnonzero(first)
+        rank = np.empty(len(rows), dtype=np.int64)
+        rank[order] = np.arange(len(rows)) - np.repeat(starts, np.diff(np.append(starts, len(rows))))
+
+        if not rank.any():
+            self._round(arrays, rows, positions, results, slice(None))
+        else:
+            for r in range(int(rank.max()) + 1):
+                moves = np.flatnonzero(rank == r)
+                self._round(arrays, rows[moves], positions[moves], results, moves)
+        return results
+
+    def _round(self, arrays, rows, positions, results, moves):
+        """One vectorized step over distinct rows, writing results[moves]"""
+
+        node = arrays.node[rows]
+        tokens = arrays.tokens[rows]
+        flags = arrays.flags[rows]
+        start = self.choice_offsets[node]
+        valid = (positions >= 0) & (positions < self.choice_offsets[node + 1] - start)
+        e = np.where(valid, start + positions, len(self.choice_next) - 1)
+        target = self.choice_next[e]
+        cost = self.choice_cost[e]
+        require = self.choice_require[e]
+        error = np.select(
+            [~valid, ((flags & require) != require).any(axis=1), cost > tokens, target < 0],
+            [1, 2, 3, 4], 0).astype(np.int8)
+        ok = error == 0
+
+        r, at, e, target = rows[ok], node[ok], e[ok], target[ok]
+        spent = tokens[ok] - cost[ok]
+        streak = arrays.streak[r]
+        earned = np.zeros(len(r), dtype=np.uint8)
+
+        skill, fatal = self.skill[at], self.fatal[target]
+        streak[skill & fatal] = 0
+        passed = skill & ~fatal
+        earned[passed] |= EARNED_CHECK
+        spent[passed] += self.check_reward
+        streak[passed] += 1
+        perfect = passed & (streak == PERFECT_SEQUENCE_LENGTH)
+        earned[perfect] |= EARNED_SEQUENCE
+        spent[perfect] += self.sequence_reward
+        streak[perfect] = 0
+
+        slot = self.arrival_slot[target]
+        arrives = np.flatnonzero(slot >= 0)
+        word = slot[arrives] // 64
+        bit = np.left_shift(np.uint64(1), (slot[arrives] % 64).astype(np.uint64))
+        fresh = (arrays.seen[r[arrives], word] & bit) == 0
+        arrives, word, bit = arrives[fresh], word[fresh], bit[fresh]
+        arrays.seen[r[arrives], word] |= bit
+        earned[arrives] |= EARNED_ARRIVAL
+        spent[arrives] += self.arrival_reward[target[arrives]]
+
+        arrays.node[r] = target
+        arrays.tokens[r] = spent
+        arrays.flags[r] = flags[ok] | self.choice_grant[e] | self.node_grant[target]
+        arrays.steps[r] += 1
+        arrays.streak[r] = streak
+
+        node[ok] = target
+        tokens[ok] = spent
+        all_earned = np.zeros(len(rows), dtype=np.uint8)
+        all_earned[ok] = earned
+        results.error[moves] = error
+        results.node[moves] = node
+        results.tokens[moves] = tokens
+        results.earned[moves] = all_earned
+
+    def results(self, results):
+        """StepResults as the dicts NarrativeEngine.step_many() returns"""
+
+        engine = self.engine
+        ids, terminal, arrival = engine.ids, engine.terminal, engine.arrival
+        listed = []
+        for error, node, tokens, earned in zip(results.error.tolist(), results.node.tolist(),
+                                               results.tokens.tolist(), results.earned.tolist()):
+            if error:
+                listed.append({"ok": False, "error": ERRORS[error], "node": ids[node], "tokens": tokens})
+                continue
+            actions = []
+            if earned & EARNED_CHECK:
+                actions.append("complete_skill_check")
+            if earned & EARNED_SEQUENCE:
+                actions.append("perfect_skill_sequence")
+            if earned & EARNED_ARRIVAL:
+                actions.append(arrival[node][1])
+            listed.append({"ok": True, "node": ids[node], "tokens": tokens, "earned": actions, "ended": terminal[node]})
+        return listed
@@ -2,6 +2,8 @@
 import json
 from datetime import datetime
 
+from atlas_narrative.metrics import stamp_structure
+
 def generate_complete_atlas_narrative():
     """Generate complete 100+ node narrative tree for The ATLAS Directive"""
     
@@ -12,10 +14,10 @@ def generate_complete_atlas_narrative():
             "title": "The ATLAS Directive",
             "description": "Complete interactive narrative discovery platform for 3I/ATLAS",
             "total_nodes": 0,
-            "endings": 15,
-            "golden_path_nodes": 12,
-            "skill_checks": 25,
-            "branching_points": 8
+            "endings": 0,
+            "golden_path_nodes": 0,
+            "skill_checks": 0,
+            "branching_points": 0
         },
         "root_id": "mission_briefing",
         "tokens": {
@@ -283,6 +285,7 @@ def generate_complete_atlas_narrative():
     # Update metadata
     narrative_tree["meta"]["total_nodes"] = len(all_nodes)
     narrative_tree["nodes"] = all_nodes
+    stamp_structure(narrative_tree)
     
     return narrative_tree
 
@@ -294,12 +297,14 @@ print(f"📊 Total Nodes: {complete_tree['meta']['total_nodes']}")
 print(f"🎯 Endings: {complete_tree['meta']['endings']}")  
 print(f"🌟 Golden Path Checkpoints: {complete_tree['meta']['golden_path_nodes']}")
 print(f"🎓 Skill Checks: {complete_tree['meta']['skill_checks']}")
+print(f"🔀 Branching Points: {complete_tree['meta']['branching_points']}")
 
-# Count node types
-ending_count = len([n for n in complete_tree['nodes'] if n['id'].startswith('ending_')])
-skill_count = len([n for n in complete_tree['nodes'] if n['id'].startswith('skill_')])
-bridge_count = len([n for n in complete_tree['nodes'] if n['id'].startswith('bridge_')])
-fatal_count = len([n for n in complete_tree['nodes'] if n['id'].startswith('fatal_')])
+# Node types, as counted by the metrics pass that filled meta
+node_types = complete_tree['meta']['structure']['categories']
+ending_count = node_types['ending']
+skill_count = node_types['skill']
+bridge_count = node_types['bridge']
+fatal_count = node_types['fatal']
 
 print(f"\n📋 Node Type Breakdown:")
 print(f"  Endings: {ending_count}")
@@ -0,0 +1,49 @@
+from atlas_narrative.analysis import analyze_narrative, format_analysis_summary, strongly_connected_components
+from atlas_narrative.generator import generate_complete_atlas_narrative
+from atlas_narrative.graph import NarrativeGraph
+
+def _node(node_id, *targets):
+    return {"id": node_id, "title": "", "body_md": "", "choices": [
+        {"id": f"to_{target}", "label": target, "next_id": target} for target in targets
+    ]}
+
+def _tree():
+    return {"root_id": "root", "nodes": [
+        _node("root", "loop_a", "stuck", "skill_x", "ghost"),
+        _node("loop_a", "loop_b"),
+        _node("loop_b", "loop_a"),
+        _node("stuck"),
+        _node("skill_x", "fatal_x", "ending_win"),
+        _node("fatal_x", "skill_x"),
+        _node("ending_win"),
+        _node("orphan", "ending_lost"),
+        _node("ending_lost")
+    ]}
+
+def test_analysis_findings():
+    report = analyze_narrative(_tree())
+    assert not report["root_missing"] and report["total_nodes"] == 9
+    assert report["dangling"] == [{"node": "root", "choice": "to_ghost", "next_id": "ghost"}]
+    assert report["unreachable"] == ["orphan", "ending_lost"]
+    assert report["unreachable_endings"] == ["ending_lost"]
+    assert report["dead_ends"] == ["stuck"]
+    assert report["cannot_finish"] == ["loop_a", "loop_b", "stuck"]
+    assert sorted(map(sorted, report["cycles"])) == [["fatal_x", "skill_x"], ["loop_a", "loop_b"]]
+    assert list(map(sorted, report["closed_cycles"])) == [["loop_a", "loop_b"]]
+    assert len(format_analysis_summary(report)) == 6
+
+def test_missing_root_reaches_nothing():
+    tree = _tree()
+    tree["root_id"] = "nowhere"
+    report = analyze_narrative(tree)
+    assert report["root_missing"] and len(report["unreachable"]) == 9
+
+def test_components_on_a_long_chain_do_not_recurse():
+    n = 20_000
+    nodes = [_node(f"n{i}", f"n{i + 1}") for i in range(n)] + [_node(f"n{n}", "n0")]
+    component = strongly_connected_components(NarrativeGraph({"root_id": "n0", "nodes": nodes}))
+    assert len(set(component)) == 1
+
+def test_graph_and_tree_give_the_same_report():
+    tree = generate_complete_atlas_narrative()
+    assert analyze_narrative(NarrativeGraph(tree)) == analyze_narrative(tree)
@@ -0,0 +1,22 @@
+import pytest
+
+from atlas_narrative.batch import build_variant, expand_variants, run_variants
+
+def test_unknown_format_is_rejected_before_writing(tmp_path):
+    with pytest.raises(ValueError, match="json, binary"):
+        run_variants([{"formats": ["json", "jsn"]}], str(tmp_path / "out"))
+    assert not (tmp_path / "out").exists()
+    with pytest.raises(ValueError):
+        build_variant({"formats": "json"}, str(tmp_path))
+
+def test_variant_names_are_unique():
+    configs = expand_variants([{}, {"chrono_start": 5}, {"formats": ["binary", "json"]}])
+    assert [config["name"] for config in configs] == ["transition_chrono3", "transition_chrono5", "transition_chrono3_binary-json"]
+    with pytest.raises(ValueError):
+        expand_variants([{}, {"formats": ["json"]}])
+
+def test_build_variant_writes_every_format(tmp_path):
+    artifact = build_variant({"name": "v", "formats": ["json", "binary"]}, str(tmp_path))
+    assert set(artifact["files"]) == {"json", "binary"}
+    assert (tmp_path / "v.json").stat().st_size == artifact["files"]["json"]["bytes"]
+    assert (tmp_path / "v.atln").exists()
@@ -0,0 +1,26 @@
+import json
+
+from atlas_narrative.bench import compare_benchmarks, run_benchmarks
+
+def _report(**best):
+    return {"results": [{"nodes": 100, "stages": {
+        stage: {"best_s": value, "mean_s": value} for stage, value in best.items()
+    }}]}
+
+def test_small_run_times_every_stage(tmp_path):
+    report = run_benchmarks([120], repeat=1, runs=50, tmp_dir=str(tmp_path))
+    json.dumps(report)
+    (result,) = report["results"]
+    assert result["nodes"] == 120
+    for stage in ("generate", "analyze", "serialize_nodes", "model_emit", "write_stream", "export_compact_gzip"):
+        assert result["stages"][stage]["best_s"] >= 0
+    assert result["stages"]["serialize_nodes"]["bytes"] == result["stages"]["model_emit"]["bytes"]
+    assert report["config"] == {"repeat": 1, "runs": 50, "seed": 0}
+    assert list(tmp_path.iterdir()) == []
+
+def test_compare_flags_only_regressions_past_tolerance():
+    baseline = _report(generate=1.0, analyze=1.0, write_stream=1.0)
+    current = _report(generate=1.5, analyze=1.1, serialize_nodes=9.0)
+    regressions = compare_benchmarks(current, baseline, tolerance=0.2)
+    assert [(r["stage"], r["ratio"]) for r in regressions] == [("generate", 1.5)]
+    assert compare_benchmarks(current, baseline, tolerance=0.6) == []
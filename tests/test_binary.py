@@ -0,0 +1,38 @@
+import pytest
+
+from atlas_narrative.binary import NarrativeBinaryReader, dumps_narrative_binary, write_narrative_binary
+from atlas_narrative.generator import generate_complete_atlas_narrative
+
+def _tree():
+    return {"meta": {"title": "ATLAS", "ratio": 0.25, "offset": -3}, "root_id": "root", "nodes": [
+        {"id": "root", "title": "Start ✦", "body_md": "", "choices": [
+            {"id": "go", "label": "Go", "next_id": "ending_a", "cost": 2},
+            {"id": "lost", "label": "Lost", "next_id": "missing", "requires": ["key"]}
+        ]},
+        {"id": "ending_a", "title": "End", "body_md": "", "choices": [], "cinematic": {"animation_key": "fade", "fx": {"glow": True}}}
+    ], "tokens": None}
+
+def test_mmap_round_trip(tmp_path):
+    tree = generate_complete_atlas_narrative()
+    path = tmp_path / "tree.atln"
+    assert write_narrative_binary(tree, path) == path.stat().st_size
+    with NarrativeBinaryReader(path) as reader:
+        assert len(reader) == len(tree["nodes"])
+        assert reader.to_tree() == tree
+        assert reader.root()["id"] == tree["root_id"]
+
+def test_lookup_by_id_and_index():
+    tree = _tree()
+    reader = NarrativeBinaryReader(dumps_narrative_binary(tree))
+    assert reader.to_tree() == tree
+    assert reader.envelope() == {key: value for key, value in tree.items() if key != "nodes"}
+    assert reader.index_of("ending_a") == 1 and reader.index_of("nope") is None
+    assert reader.node("ending_a") == tree["nodes"][1]
+    assert reader.node(0)["choices"][1]["next_id"] == "missing"
+    assert reader.node("nope") is None
+
+def test_rejects_other_files():
+    data = bytearray(dumps_narrative_binary(_tree()))
+    data[:4] = b"JSON"
+    with pytest.raises(ValueError):
+        NarrativeBinaryReader(bytes(data))
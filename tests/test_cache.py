@@ -0,0 +1,57 @@
+import os
+
+from atlas_narrative.cache import SectionCache, content_hash
+from atlas_narrative.generator import regenerate_atlas_narrative
+
+def test_alternating_outputs_share_a_cache_dir(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    a, b = str(tmp_path / "a.json"), str(tmp_path / "b.json")
+
+    first = regenerate_atlas_narrative(a, cache_dir)
+    regenerate_atlas_narrative(b, cache_dir, indent=None, chrono_start=5)
+    mtime = os.stat(a).st_mtime_ns
+
+    again = regenerate_atlas_narrative(a, cache_dir)
+    assert not again["changed"] and not again["written"]
+    assert again["updated_utc"] == first["updated_utc"]
+    assert set(again["sections"].values()) == {"cached"}
+    assert os.stat(a).st_mtime_ns == mtime
+
+    other = regenerate_atlas_narrative(b, cache_dir, indent=None, chrono_start=5)
+    assert not other["written"] and set(other["sections"].values()) == {"cached"}
+
+def test_section_cache_round_trip_and_variants(tmp_path):
+    cache = SectionCache(str(tmp_path))
+    entry = ("text", 2, ["h1", "h2"], [{"id": "x", "choices": []}])
+    cache.put("opening", "k1", *entry, variant="v1")
+
+    assert cache.get("opening", "k1", "v1") == entry
+    assert cache.get("opening", "k2", "v1") is None
+    assert cache.get("opening", "k1", "v2") is None
+    assert cache.get("opening", "k1") is None
+
+def test_content_hash_counts_part_boundaries():
+    assert content_hash("ab", "c") != content_hash("a", "bc")
+    assert content_hash("ab", "c") == content_hash("ab", "c")
+
+def test_regenerated_file_matches_the_generated_tree(tmp_path):
+    import json
+
+    from atlas_narrative.generator import generate_complete_atlas_narrative
+
+    out = str(tmp_path / "tree.json")
+    report = regenerate_atlas_narrative(out, str(tmp_path / "cache"))
+    assert report["written"] and set(report["sections"].values()) == {"rebuilt"}
+    with open(out, encoding="utf-8") as fh:
+        written = json.load(fh)
+    expected = generate_complete_atlas_narrative()
+    assert written["nodes"] == expected["nodes"] and written["root_id"] == expected["root_id"]
+    assert report["total_nodes"] == len(expected["nodes"])
+
+def test_header_change_rewrites_from_cached_sections(tmp_path):
+    out, cache_dir = str(tmp_path / "tree.json"), str(tmp_path / "cache")
+    first = regenerate_atlas_narrative(out, cache_dir)
+    second = regenerate_atlas_narrative(out, cache_dir, chrono_start=7)
+    assert second["changed"] and second["written"]
+    assert second["content_hash"] != first["content_hash"]
+    assert set(second["sections"].values()) == {"cached"}
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from atlas_narrative.chunks import MANIFEST_FILE, partition_narrative, write_narrative_chunks
+from atlas_narrative.generator import generate_complete_atlas_narrative
+from atlas_narrative.graph import NarrativeGraph
+
+def _node(node_id, *targets, grants=None):
+    return {"id": node_id, "choices": [
+        {"id": f"to_{target}", "label": target, "next_id": target, "grants": [grants] if grants else []} for target in targets
+    ]}
+
+def _cross_edges(graph, labels):
+    return sum(labels[t] != labels[i] for i in range(len(graph)) for t in graph.successor_indices(i) if t >= 0)
+
+def _graph():
+    # x is reached from both paths, so path partitioning puts it in "convergence" with y,
+    # although two of its three incoming edges come from path a
+    root = {"id": "root", "choices": [
+        {"id": "a", "label": "a", "next_id": "a1", "grants": ["path_a"]},
+        {"id": "b", "label": "b", "next_id": "b1", "grants": ["path_b"]}
+    ]}
+    return NarrativeGraph({"root_id": "root", "nodes": [
+        root,
+        _node("a1", "a2", "x"),
+        _node("a2", "x"),
+        _node("b1", "x"),
+        _node("x", "y"),
+        _node("y")
+    ]})
+
+def test_mincut_strictly_reduces_cross_chunk_edges():
+    graph = _graph()
+    path = partition_narrative(graph, "path")
+    mincut = partition_narrative(graph, "mincut")
+    assert path[graph.index["x"]] == "convergence"
+    assert mincut[graph.index["x"]] == "a"
+    assert _cross_edges(graph, mincut) < _cross_edges(graph, path)
+
+def test_mincut_respects_max_chunk_nodes_after_splitting():
+    graph = _graph()
+    labels = partition_narrative(graph, "mincut", max_chunk_nodes=2)
+    sizes = {}
+    for label in labels:
+        sizes[label] = sizes.get(label, 0) + 1
+    assert max(sizes.values()) <= 2
+
+def test_chunk_meta_counts_describe_each_chunk(tmp_path):
+    tree = generate_complete_atlas_narrative()
+    manifest = write_narrative_chunks(tree, str(tmp_path))
+    totals = dict.fromkeys(("total_nodes", "endings", "golden_path_nodes", "skill_checks", "branching_points"), 0)
+    for entry in manifest["chunks"]:
+        with open(tmp_path / entry["file"], encoding="utf-8") as fh:
+            chunk = json.load(fh)
+        meta = chunk["meta"]
+        assert "structure" not in meta
+        assert meta["total_nodes"] == len(chunk["nodes"]) == entry["nodes"]
+        assert meta["endings"] == sum(node["id"].startswith("ending_") for node in chunk["nodes"])
+        for key in totals:
+            totals[key] += meta[key]
+    assert totals == {key: tree["meta"][key] for key in totals}
+
+def test_chunk_writer_refuses_foreign_files(tmp_path):
+    (tmp_path / MANIFEST_FILE).write_text("{}", encoding="utf-8")
+    with pytest.raises(FileExistsError):
+        write_narrative_chunks({"root_id": "root", "nodes": [_node("root")]}, str(tmp_path))
@@ -0,0 +1,55 @@
+import copy
+
+import pytest
+
+from atlas_narrative.delta import apply_patch, diff_trees, patch_summary
+from atlas_narrative.generator import generate_complete_atlas_narrative
+
+@pytest.fixture()
+def versions():
+    old = generate_complete_atlas_narrative()
+    new = copy.deepcopy(old)
+    nodes = new["nodes"]
+    removed = nodes.pop(5)
+    nodes.insert(0, {"id": "prologue", "title": "Prologue", "body_md": "", "choices": []})
+    nodes[3]["title"] += " (revised)"
+    nodes[3]["choices"].append({"id": "shortcut", "label": "Skip", "next_id": "prologue"})
+    nodes[10]["choices"] = nodes[10]["choices"][1:]
+    nodes[20]["cinematic"] = {"animation_key": "new_cue"}
+    nodes[30], nodes[31] = nodes[31], nodes[30]
+    new["meta"]["version"] = "next"
+    del new["meta"]["updated_utc"]
+    return old, new, removed
+
+def test_patch_round_trip(versions):
+    old, new, removed = versions
+    snapshot = copy.deepcopy(old)
+    patch = diff_trees(old, new)
+    assert apply_patch(old, patch) == new
+    assert list(apply_patch(old, patch)) == list(new)
+    assert old == snapshot
+
+    summary = patch_summary(patch)
+    assert (summary["nodes_added"], summary["nodes_removed"]) == (1, 1)
+    assert patch["changes"]["lists"]["nodes"]["removed"] == [removed["id"]]
+    assert summary["choices_added"] == 1 and summary["choices_removed"] == 1
+    assert summary["header_keys"] == ["meta"]
+
+def test_patch_shares_unchanged_nodes(versions):
+    old, new, _ = versions
+    patched = apply_patch(old, diff_trees(old, new))
+    assert patched["nodes"][-1] is old["nodes"][-1]
+
+def test_identical_trees_give_an_empty_patch():
+    tree = generate_complete_atlas_narrative()
+    patch = diff_trees(tree, copy.deepcopy(tree))
+    assert patch["base"] == patch["target"] and patch["changes"] == {}
+    assert apply_patch(tree, patch) == tree
+
+def test_patch_rejects_the_wrong_base(versions):
+    old, new, _ = versions
+    patch = diff_trees(old, new)
+    with pytest.raises(ValueError):
+        apply_patch(new, patch)
+    with pytest.raises(ValueError):
+        apply_patch(old, dict(patch, format="other/1"))
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from atlas_narrative import encoders
+from atlas_narrative.encoders import (
+    ENCODERS,
+    dumps_tree,
+    get_encoder,
+    iter_encoded_tree,
+    load_encoded_tree,
+    register_encoder,
+    write_encoded_tree,
+)
+from atlas_narrative.generator import generate_complete_atlas_narrative
+
+@pytest.fixture(scope="module")
+def tree():
+    return generate_complete_atlas_narrative()
+
+@pytest.mark.parametrize("encoder", sorted(ENCODERS))
+def test_encoders_match_the_stdlib_layout(tree, encoder, monkeypatch):
+    monkeypatch.setattr(encoders, "NODES_PER_CHUNK", 7)
+    assert dumps_tree(tree, "dev", encoder) == json.dumps(tree, indent=2, ensure_ascii=False).encode("utf-8")
+    assert dumps_tree(tree, "compact", encoder) == json.dumps(tree, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    for mode in ("dev", "compact"):
+        assert b"".join(iter_encoded_tree(tree, mode, encoder)) == dumps_tree(tree, mode, encoder)
+
+@pytest.mark.parametrize("suffix", [".json", ".json.gz", ".json.zst"])
+def test_export_round_trip(tree, tmp_path, suffix):
+    if suffix == ".json.zst":
+        pytest.importorskip("zstandard")
+    path = str(tmp_path / f"tree{suffix}")
+    result = write_encoded_tree(tree, path, "compact", verify=True)
+    assert result["compression"] == {".json": None, ".json.gz": "gzip", ".json.zst": "zstd"}[suffix]
+    assert result["nodes"] == len(tree["nodes"])
+    assert load_encoded_tree(path) == tree
+
+def test_string_table_export_round_trip(tree, tmp_path):
+    path = str(tmp_path / "tree.json.gz")
+    plain = write_encoded_tree(tree, str(tmp_path / "plain.json"), "compact")
+    packed = write_encoded_tree(tree, path, "compact", string_table=True, verify=True)
+    assert packed["bytes"] < plain["bytes"]
+    assert "string_table" in load_encoded_tree(path, expand=False)
+    assert load_encoded_tree(path) == tree
+
+def test_gzip_output_is_reproducible(tree, tmp_path):
+    path = tmp_path / "tree.json.gz"
+    write_encoded_tree(tree, str(path))
+    first = path.read_bytes()
+    write_encoded_tree(tree, str(path))
+    assert path.read_bytes() == first
+
+def test_register_encoder_and_bad_arguments(monkeypatch):
+    monkeypatch.setattr(encoders, "ENCODERS", dict(ENCODERS))
+    register_encoder("upper", lambda value, mode: json.dumps(value).upper().encode("utf-8"))
+    assert get_encoder("upper")[0] == "upper"
+    assert dumps_tree({"a": "b"}, "compact", "upper") == b'{"A": "B"}'
+    with pytest.raises(ValueError):
+        get_encoder("missing")
+    with pytest.raises(ValueError):
+        dumps_tree({}, "pretty")
@@ -0,0 +1,56 @@
+import pytest
+
+from atlas_narrative.cache import tree_hash
+from atlas_narrative.engine import NarrativeEngine, SessionStore
+from atlas_narrative.generator import generate_complete_atlas_narrative
+from atlas_narrative.merkle import stamp_content
+
+def _choice(target, **fields):
+    return dict({"id": f"to_{target}", "label": target, "next_id": target}, **fields)
+
+def _gated_tree():
+    return {"root_id": "root", "tokens": {"chrono": {"start": 2}}, "nodes": [
+        {"id": "root", "title": "", "body_md": "", "choices": [_choice("vault"), _choice("yard", grants=["key"])]},
+        {"id": "yard", "title": "", "body_md": "", "choices": [_choice("vault")]},
+        {"id": "vault", "title": "", "body_md": "", "requires": ["key"], "choices": [_choice("ending_vault")]},
+        {"id": "ending_vault", "title": "", "body_md": "", "choices": []}
+    ]}
+
+def test_node_requires_gate_choices():
+    engine = NarrativeEngine(_gated_tree())
+    session = engine.new_session()
+    assert [c["available"] for c in engine.choices(session)] == [False, True]
+    assert engine.step(session, "to_vault") == {"ok": False, "error": "requires_unmet", "node": "root", "tokens": 2}
+
+    assert engine.step(session, "to_yard")["ok"]
+    assert engine.step(session, "to_vault")["node"] == "vault"
+
+def test_tree_hash_is_recomputed_unless_trusted():
+    tree = stamp_content(_gated_tree())
+    stamped = tree["meta"]["content"]["tree_hash"]
+    tree["nodes"][0]["title"] = "edited after stamping"
+
+    assert NarrativeEngine(tree).tree_hash == tree_hash(tree) != stamped
+    assert NarrativeEngine(tree, trust_stored=True).tree_hash == stamped
+
+def test_snapshot_restore_round_trip():
+    engine = NarrativeEngine(generate_complete_atlas_narrative())
+    session = engine.new_session("p1")
+    for choice in ("choice_trajectory", "correct_hyperbolic"):
+        assert engine.step(session, choice)["ok"]
+    snapshot = engine.snapshot(session)
+    assert engine.snapshot(engine.restore(snapshot)) == snapshot
+
+def test_session_store_evicts_and_rejects_live_ids():
+    evicted = []
+    store = SessionStore(NarrativeEngine(_gated_tree()), capacity=2, on_evict=evicted.append)
+    store.create("a")
+    store.create()
+    store.get("a")
+    store.create()
+    assert "a" in store and len(store) == 2
+    assert [snapshot["id"] for snapshot in evicted] == ["s1"]
+    with pytest.raises(ValueError):
+        store.create("a")
+    assert store.step("missing", "to_yard")["error"] == "unknown_session"
+    assert store.restore(evicted[:1]) == 1 and "s1" in store and len(store) == 2
@@ -0,0 +1,24 @@
+from atlas_narrative.explorer import explore_states
+
+def _choice(target, **fields):
+    return dict({"id": f"to_{target}", "label": target, "next_id": target}, **fields)
+
+def _tree(root_grants=None):
+    return {"root_id": "root", "tokens": {"chrono": {"start": 2}}, "nodes": [
+        {"id": "root", "grants": root_grants, "choices": [_choice("vault"), _choice("ending_open", cost=1)]},
+        {"id": "vault", "requires": ["key"], "choices": [_choice("ending_vault")]},
+        {"id": "ending_open", "choices": []},
+        {"id": "ending_vault", "choices": []}
+    ]}
+
+def test_node_requires_block_unreachable_endings():
+    report = explore_states(_tree())
+    assert not report["endings"]["ending_vault"]["reachable"]
+    assert report["endings"]["ending_open"] == {"reachable": True, "states": 1, "min_cost": 1, "max_cost": 1}
+    assert report["states"] == 2
+
+def test_node_requires_met():
+    for prune in (False, True):
+        report = explore_states(_tree(root_grants=["key"]), prune_dominated=prune)
+        assert report["endings"]["ending_vault"]["reachable"]
+        assert report["endings"]["ending_vault"]["min_cost"] == 0
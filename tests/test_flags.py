@@ -0,0 +1,39 @@
+import pytest
+
+from atlas_narrative.flags import FlagRegistry, satisfies
+
+def _tree():
+    return {"nodes": [
+        {"id": "root", "grants": ["met_crew"], "choices": [
+            {"id": "a", "next_id": "b", "grants": ["has_key", "met_crew"]},
+            {"id": "b", "next_id": "c", "requires": ["has_key"]}
+        ]},
+        {"id": "c", "requires": ["badge"], "choices": []}
+    ]}
+
+def test_required_flags_take_the_low_bits():
+    registry = FlagRegistry.from_tree(_tree())
+    assert registry.names == ["has_key", "badge", "met_crew"]
+    assert registry.required_count == 2 and registry.required_mask == 0b011
+    assert registry.choice_masks(_tree()["nodes"][0]["choices"][1]) == (0b001, 0)
+
+def test_mask_and_flags_round_trip():
+    registry = FlagRegistry.from_tree(_tree())
+    state = registry.mask(["met_crew", "has_key"])
+    assert registry.flags(state) == ["has_key", "met_crew"]
+    assert satisfies(state, registry.mask(["has_key"])) and not satisfies(state, registry.mask(["badge"]))
+    with pytest.raises(KeyError):
+        registry.mask(["unknown"])
+
+def test_bytes_and_json_round_trip():
+    registry = FlagRegistry([f"f{i}" for i in range(70)], required_count=3)
+    state = registry.mask(["f0", "f9", "f69"])
+    data = registry.to_bytes(state)
+    assert len(data) == registry.nbytes == 9
+    assert registry.from_bytes(data) == state
+    assert registry.words(state, 2) == [(1 << 0) | (1 << 9), 1 << 5]
+
+    copy = FlagRegistry.from_json(registry.to_json())
+    assert copy.to_json() == registry.to_json() and copy.fingerprint == registry.fingerprint
+    with pytest.raises(ValueError):
+        FlagRegistry(["only"]).from_bytes(data)
@@ -0,0 +1,58 @@
+import io
+import json
+
+from atlas_narrative.generator import generate_complete_atlas_narrative, write_atlas_narrative_stream
+from atlas_narrative.metrics import stamp_structure
+
+HEADLINE = ("total_nodes", "endings", "golden_path_nodes", "skill_checks", "branching_points")
+
+def _streamed_meta(**kwargs):
+    fh = io.StringIO()
+    write_atlas_narrative_stream(fh, **kwargs)
+    return json.loads(fh.getvalue())
+
+def test_streamed_meta_counts_match_stamp_structure():
+    tree = generate_complete_atlas_narrative()
+    expected = {"nodes": tree["nodes"], "root_id": tree["root_id"]}
+    stamp_structure(expected)
+    expected["meta"]["total_nodes"] = len(tree["nodes"])
+
+    streamed = _streamed_meta()
+    assert [streamed["meta"][key] for key in HEADLINE] == [expected["meta"][key] for key in HEADLINE]
+    assert streamed["nodes"] == tree["nodes"]
+
+def test_streamed_branching_points_ignore_dangling_targets():
+    nodes = [
+        {"id": "root", "title": "", "body_md": "", "choices": [
+            {"id": "a", "label": "", "next_id": "ending_a"},
+            {"id": "b", "label": "", "next_id": "missing"}
+        ]},
+        {"id": "ending_a", "title": "", "body_md": "", "choices": []}
+    ]
+    header = {"meta": {"total_nodes": 0}, "root_id": "root"}
+    meta = _streamed_meta(nodes=nodes, header=header)["meta"]
+    expected = {"root_id": "root", "nodes": nodes}
+    stamp_structure(expected)
+    assert meta["branching_points"] == expected["meta"]["branching_points"] == 0
+    assert meta["endings"] == 1
+
+def test_iter_nodes_match_generated_tree():
+    from atlas_narrative.generator import iter_atlas_narrative_nodes
+
+    assert list(iter_atlas_narrative_nodes()) == generate_complete_atlas_narrative()["nodes"]
+
+def test_stream_round_trips_the_generated_tree():
+    tree = generate_complete_atlas_narrative()
+    fh = io.StringIO()
+    assert write_atlas_narrative_stream(fh, nodes=iter(tree["nodes"]), header=tree) == len(tree["nodes"])
+    assert json.loads(fh.getvalue()) == tree
+
+def test_stream_needs_a_seekable_file():
+    import pytest
+
+    class Pipe(io.StringIO):
+        def seekable(self):
+            return False
+
+    with pytest.raises(ValueError):
+        write_atlas_narrative_stream(Pipe())
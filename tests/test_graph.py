@@ -0,0 +1,41 @@
+from atlas_narrative.generator import generate_complete_atlas_narrative
+from atlas_narrative.graph import NarrativeGraph, classify_node_id
+
+def _node(node_id, *targets):
+    return {"id": node_id, "title": "", "body_md": "", "choices": [
+        {"id": f"to_{target}", "label": target, "next_id": target} for target in targets
+    ]}
+
+def test_classify_node_id_first_rule_wins():
+    assert classify_node_id("ending_skill_path_entry") == "ending"
+    assert classify_node_id("skill_golden_path") == "skill"
+    assert classify_node_id("golden_path_3") == "golden_path"
+    assert classify_node_id("alpha_path_entry") == "path_entry"
+    assert classify_node_id("fatal_overload") == "fatal"
+    assert classify_node_id("transition_node_2") == "bridge"
+    assert classify_node_id("root") == "story"
+
+def test_edges_predecessors_and_dangling():
+    graph = NarrativeGraph({"root_id": "root", "nodes": [
+        _node("root", "skill_a", "missing", "skill_a"),
+        _node("skill_a", "ending_a", "root"),
+        _node("ending_a"),
+        _node("root")
+    ]})
+    assert len(graph) == 4 and "skill_a" in graph and "missing" not in graph
+    assert graph.duplicates == ["root"]
+    assert list(graph.edge_targets) == [1, -1, 1, 2, 0]
+    assert list(graph.edge_offsets) == [0, 3, 5, 5, 5]
+    assert graph.successors("root") == ["skill_a", "skill_a"]
+    assert graph.predecessors("skill_a") == ["root", "root"]
+    assert graph.predecessors("root") == ["skill_a"]
+    assert graph.dangling == [(0, "to_missing", "missing")]
+    assert graph.node("ending_a")["id"] == "ending_a" and graph.node("missing") is None
+
+def test_buckets_match_classify_node_id():
+    tree = generate_complete_atlas_narrative()
+    graph = NarrativeGraph(tree)
+    for category, members in graph.buckets.items():
+        assert all(classify_node_id(graph.ids[i]) == category for i in members)
+    assert sum(map(len, graph.buckets.values())) == len(tree["nodes"])
+    assert graph.category_counts()["Endings"] == graph.count("ending") > 0
@@ -0,0 +1,51 @@
+import tracemalloc
+
+import pytest
+
+from atlas_narrative.engine import NarrativeEngine
+from atlas_narrative.generator import generate_complete_atlas_narrative
+from atlas_narrative.loadtest import _session_bytes, run_load_test
+
+def _sessions(count):
+    engine = NarrativeEngine(generate_complete_atlas_narrative())
+    return engine, [engine.new_session(f"p{k}") for k in range(count)]
+
+def test_session_bytes_leaves_caller_tracing_running():
+    engine, sessions = _sessions(50)
+    tracemalloc.start()
+    try:
+        assert _session_bytes(engine, sessions) > 0
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+def test_session_bytes_stops_tracing_it_started():
+    engine, sessions = _sessions(50)
+    assert not tracemalloc.is_tracing()
+    assert _session_bytes(engine, sessions) > 0
+    assert not tracemalloc.is_tracing()
+
+def test_inprocess_run_report():
+    tree = generate_complete_atlas_narrative()
+    report = run_load_test(tree, players=30, max_steps=40, seed=3)
+    assert report["config"]["players"] == 30 and report["config"]["nodes"] == len(tree["nodes"])
+    assert [result["policy"] for result in report["results"]] == ["random", "greedy", "fail"]
+    for result in report["results"]:
+        assert sum(result["outcomes"].values()) == 30
+        assert result["latency"]["count"] == result["steps"] + result["rejected"]
+        assert result["steps"] > 0 and result["bytes_per_session"] > 0
+    by_policy = {result["policy"]: result for result in report["results"]}
+    assert by_policy["greedy"]["fatal_visits"] <= by_policy["fail"]["fatal_visits"]
+    assert run_load_test(tree, ("greedy",), players=30, max_steps=40, seed=3)["results"][0]["steps"] == by_policy["greedy"]["steps"]
+
+def test_socket_run_matches_the_local_engine():
+    tree = generate_complete_atlas_narrative()
+    (result,) = run_load_test(tree, ("greedy",), players=6, max_steps=20, mode="socket", connections=2)["results"]
+    assert result["mismatches"] == 0 and result["steps"] > 0
+
+def test_rejects_unknown_modes_and_policies():
+    tree = generate_complete_atlas_narrative()
+    with pytest.raises(ValueError):
+        run_load_test(tree, mode="udp")
+    with pytest.raises(ValueError):
+        run_load_test(tree, ("lazy",))
@@ -0,0 +1,56 @@
+import copy
+import hashlib
+
+import pytest
+
+from atlas_narrative.cache import tree_hash
+from atlas_narrative.generator import generate_complete_atlas_narrative
+from atlas_narrative.merkle import (
+    content_meta,
+    merkle_root,
+    node_hash,
+    stamp_content,
+    stored_tree_hash,
+    verify_content,
+)
+
+def test_node_hash_ignores_key_order():
+    node = {"id": "a", "title": "Ä", "body_md": "", "choices": []}
+    assert node_hash(node) == node_hash(dict(reversed(list(node.items()))))
+    assert node_hash(node) != node_hash(dict(node, title="A"))
+
+def test_merkle_root_pairs_and_promotes_odd_leaves():
+    leaves = [hashlib.sha256(bytes([i])).hexdigest() for i in range(3)]
+    pair = hashlib.sha256(b"\x01" + bytes.fromhex(leaves[0]) + bytes.fromhex(leaves[1])).digest()
+    expected = hashlib.sha256(b"\x01" + pair + bytes.fromhex(leaves[2])).hexdigest()
+    assert merkle_root(leaves) == expected
+    assert merkle_root(leaves[:1]) == leaves[0]
+    assert merkle_root([]) == hashlib.sha256(b"").hexdigest()
+
+def test_stamped_content_verifies_until_edited():
+    tree = stamp_content(generate_complete_atlas_narrative())
+    assert verify_content(tree)
+    assert stored_tree_hash(tree) == tree_hash(tree) == tree["meta"]["content"]["tree_hash"]
+
+    edited = copy.deepcopy(tree)
+    edited["nodes"][3]["body_md"] += "!"
+    assert not verify_content(edited)
+    assert stored_tree_hash(edited) == tree["meta"]["content"]["tree_hash"] != tree_hash(edited)
+
+def test_section_hashes_cover_their_own_nodes():
+    tree = generate_complete_atlas_narrative()
+    n = len(tree["nodes"])
+    content = stamp_content(tree, sections=[("head", 10), ("tail", n - 10)])["meta"]["content"]
+    assert content["sections"]["head"] == {"nodes": 10, "hash": merkle_root([node_hash(node) for node in tree["nodes"][:10]])}
+    assert verify_content(tree)
+
+    tree["nodes"][-1]["title"] = "changed"
+    assert content_meta(tree, [("head", 10), ("tail", n - 10)])["sections"]["head"] == content["sections"]["head"]
+    with pytest.raises(ValueError):
+        content_meta(tree, [("head", 10)])
+
+def test_tree_hash_covers_root_and_tokens_not_meta():
+    tree = generate_complete_atlas_narrative()
+    before = tree_hash(tree)
+    assert tree_hash(dict(tree, meta={})) == before
+    assert tree_hash(dict(tree, root_id="elsewhere")) != before
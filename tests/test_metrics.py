@@ -0,0 +1,47 @@
+from atlas_narrative.generator import generate_complete_atlas_narrative
+from atlas_narrative.metrics import skeleton_nodes, stamp_structure, structure_metrics
+
+def _choice(target, **fields):
+    return dict({"id": f"to_{target}", "label": target, "next_id": target}, **fields)
+
+def _node(node_id, *choices):
+    return {"id": node_id, "title": "", "body_md": "", "choices": [
+        choice if isinstance(choice, dict) else _choice(choice) for choice in choices
+    ]}
+
+def _tree():
+    return {"root_id": "root", "nodes": [
+        _node("root", _choice("a", grants=["path_alpha"]), _choice("b", grants=["path_beta"])),
+        _node("a", "skill_1"),
+        _node("b", "skill_1", "ending_b"),
+        _node("skill_1", "fatal_1", "ending_win"),
+        _node("fatal_1", "skill_1"),
+        _node("ending_win"),
+        _node("ending_b"),
+        _node("orphan", "root")
+    ]}
+
+def test_structure_metrics_on_a_small_tree():
+    metrics = structure_metrics(_tree())
+    assert (metrics["total_nodes"], metrics["choices"], metrics["dangling"]) == (8, 9, 0)
+    assert (metrics["endings"], metrics["skill_checks"], metrics["branching_points"]) == (2, 1, 3)
+    assert metrics["branching_histogram"] == {"0": 2, "1": 3, "2": 3}
+    assert metrics["depth"] == {"max": 3, "histogram": {"0": 1, "1": 2, "2": 2, "3": 2}, "unreachable": 1}
+    assert metrics["longest_acyclic_path"] == {"length": 3, "nodes": ["root", "a", "skill_1", "fatal_1"]}
+    assert metrics["cycles"] == {"back_edges": 1, "retry_loops": 1}
+    assert metrics["paths"] == {
+        "alpha": {"entry": "a", "nodes": 4, "exclusive": 1},
+        "beta": {"entry": "b", "nodes": 5, "exclusive": 2}
+    }
+
+def test_skeleton_nodes_give_the_same_meta():
+    tree = generate_complete_atlas_narrative()
+    full = stamp_structure(dict(tree, meta={}))
+    from_skeleton = stamp_structure(dict(tree, meta={}), skeleton_nodes(tree["nodes"]))
+    assert from_skeleton == full
+
+def test_long_chains_do_not_recurse():
+    n = 20_000
+    nodes = [_node(f"n{i}", f"n{i + 1}") for i in range(n)] + [_node(f"n{n}")]
+    metrics = structure_metrics({"root_id": "n0", "nodes": nodes})
+    assert metrics["depth"]["max"] == metrics["longest_acyclic_path"]["length"] == n
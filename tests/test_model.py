@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+from atlas_narrative.generator import generate_complete_atlas_narrative, serialize_nodes
+from atlas_narrative.model import Node, load_nodes
+
+def _dumps_nodes(nodes, indent):
+    """The "nodes" array body as json.dumps writes it inside the tree document"""
+
+    text = json.dumps({"nodes": nodes}, indent=indent, ensure_ascii=False, separators=(",", ": " if indent else ":"))
+    start = text.index("[") + 1
+    end = text.rindex("]")
+    return text[start:end].rstrip(" \n") if indent else text[start:end]
+
+@pytest.mark.parametrize("indent", [2, None])
+def test_dict_and_node_paths_emit_identical_bytes(indent):
+    nodes = generate_complete_atlas_narrative()["nodes"]
+    from_dicts = serialize_nodes(nodes, indent)
+    from_models = serialize_nodes(load_nodes(nodes), indent)
+    assert from_dicts == from_models
+    assert from_dicts == (_dumps_nodes(nodes, indent), len(nodes))
+
+def test_node_round_trip():
+    for data in generate_complete_atlas_narrative()["nodes"]:
+        assert Node.from_dict(data).to_dict() == data
+
+def test_schema_violations_raise():
+    node = {"id": "n", "title": "t", "body_md": "b", "choices": [{"id": "c", "label": "l", "next_id": "x", "cost": -1}]}
+    with pytest.raises(ValueError):
+        serialize_nodes([node])
+    with pytest.raises(ValueError):
+        serialize_nodes([dict(node, choices=[], extra=1)])
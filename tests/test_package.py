@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import atlas_narrative
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NUMPY_EXPORTS = ("VectorEngine", "SessionArrays", "simulate_playthroughs", "CompiledNarrative")
+
+def _run(code):
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout
+
+def test_importing_the_package_and_script_builds_nothing():
+    out = _run(
+        "import sys, atlas_narrative\n"
+        "lazy = sorted(name for name in sys.modules if name.startswith('atlas_narrative.'))\n"
+        "import script\n"
+        "heavy = sorted(name for name in ('numpy', 'inspect', 'atlas_narrative.cache', 'atlas_narrative.trace') if name in sys.modules)\n"
+        "print(lazy, heavy)\n"
+    )
+    assert out == "[] []\n"
+
+def test_every_export_resolves():
+    for name in atlas_narrative.__all__:
+        if name not in NUMPY_EXPORTS:
+            assert getattr(atlas_narrative, name) is not None
+    assert "generate_complete_atlas_narrative" in dir(atlas_narrative)
+    with pytest.raises(AttributeError):
+        atlas_narrative.not_exported
+
+def test_numpy_exports_resolve():
+    pytest.importorskip("numpy")
+    for name in NUMPY_EXPORTS:
+        assert getattr(atlas_narrative, name) is not None
+
+def test_cli_help_runs():
+    result = subprocess.run([sys.executable, "-m", "atlas_narrative", "--help"], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0 and "generate" in result.stdout
@@ -0,0 +1,55 @@
+from atlas_narrative.routes import solve_routes
+
+def _tree(nodes, start_tokens):
+    return {"root_id": nodes[0]["id"], "tokens": {"chrono": {"start": start_tokens}}, "nodes": nodes}
+
+def _node(node_id, *choices):
+    return {"id": node_id, "choices": [
+        {"id": f"to_{target}", "label": target, "next_id": target, "cost": cost} for target, cost in choices
+    ]}
+
+def test_steps_order_keeps_cheaper_longer_path_within_budget():
+    # root -> a costs the whole budget, so a -> ending_x only fits when a is reached through b
+    tree = _tree([
+        _node("root", ("a", 2), ("b", 0)),
+        _node("b", ("a", 0)),
+        _node("a", ("ending_x", 1)),
+        _node("ending_x")
+    ], start_tokens=2)
+
+    for order in ("steps", "cost"):
+        report = solve_routes(tree, targets=["ending_x"], order=order)
+        target = report["targets"]["ending_x"]
+        assert target["reachable"], order
+        assert target["routes"][0]["nodes"] == ["root", "b", "a", "ending_x"]
+        assert target["routes"][0]["cost"] == 1
+
+def test_steps_order_prefers_fewest_steps_when_affordable():
+    tree = _tree([
+        _node("root", ("a", 1), ("b", 0)),
+        _node("b", ("a", 0)),
+        _node("a", ("ending_x", 1)),
+        _node("ending_x")
+    ], start_tokens=2)
+
+    report = solve_routes(tree, targets=["ending_x"], k=2, order="steps")
+    routes = report["targets"]["ending_x"]["routes"]
+    assert [route["steps"] for route in routes] == [2, 3]
+    assert [route["cost"] for route in routes] == [2, 1]
+
+def test_routes_do_not_pass_through_locked_nodes():
+    # The cheap way to ending_x runs through vault, which requires a flag nobody grants
+    tree = _tree([
+        _node("root", ("vault", 0), ("detour", 1)),
+        _node("vault", ("ending_x", 0)),
+        _node("detour", ("ending_x", 0)),
+        _node("ending_x")
+    ], start_tokens=2)
+    tree["nodes"][1]["requires"] = ["key"]
+
+    route = solve_routes(tree, targets=["ending_x"])["targets"]["ending_x"]["routes"][0]
+    assert route["nodes"] == ["root", "detour", "ending_x"]
+
+    tree["nodes"][0]["grants"] = ["key"]
+    route = solve_routes(tree, targets=["ending_x"])["targets"]["ending_x"]["routes"][0]
+    assert route["nodes"] == ["root", "vault", "ending_x"]
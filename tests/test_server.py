@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import pytest
+
+from atlas_narrative.generator import generate_complete_atlas_narrative
+from atlas_narrative.merkle import node_hash
+from atlas_narrative.server import HTTPClient, NarrativeService, WebSocketClient, start_server
+
+@pytest.fixture(scope="module")
+def tree():
+    return generate_complete_atlas_narrative()
+
+def test_routes_and_etag_revalidation(tree):
+    service = NarrativeService(tree)
+    root = tree["root_id"]
+    status, etag, body = service.handle("GET", f"/nodes/{root}")
+    assert status == 200 and json.loads(body) == tree["nodes"][0]
+    assert etag == b'"%s"' % node_hash(tree["nodes"][0]).encode("ascii")
+    assert service.handle("GET", f"/nodes/{root}", if_none_match=etag.decode())[0] == 304
+    assert service.handle("GET", f"/nodes/{root}", if_none_match=f'"other", W/{etag.decode()}')[0] == 304
+    assert service.handle("GET", f"/nodes/{root}", if_none_match='"other"')[0] == 200
+
+    prefetch = json.loads(service.handle("GET", f"/nodes/{root}/prefetch")[2])
+    assert [node["id"] for node in prefetch["next"]] == list(dict.fromkeys(c["next_id"] for c in tree["nodes"][0]["choices"]))
+    assert "nodes" not in json.loads(service.handle("GET", "/tree")[2])
+    listing = json.loads(service.handle("GET", "/chunks")[2])["chunks"]
+    label = next(iter(listing))
+    assert len(json.loads(service.handle("GET", f"/chunks/{label}")[2])["nodes"]) == listing[label]["nodes"]
+
+    assert service.handle("GET", "/nodes/missing")[0] == 404
+    assert service.handle("DELETE", "/tree")[0] == 405
+
+def test_slices_share_one_cache_entry_and_reject_bad_params(tree):
+    service = NarrativeService(tree)
+    total = len(tree["nodes"])
+    first = service.handle("GET", "/nodes?start=10&count=5")
+    assert json.loads(first[2])["nodes"] == tree["nodes"][10:15]
+    assert service.route_key(f"/nodes?start={total - 2}&count=100") == service.route_key(f"/nodes?count=50&start={total - 2}")
+    assert service.handle("GET", "/nodes?count=5&start=10") == first and service.hits == 1
+
+    for bad in ("/nodes?start=-1", "/nodes?count=0", "/nodes?count=5000", "/nodes?page=2", "/nodes?start=1&start=2", "/tree?x=1"):
+        assert service.handle("GET", bad)[0] == 400
+
+def test_response_cache_is_bounded_in_bytes(tree):
+    service = NarrativeService(tree, cache_bytes=4096)
+    for node in tree["nodes"][:20]:
+        service.handle("GET", f"/nodes/{node['id']}")
+    assert 0 < service.cached_bytes <= 4096 and len(service.cache) < 20
+
+    tiny = NarrativeService(tree, cache_bytes=10)
+    assert tiny.handle("GET", "/tree")[0] == 200 and not tiny.cache
+
+def test_http_and_websocket_round_trip(tree):
+    async def scenario():
+        server = await start_server(NarrativeService(tree), "127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+        try:
+            client = await HTTPClient(host, port).connect()
+            status, headers, body = await client.request("GET", f"/nodes/{tree['root_id']}")
+            assert status == 200 and json.loads(body)["id"] == tree["root_id"]
+            assert (await client.request("GET", f"/nodes/{tree['root_id']}", {"If-None-Match": headers["etag"]}))[0] == 304
+
+            status, _, body = await client.request("POST", "/sessions")
+            session = json.loads(body)
+            assert status == 201 and session["node"] == tree["root_id"]
+            choice = next(c["id"] for c in session["choices"] if c["available"])
+            status, _, body = await client.request("POST", f"/sessions/{session['id']}/choose/{choice}")
+            assert status == 200 and json.loads(body)["ok"]
+            assert (await client.request("POST", f"/sessions/{session['id']}/choose/nope"))[0] == 409
+            await client.close()
+
+            ws = await WebSocketClient(host, port).connect()
+            reply = await ws.request(f"/nodes/{tree['root_id']}", rid=7)
+            assert reply["rid"] == 7 and reply["status"] == 200 and reply["body"]["id"] == tree["root_id"]
+            assert (await ws.request(f"/nodes/{tree['root_id']}", etag=reply["etag"]))["status"] == 304
+            await ws.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(scenario())
@@ -0,0 +1,26 @@
+from atlas_narrative.simulator import CompiledNarrative, simulate_playthroughs
+
+def _choice(target, **fields):
+    return dict({"id": f"to_{target}", "label": target, "next_id": target}, **fields)
+
+def _gated_tree(root_grants=None):
+    # vault requires "key" at node level; its incoming choice has no requires of its own
+    return {"root_id": "root", "tokens": {"chrono": {"start": 3}}, "nodes": [
+        {"id": "root", "grants": root_grants, "choices": [_choice("vault"), _choice("ending_open")]},
+        {"id": "vault", "requires": ["key"], "choices": [_choice("ending_vault")]},
+        {"id": "ending_open", "choices": []},
+        {"id": "ending_vault", "choices": []}
+    ]}
+
+def test_node_requires_gate_entering_the_node():
+    report = simulate_playthroughs(_gated_tree(), runs=2_000, batch_size=500, seed=1)
+    assert report["endings"] == {"ending_open": 2_000}
+    assert report["completed"] == 2_000 and not report["stuck"]
+
+def test_node_requires_met_lets_playthroughs_in():
+    report = simulate_playthroughs(_gated_tree(root_grants=["key"]), runs=2_000, batch_size=500, seed=1)
+    assert set(report["endings"]) == {"ending_open", "ending_vault"}
+
+def test_compiled_require_mask_includes_target_node_requires():
+    compiled = CompiledNarrative(_gated_tree())
+    assert compiled.choice_require[0].any() and not compiled.choice_require[1].any()
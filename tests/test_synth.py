@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from atlas_narrative.analysis import analyze_narrative
+from atlas_narrative.merkle import verify_content
+from atlas_narrative.metrics import structure_metrics
+from atlas_narrative.synth import META_COUNTS, MIN_EPISODE_NODES, iter_synthetic_nodes, synthesize_tree, write_synthetic_tree
+
+@pytest.mark.parametrize("total_nodes", [1 + MIN_EPISODE_NODES, 500, 2_345])
+def test_exact_size_and_clean_structure(total_nodes):
+    tree = synthesize_tree(total_nodes, seed=5)
+    assert len(tree["nodes"]) == tree["meta"]["total_nodes"] == total_nodes
+    report = analyze_narrative(tree)
+    assert not report["dangling"] and not report["unreachable"] and not report["duplicate_ids"]
+    assert verify_content(tree)
+
+def test_same_seed_same_tree():
+    def tree_hash(seed):
+        return synthesize_tree(800, seed)["meta"]["content"]["tree_hash"]
+
+    assert tree_hash(1) == tree_hash(1) != tree_hash(2)
+
+def test_streamed_counts_match_the_full_metrics(tmp_path):
+    path = tmp_path / "synthetic.json"
+    counts = write_synthetic_tree(str(path), 1_200, seed=3, cycle_density=0.2)
+    tree = json.loads(path.read_text(encoding="utf-8"))
+    metrics = structure_metrics(tree)
+    assert tree["nodes"] == list(iter_synthetic_nodes(1_200, seed=3, cycle_density=0.2))
+    assert counts["total_nodes"] == len(tree["nodes"]) == 1_200
+    for key in META_COUNTS:
+        assert counts[key] == tree["meta"][key] == metrics[key]
+
+def test_rejects_branching_below_one():
+    with pytest.raises(ValueError):
+        list(iter_synthetic_nodes(100, branching=0.5))
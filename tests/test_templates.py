@@ -0,0 +1,52 @@
+import pytest
+
+from atlas_narrative.templates import (
+    bridge_chain,
+    cinematic,
+    compile_template,
+    ending_nodes,
+    flag_list,
+    skill_check_triads,
+    story_node,
+)
+
+def test_compile_template_renders_and_rejects_code():
+    assert compile_template("node_{i:03d}_of_{n}")(4, 5) == "node_004_of_5"
+    for bad in ("{i.__class__}", "{x}", "{i!r}", "{i:{n}}"):
+        with pytest.raises(ValueError):
+            compile_template(bad)
+
+def test_shared_values_are_interned():
+    assert flag_list(["a", "b"]) is flag_list(("a", "b"))
+    assert cinematic("fade", fx=["glow"]) is cinematic("fade", fx=("glow",))
+    first = story_node("x", "", "", [("go", "Go", "y")])
+    second = story_node("z", "", "", [("go", "Go", "y")])
+    assert first["choices"][0] is second["choices"][0]
+
+def test_skill_check_triad_expansion():
+    rows = [(
+        "skill_orbit", "Orbit", "Which orbit?",
+        ("correct_orbit", "Elliptic", "orbit_confirmed", ("orbit_known",)),
+        [("wrong_a", "Circular"), ("wrong_b", "Flat")],
+        ("orbit_confirmed", "Confirmed", "", [("next", "Next", "ending_a")]),
+        ("fatal_orbit_error", "Error", "", ("retry_orbit", "Retry"), None)
+    )]
+    skill, confirmed, fatal = skill_check_triads(rows)
+    assert [c["next_id"] for c in skill["choices"]] == ["orbit_confirmed", "fatal_orbit_error", "fatal_orbit_error"]
+    assert [c.get("cost") for c in skill["choices"]] == [None, 1, 1]
+    assert confirmed["id"] == "orbit_confirmed"
+    assert fatal["choices"] == [{"id": "retry_orbit", "label": "Retry", "next_id": "skill_orbit"}]
+
+def test_endings_filter_and_default_cinematic():
+    rows = [("ending_a", "A", "", ["done"], None), ("ending_b", "B", "", [], cinematic("custom"))]
+    assert [node["id"] for node in ending_nodes(rows, {"ending_b"})] == ["ending_b"]
+    first = next(ending_nodes(rows))
+    assert first["title"] == "OUTCOME: A" and first["cinematic"] == {"animation_key": "a"}
+
+def test_bridge_chain_links_forward_then_exits():
+    nodes = list(bridge_chain(3, "bridge_{n}", "Bridge {n}", "Step {i}", [
+        ("next_{n}", "On", 1, 1, "ending_out", "seen_{n}")
+    ]))
+    assert [node["id"] for node in nodes] == ["bridge_1", "bridge_2", "bridge_3"]
+    assert [node["choices"][0]["next_id"] for node in nodes] == ["bridge_2", "bridge_3", "ending_out"]
+    assert nodes[2]["choices"][0]["grants"] == ["seen_3"]
@@ -0,0 +1,35 @@
+import json
+import tracemalloc
+
+from atlas_narrative.analysis import analyze_narrative
+from atlas_narrative.generator import generate_complete_atlas_narrative
+from atlas_narrative.trace import span, tracing, tracing_enabled
+
+def test_spans_are_free_when_tracing_is_off():
+    assert not tracing_enabled()
+    with span("idle") as idle:
+        idle.set(nodes=1)
+    assert span("a") is span("b")
+
+def test_tracing_writes_chrome_trace_events(tmp_path):
+    path = tmp_path / "trace.json"
+    with tracing(str(path)) as tracer:
+        assert tracing_enabled()
+        with span("outer", nodes=2) as outer:
+            outer.set(extra=True)
+            analyze_narrative(generate_complete_atlas_narrative())
+    assert not tracing_enabled() and not tracemalloc.is_tracing()
+
+    events = json.loads(path.read_text())["traceEvents"]
+    assert events[0]["ph"] == "M"
+    by_name = {event["name"]: event for event in events[1:]}
+    assert by_name["outer"]["args"]["nodes"] == 2 and by_name["outer"]["args"]["extra"]
+    assert "alloc_bytes" in by_name["validate"]["args"]
+    assert by_name["outer"]["dur"] >= by_name["validate"]["dur"] >= 0
+    assert len(tracer.events) == len(events) - 1
+
+def test_timing_only_tracing_skips_tracemalloc():
+    with tracing(memory=False) as tracer:
+        with span("quick"):
+            assert not tracemalloc.is_tracing()
+    assert "alloc_bytes" not in tracer.events[0]["args"]
@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from atlas_narrative.engine import NarrativeEngine
+from atlas_narrative.generator import generate_complete_atlas_narrative
+
+np = pytest.importorskip("numpy")
+
+from atlas_narrative.vector import VectorEngine  # noqa: E402
+
+def _state(session):
+    return session.node, session.tokens, session.flags, session.steps, session.streak, session.seen
+
+def test_vector_steps_match_the_engine():
+    engine = NarrativeEngine(generate_complete_atlas_narrative())
+    vector = VectorEngine(engine)
+    rng = random.Random(7)
+    sessions = [engine.new_session(f"p{k}") for k in range(40)]
+    arrays = vector.new_sessions(len(sessions))
+    assert [_state(s) for s in vector.to_sessions(arrays)] == [_state(s) for s in sessions]
+
+    for _ in range(30):
+        # positions() reads each row's node at the batch start, so rows are distinct here
+        rows = rng.sample(range(len(sessions)), 25)
+        choice_ids = [rng.choice(list(engine.edges[sessions[row].node]) + ["no_such_choice"]) for row in rows]
+        positions = vector.positions(arrays, rows, choice_ids)
+        expected = engine.step_many([(sessions[row], choice_id) for row, choice_id in zip(rows, choice_ids)])
+        assert vector.results(vector.step_many(arrays, rows, positions)) == expected
+
+    assert [_state(s) for s in vector.to_sessions(arrays)] == [_state(s) for s in sessions]
+    assert [_state(s) for s in vector.to_sessions(vector.from_sessions(sessions))] == [_state(s) for s in sessions]
+
+def test_node_requires_gate_vector_moves():
+    tree = {"root_id": "root", "tokens": {"chrono": {"start": 2}}, "nodes": [
+        {"id": "root", "title": "", "body_md": "", "choices": [
+            {"id": "to_vault", "label": "", "next_id": "vault"},
+            {"id": "to_yard", "label": "", "next_id": "yard", "grants": ["key"]}
+        ]},
+        {"id": "yard", "title": "", "body_md": "", "choices": [{"id": "to_vault", "label": "", "next_id": "vault"}]},
+        {"id": "vault", "title": "", "body_md": "", "requires": ["key"], "choices": []}
+    ]}
+    vector = VectorEngine(NarrativeEngine(tree))
+    arrays = vector.new_sessions(1)
+    results = vector.results(vector.step_many(arrays, [0, 0, 0], [0, 1, 0]))
+    assert [(r["ok"], r["node"]) for r in results] == [(False, "root"), (True, "yard"), (True, "vault")]
+    assert results[0]["error"] == "requires_unmet"